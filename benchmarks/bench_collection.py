@@ -0,0 +1,117 @@
+"""
+Collection Benchmark - זמן collection של pytest על קטלוג של 10K תרחישים
+
+1. טעינת הקטלוג: פענוח JSON מלא מול ה-DB של ScenarioStore (בנייה, טעינה, בחירת תת-קבוצה)
+2. pytest --collect-only על tests/test_ebay_shopping.py עם SEARCH_DATA_PATH לקטלוג המחולל
+   (ריצה ראשונה בונה את ה-cache, השנייה משתמשת בו) - מול היעד --target-seconds
+3. עם --compare-ref: אותה מדידה על commit אחר (git worktree זמני, הקטלוג מועתק גם
+   ל-test_data/search_data.json שלו - לגרסאות שקראו את הקובץ ישירות) - לפני / אחרי
+
+הרצה (מתיקיית הפרויקט):
+    python -m benchmarks.bench_collection --scenarios 10000 --target-seconds 3
+    python -m benchmarks.bench_collection --scenarios 10000 --compare-ref <commit לפני השינוי>
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from utils import scenario_catalog
+from utils.helpers import ConfigReader
+from utils.scenario_store import ScenarioStore
+
+
+QUERIES = ["shoes", "laptop", "headphones", "watch", "camera", "backpack", "jacket", "keyboard"]
+
+
+def generate_catalog(path: str, count: int):
+    scenarios = [{
+        "test_name": f"search_{QUERIES[i % len(QUERIES)]}_{i}",
+        "search_query": QUERIES[i % len(QUERIES)],
+        "max_price": 50 + (i % 20) * 25,
+        "items_limit": 1 + i % 5,
+        "description": f"Generated scenario {i}",
+    } for i in range(count)]
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"test_scenarios": scenarios}, file)
+
+
+def _time(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def time_catalog_loading(path: str, cache_dir: str):
+    parse = _time(lambda: ConfigReader.read_json(path))
+    build = _time(lambda: ScenarioStore.open(path, cache_dir=cache_dir).close())
+    load = _time(lambda: scenario_catalog.load_scenarios(path, cache_dir=cache_dir))
+    store = ScenarioStore.open(path, cache_dir=cache_dir)
+    subset = _time(lambda: list(store.select(query="laptop", max_price=100)))
+    store.close()
+    print(f"json parse           {parse * 1000:8.1f}ms")
+    print(f"store (build sqlite) {build * 1000:8.1f}ms")
+    print(f"load (all, cached)   {load * 1000:8.1f}ms")
+    print(f"store (select subset) {subset * 1000:7.1f}ms")
+
+
+def time_collect_only(path: str, runs: int, cwd: str = None, label: str = "collect-only") -> float:
+    env = dict(os.environ, SEARCH_DATA_PATH=path)
+    command = [sys.executable, "-m", "pytest", "--collect-only", "-q", "-p", "no:cacheprovider",
+               "-o", "addopts=", "tests/test_ebay_shopping.py"]
+    best = None
+    for run in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(command, env=env, capture_output=True, text=True, cwd=cwd)
+        elapsed = time.perf_counter() - start
+        if result.returncode != 0:
+            print(result.stdout[-2000:], result.stderr[-2000:])
+            raise SystemExit("pytest --collect-only failed")
+        print(f"{label} run {run + 1}   {elapsed:8.2f}s  ({result.stdout.strip().splitlines()[-1]})")
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def time_collect_only_at(ref: str, path: str, runs: int, directory: str) -> float:
+    """collect-only על commit אחר, ב-git worktree זמני"""
+    tree = os.path.join(directory, "tree")
+    subprocess.run(["git", "worktree", "add", "--detach", tree, ref], check=True, capture_output=True)
+    try:
+        shutil.copyfile(path, os.path.join(tree, "test_data", "search_data.json"))
+        return time_collect_only(path, runs, cwd=tree, label=ref[:12])
+    finally:
+        subprocess.run(["git", "worktree", "remove", "--force", tree], capture_output=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="pytest collection time on a large scenario catalog")
+    parser.add_argument("--scenarios", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--target-seconds", type=float, default=3.0)
+    parser.add_argument("--skip-pytest", action="store_true", help="measure catalog loading only")
+    parser.add_argument("--compare-ref", action="append", default=[],
+                        help="also time collect-only at this git ref (before/after); can be repeated")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "scenarios.json")
+        generate_catalog(path, args.scenarios)
+        print(f"{args.scenarios} scenarios, {os.path.getsize(path) / 1024:.0f} KB")
+        time_catalog_loading(path, os.path.join(directory, "cache"))
+        
+        if args.skip_pytest:
+            return
+        best = time_collect_only(path, args.runs)
+        status = "OK" if best <= args.target_seconds else "OVER TARGET"
+        print(f"best collect-only: {best:.2f}s (target {args.target_seconds:.2f}s) - {status}")
+        for ref in args.compare_ref:
+            before = time_collect_only_at(ref, path, args.runs, directory)
+            print(f"{ref} {before:.2f}s -> working tree {best:.2f}s ({(best - before) / before * 100:+.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Item Extraction Benchmark - לפני / אחרי: חילוץ פריט-פריט (bulk=False) מול חילוץ בקריאה אחת
+
+הדף השמור (240 פריטים, benchmarks/fixtures/search_results.html) מוגש דרך ReplayRouter כמו
+ב-run_benchmarks, ולכל מצב נמדדים שני מקרים - זמן ומספר round trips לדפדפן:
+    extract_page          - כל הפריטים בדף (התרחיש מהבקשה: 240 פריטים)
+    get_items_under_price - הזרימה של הטסט (limit=5), כולל ההמתנה לדף
+
+הרצה (מתיקיית הפרויקט):
+    python -m benchmarks.bench_item_extraction --iterations 10 --output benchmarks/results/item_extraction.json
+דפדפן שלא הותקן דרך `playwright install`:
+    python -m benchmarks.bench_item_extraction --executable-path /path/to/chrome
+"""
+import argparse
+import json
+import os
+from datetime import datetime
+
+from playwright.sync_api import sync_playwright
+
+from benchmarks.run_benchmarks import SEARCH_URL, build_archive, git_commit, run_case
+from pages.search_results_page import SearchResultsPage
+from utils.artifacts import artifacts
+from utils.replay import ReplayRouter
+from utils.search_items import SearchItemCollection
+
+
+MODES = (("per_item", False), ("bulk", True))
+
+
+def collect_page(search_page: SearchResultsPage, bulk: bool, max_price: float):
+    """כל הפריטים שעוברים את המחיר בדף הנוכחי - בלי paging"""
+    if bulk:
+        items = search_page._matching_items(search_page.extract_items(), max_price, SearchItemCollection(), 1)
+    else:
+        selector = search_page.resolve_selector("search.item")
+        items = search_page._matching_locator_items(selector, max_price, SearchItemCollection(), 1)
+    return list(items)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Before/after timing for search results extraction")
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--max-price", type=float, default=1000)
+    parser.add_argument("--limit", type=int, default=5, help="limit of the get_items_under_price flow")
+    parser.add_argument("--executable-path", help="Chromium binary (default: the one from `playwright install`)")
+    parser.add_argument("--output", default="benchmarks/results/item_extraction.json")
+    args = parser.parse_args()
+
+    # בלי צילומי מסך - נמדד החיפוש עצמו, ושום קובץ לא נכתב בכל איטרציה
+    artifacts.configure({"policy": "on_failure"})
+    results = {"commit": git_commit(), "timestamp": datetime.now().isoformat(timespec="seconds"), "cases": {}}
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(executable_path=args.executable_path)
+        context = browser.new_context(viewport={"width": 1920, "height": 1080}, locale="en-US")
+        ReplayRouter(build_archive(), strict=True).install(context)
+        page = context.new_page()
+        page.set_default_timeout(5000)
+        search_page = SearchResultsPage(page)
+
+        for mode, bulk in MODES:
+            cases = {
+                f"extract_page[{mode}]": lambda bulk=bulk: collect_page(search_page, bulk, args.max_price),
+                f"get_items_under_price[{mode}]":
+                    lambda bulk=bulk: search_page.get_items_under_price(args.max_price, args.limit, bulk=bulk),
+            }
+            for name, action in cases.items():
+                results["cases"][name] = run_case(page, SEARCH_URL, action, args.iterations)
+
+        browser.close()
+    artifacts.close()
+
+    print(f"{'case':<24} {'before p50':>11} {'after p50':>11} {'speedup':>8} {'round trips':>13}")
+    for case in ("extract_page", "get_items_under_price"):
+        before, after = results["cases"][f"{case}[per_item]"], results["cases"][f"{case}[bulk]"]
+        speedup = before["p50_ms"] / after["p50_ms"] if after["p50_ms"] else float("inf")
+        print(f"{case:<24} {before['p50_ms']:>9.1f}ms {after['p50_ms']:>9.1f}ms {speedup:>7.1f}x "
+              f"{before['round_trips']:>6}->{after['round_trips']:<6}")
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
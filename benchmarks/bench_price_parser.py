@@ -0,0 +1,81 @@
+"""
+Price Parser Benchmark - פענוח כמה מאות אלפי מחרוזות מחיר: המימוש הישן מול parse / parse_batch
+
+מחרוזות המחיר נלקחות מ-benchmarks/fixtures/search_results.html (מחירי eBay אמיתיים, כולל טווחים),
+או מקובץ עם מחרוזת בכל שורה (--source), ונדגמות עד --count.
+
+הרצה (מתיקיית הפרויקט):
+    python -m benchmarks.bench_price_parser --count 300000
+"""
+import argparse
+import html
+import os
+import random
+import re
+import time
+from typing import Callable, List
+
+from utils.price_parser import PriceParser, np, parse_price
+
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "search_results.html")
+PRICE_TEXT_PATTERN = re.compile(r'class="s-item__price"[^>]*>([^<]+)<')
+# פורמטים מקומיים שמופיעים באתרי eBay אחרים
+LOCALE_SAMPLES = ["EUR 1.234,56", "12,50 EUR", "ILS 459.90", "£1,099.00", "C $45.00", "AU $1,250.00",
+                  "EUR 20,00 bis EUR 45,00", "Free shipping", ""]
+
+
+def legacy_extract_price(price_text: str) -> float:
+    """המימוש הקודם - להשוואה בלבד"""
+    clean_text = re.sub(r'[^\d.]', '', price_text)
+    try:
+        return float(clean_text)
+    except ValueError:
+        return 0.0
+
+
+def load_price_texts(source: str = None) -> List[str]:
+    if source:
+        with open(source, "r", encoding="utf-8") as file:
+            return [line.rstrip("\n") for line in file]
+    with open(FIXTURE_PATH, "r", encoding="utf-8") as file:
+        texts = [html.unescape(text).strip() for text in PRICE_TEXT_PATTERN.findall(file.read())]
+    return texts + LOCALE_SAMPLES
+
+
+def _time(label: str, func: Callable[[], object], count: int):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed * 1000:9.1f}ms  {count / elapsed / 1000:9.0f}k strings/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Price parser throughput")
+    parser.add_argument("--count", type=int, default=300000)
+    parser.add_argument("--source", help="file with one price string per line")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    
+    samples = load_price_texts(args.source)
+    texts = random.Random(args.seed).choices(samples, k=args.count)
+    print(f"{len(texts)} strings ({len(set(texts))} unique)")
+    
+    legacy = [legacy_extract_price(text) for text in texts]
+    parsed = PriceParser.parse_batch(texts, use_numpy=False)
+    failed_legacy = sum(1 for value in legacy if value == 0.0)
+    print(f"legacy returned 0.0 for {failed_legacy}, new parser failed on {parsed.ok.count(False)}")
+    
+    _time("legacy extract_price", lambda: [legacy_extract_price(text) for text in texts], len(texts))
+    parse_price.cache_clear()
+    _time("parse (cold cache)", lambda: [parse_price(text) for text in texts], len(texts))
+    _time("parse_batch (python)", lambda: PriceParser.parse_batch(texts, use_numpy=False), len(texts))
+    if np is not None:
+        parse_price.cache_clear()
+        _time("parse_batch (numpy)", lambda: PriceParser.parse_batch(texts, use_numpy=True), len(texts))
+    else:
+        print("numpy not installed - skipping numpy batch")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+Compare Benchmarks - השוואה בין שני קבצי תוצאות של run_benchmarks
+    python -m benchmarks.compare before.json after.json
+"""
+import argparse
+import json
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("before")
+    parser.add_argument("after")
+    args = parser.parse_args()
+    
+    with open(args.before, encoding="utf-8") as file:
+        before = json.load(file)
+    with open(args.after, encoding="utf-8") as file:
+        after = json.load(file)
+    
+    print(f"{'case':<34} {'p50 before':>11} {'p50 after':>11} {'change':>8} {'trips':>13}")
+    for name, new in after["cases"].items():
+        old = before["cases"].get(name)
+        if not old:
+            print(f"{name:<34} {'-':>11} {new['p50_ms']:>9.1f}ms")
+            continue
+        change = (new["p50_ms"] - old["p50_ms"]) / old["p50_ms"] * 100 if old["p50_ms"] else 0.0
+        print(f"{name:<34} {old['p50_ms']:>9.1f}ms {new['p50_ms']:>9.1f}ms {change:>+7.1f}% "
+              f"{old['round_trips']:>6}->{new['round_trips']:<6}")
+    print(f"({before['commit']} -> {after['commit']})")
+
+
+if __name__ == "__main__":
+    main()
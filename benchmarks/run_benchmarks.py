@@ -0,0 +1,138 @@
+"""
+Page Object Benchmarks - זמני ריצה של מתודות ה-Page Objects על HTML שמור
+
+כל הדפים מוגשים מ-benchmarks/fixtures דרך ReplayRouter (strict) - אין גישה לרשת.
+לכל מקרה: הכנה (ניווט לדף) לא נמדדת, ואז המתודה רצה ונמדדת - זמן ומספר round trips.
+
+הרצה (מתיקיית הפרויקט):
+    python -m benchmarks.run_benchmarks --iterations 30 --output benchmarks/results/latest.json
+השוואה בין שתי ריצות:
+    python -m benchmarks.compare benchmarks/results/before.json benchmarks/results/latest.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from playwright.sync_api import sync_playwright
+
+from pages.base_page import BasePage
+from pages.cart_page import CartPage
+from pages.product_page import ProductPage
+from pages.search_results_page import SearchResultsPage
+from utils.call_counter import PlaywrightCallCounter
+from utils.replay import ReplayArchive, ReplayRouter
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+FIXTURE_URLS = {
+    "search_results.html": "https://www.ebay.com/sch/i.html?_nkw=shoes",
+    "product.html": "https://www.ebay.com/itm/256789012345",
+    "cart.html": "https://cart.ebay.com/",
+}
+SEARCH_URL = FIXTURE_URLS["search_results.html"]
+PRODUCT_URL = FIXTURE_URLS["product.html"]
+CART_URL = FIXTURE_URLS["cart.html"]
+
+
+def build_archive() -> ReplayArchive:
+    """ארכיון בזיכרון מקבצי ה-HTML השמורים"""
+    archive = ReplayArchive(path="")
+    for file_name, url in FIXTURE_URLS.items():
+        with open(os.path.join(FIXTURES_DIR, file_name), "rb") as file:
+            archive.add_response("GET", url, 200, {"content-type": "text/html; charset=utf-8"}, file.read())
+    return archive
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def benchmark_cases(page) -> Dict[str, tuple]:
+    """שם מקרה -> (URL להכנה, פונקציה למדידה)"""
+    search_page = SearchResultsPage(page)
+    product_page = ProductPage(page, rng=0)
+    cart_page = CartPage(page, cart_url=CART_URL)
+    base_page = BasePage(page)
+    
+    return {
+        "search.extract_items": (SEARCH_URL, search_page.extract_items),
+        "search.get_items_under_price": (SEARCH_URL, lambda: search_page.get_items_under_price(100, limit=5)),
+        "base.close_popups": (PRODUCT_URL, base_page.close_popups),
+        "product.select_random_variants": (PRODUCT_URL, product_page.select_random_variants),
+        "cart.get_cart_total": (CART_URL, cart_page.get_cart_total),
+    }
+
+
+def run_case(page, url: str, action: Callable, iterations: int) -> Dict:
+    timings, round_trips = [], []
+    for _ in range(iterations):
+        page.goto(url, wait_until="domcontentloaded")
+        with PlaywrightCallCounter() as calls:
+            start = time.perf_counter()
+            action()
+            timings.append((time.perf_counter() - start) * 1000)
+        round_trips.append(calls.count)
+    
+    return {
+        "iterations": iterations,
+        "p50_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(percentile(timings, 95), 3),
+        "mean_ms": round(statistics.mean(timings), 3),
+        "round_trips": round(statistics.median(round_trips), 1),
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline page-object benchmarks")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--only", nargs="*", help="Run only these case names")
+    parser.add_argument("--output", default="benchmarks/results/latest.json")
+    args = parser.parse_args()
+    
+    results = {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "cases": {},
+    }
+    
+    with sync_playwright() as p:
+        browser = p.chromium.launch()
+        context = browser.new_context(viewport={"width": 1920, "height": 1080}, locale="en-US")
+        ReplayRouter(build_archive(), strict=True).install(context)
+        page = context.new_page()
+        page.set_default_timeout(5000)
+        
+        for name, (url, action) in benchmark_cases(page).items():
+            if args.only and name not in args.only:
+                continue
+            results["cases"][name] = run_case(page, url, action, args.iterations)
+            case = results["cases"][name]
+            print(f"{name:<34} p50={case['p50_ms']:9.1f}ms  p95={case['p95_ms']:9.1f}ms  "
+                  f"round trips={case['round_trips']}")
+        
+        browser.close()
+    
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
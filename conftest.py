@@ -2,9 +2,59 @@
 Pytest Configuration - הגדרות גלובליות
 """
 import pytest
-from playwright.sync_api import sync_playwright, Browser, BrowserContext, Page
-import yaml
+import pytest_asyncio
 import os
+import re
+from pages.base_page import BasePage
+from pages.home_page import HomePage
+from utils.helpers import Logger, load_config
+from utils.network_filter import NetworkFilter
+from utils.replay import ResponseRecorder, ReplayRouter, install_replay_mode, replay_mode
+from utils.selector_registry import selector_registry
+from utils.storage_state import StorageStateCache
+from utils.scenario_scheduler import ContextPool, ScenarioSchedulerPlugin
+from utils.tracing import tracer
+from utils.logging_setup import configure_logging, flush_logs, set_current_test
+from utils.artifacts import artifacts
+from utils import reporting
+from utils.scenario_catalog import scenario_id
+from utils.scenario_store import ScenarioStore
+from utils.browser_server import BrowserServerManager
+from utils.context_recycler import ContextRecycler
+from utils.timeout_budget import timeouts
+from typing import TYPE_CHECKING
+
+# playwright נטען רק כשפיקצ'ר של דפדפן באמת נוצר - collection (כולל --collect-only) לא משלם עליו
+if TYPE_CHECKING:
+    from playwright.sync_api import Browser, Page
+
+
+def pytest_addoption(parser):
+    """בחירת תת-קבוצה מקטלוג התרחישים (אינדקסים ב-SQLite, בלי לפענח את כל הקטלוג)"""
+    group = parser.getgroup("scenarios")
+    group.addoption("--scenario-tag", action="append", default=[], help="רק תרחישים עם ה-tag (אפשר כמה פעמים)")
+    group.addoption("--scenario-query", default=None, help="רק תרחישים עם שאילתת החיפוש הזו")
+    group.addoption("--scenario-max-price", type=float, default=None, help="רק תרחישים עם max_price עד הסכום")
+    group.addoption("--scenario-band", default=None, help="רצועת מחיר, למשל 50-100")
+    group.addoption("--scenario-limit", type=int, default=None, help="לכל היותר N תרחישים")
+
+
+def pytest_generate_tests(metafunc):
+    """טסטים שמקבלים test_data רצים על התרחישים שנבחרו מהקטלוג"""
+    if "test_data" not in metafunc.fixturenames:
+        return
+    metafunc.parametrize("test_data", select_scenarios(metafunc.config.option), ids=scenario_id)
+
+
+def select_scenarios(options) -> list:
+    """התרחישים מהקטלוג לפי הסינון בשורת הפקודה (--scenario-tag / query / max-price / band / limit)"""
+    store = ScenarioStore.open()
+    try:
+        return list(store.select(tags=options.scenario_tag, query=options.scenario_query,
+                                 max_price=options.scenario_max_price, band=options.scenario_band,
+                                 limit=options.scenario_limit))
+    finally:
+        store.close()
 
 
 def pytest_configure(config):
@@ -12,14 +62,56 @@ def pytest_configure(config):
     # יצירת תיקיות
     os.makedirs("screenshots", exist_ok=True)
     os.makedirs("allure-results", exist_ok=True)
+    
+    settings = load_config()
+    
+    # לוגים: סינון רמות, תור עם thread כותב, JSON לכל worker
+    configure_logging(settings.get("logging", {}))
+    
+    # צילומי מסך: מדיניות, כתיבה ברקע
+    artifacts.configure(settings.get("screenshots", {}))
+    
+    # cache של סלקטורים מנצחים מהריצות הקודמות
+    cache_path = settings.get("selectors", {}).get("cache_path")
+    if cache_path:
+        selector_registry.configure(cache_path)
+    
+    # מדידת זמנים לכל פעולה של Page Object
+    tracer.configure(settings.get("tracing", {}))
+    
+    # timeouts לכל קריאה מתוך תקציב הטסט/הצעד, וניסיונות חוזרים לניווט
+    timeouts.configure(settings.get("timeout", {}), settings.get("test_settings", {}).get("max_retries"))
+    
+    # scheduler לפי משך היסטורי - רק ב-controller של ריצה עם -n
+    parallel = settings.get("parallel", {})
+    if (parallel.get("schedule_longest_first") and config.pluginmanager.hasplugin("xdist")
+            and config.getoption("numprocesses", None) and not hasattr(config, "workerinput")):
+        config.pluginmanager.register(
+            ScenarioSchedulerPlugin(parallel.get("durations_path", ".cache/durations.json")),
+            "scenario_scheduler")
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """שמירת ה-cache של הסלקטורים, סטטיסטיקת hit/miss וצילומי מסך (רק אם היו חיפושים / צילומים)"""
+    if selector_registry.stats:
+        Logger.info(selector_registry.summary())
+    selector_registry.save()
+    artifacts.close()
+    if any(artifacts.stats.values()):
+        Logger.info(artifacts.summary())
+    flush_logs()
 
 
 @pytest.fixture(scope="session")
 def config():
-    """קריאת קובץ הקונפיגורציה"""
-    config_path = "config/test_config.yaml"
-    with open(config_path, 'r', encoding='utf-8') as file:
-        return yaml.safe_load(file)
+    """קריאת קובץ הקונפיגורציה (אותו עותק שנטען ב-pytest_configure)"""
+    return load_config()
+
+
+@pytest.fixture(scope="session")
+def selected_scenarios(request):
+    """כל התרחישים שנבחרו - לטסטים שמריצים אותם יחד (למשל ה-async עם asyncio.gather)"""
+    return select_scenarios(request.config.option)
 
 
 @pytest.fixture(scope="session")
@@ -41,36 +133,265 @@ def browser_context_args(config):
     }
 
 
+@pytest.fixture(autouse=True)
+def log_context(request):
+    """שם הטסט בכל רשומת לוג, ו-flush של לוגים וצילומים בסוף כדי שלא יגלשו לטסט הבא"""
+    set_current_test(request.node.nodeid)
+    
+    yield
+    
+    # צילומי המסך של הטסט נכתבו ברקע - כאן מצורפים ל-Allure (ב-thread של הטסט)
+    artifacts.flush()
+    flush_logs()
+    set_current_test(None)
+
+
+@pytest.fixture(autouse=True)
+def step_trace(request):
+    """spans של הטסט: טבלת סיכום ללוג + Chrome trace לקובץ (כשה-tracing פעיל)"""
+    tracer.begin_test(request.node.nodeid)
+    
+    yield
+    
+    spans = tracer.end_test()
+    if spans:
+        Logger.info(f"Step timings for {request.node.name}:\n{tracer.format_summary(spans)}")
+        file_name = re.sub(r"[^\w.-]+", "_", request.node.nodeid) + ".json"
+        tracer.export_chrome_trace(os.path.join(tracer.output_dir, file_name), spans, request.node.nodeid)
+
+
+@pytest.fixture(autouse=True)
+def wait_budget(request):
+    """תקציב הזמן של הטסט (timeout.test_budget), וסיכום זמני ההמתנה שלו בסוף"""
+    timeouts.begin_test()
+    
+    yield
+    
+    stats = timeouts.end_test()
+    if stats.calls:
+        Logger.info(f"{request.node.name}: {stats.summary()}")
+
+
+@pytest.fixture(scope="module")
+def blank_page(request) -> "Page":
+    """
+    דף ריק (בלי רשת) לבדיקת סקריפטי DOM של ה-pages - מדולג אם הדפדפן לא זמין.
+    Playwright משלו שנסגר בסוף המודול, כך שה-event loop שלו לא נשאר לטסטים של asyncio שאחריו;
+    אם ה-Playwright של הסשן (טסטי E2E שרצו קודם) כבר פעיל - הדפדפן של הסשן
+    """
+    from playwright.sync_api import Error, sync_playwright
+    
+    try:
+        playwright = sync_playwright().start()
+    except Error:
+        playwright = None
+    
+    try:
+        browser = playwright.chromium.launch() if playwright else request.getfixturevalue("browser")
+    except Exception as e:
+        if playwright:
+            playwright.stop()
+        pytest.skip(f"Chromium not available: {str(e).splitlines()[0]}")
+    page = browser.new_page()
+    
+    yield page
+    
+    page.close()
+    if playwright:
+        browser.close()
+        playwright.stop()
+
+
 @pytest.fixture(scope="function")
-def page(browser: Browser, context: BrowserContext) -> Page:
+def page(request, browser: "Browser", config) -> "Page":
     """
     פיקצ'ר לדף - נוצר לכל טסט
     הדפדפן נשאר פתוח בין הטסטים
+    עם parallel.context_pool - כל טסט מקבל את ה-context החם של ה-worker, מנוקה
+    עם context_recycling.enabled - context שמוחלף כשהוא עובר את ספי הזיכרון / הטסטים
     """
+    pool = None
+    recycler = None
+    if config.get("parallel", {}).get("context_pool"):
+        pool = request.getfixturevalue("context_pool")
+        context = pool.acquire()
+    elif config.get("context_recycling", {}).get("enabled"):
+        recycler = request.getfixturevalue("context_recycler")
+        context = recycler.context
+    else:
+        context = request.getfixturevalue("context")
+    
     page = context.new_page()
-    page.set_default_timeout(30000)
+    page.set_default_timeout(config["timeout"]["default"])
+    page.set_default_navigation_timeout(config["timeout"]["navigation"])
     
     yield page
     
+    # סיכום זמני ההמתנה לתנאי מוכנות בטסט
+    timings = BasePage(page).get_wait_timings()
+    if timings:
+        total = sum(elapsed for _, elapsed, _ in timings)
+        Logger.info(f"Ready waits: {len(timings)} waits, {total:.2f}s total")
+        for page_kind, elapsed, ready in timings:
+            Logger.debug(f"  {page_kind:<14} {elapsed:6.2f}s {'ready' if ready else 'timed out'}")
+    
+    # זיכרון בסוף הטסט - לפני סגירת הדף (מדדי CDP צריכים דף פתוח)
+    sample = recycler.sample(page, request.node.nodeid) if recycler else None
+    
     # ניקוי אחרי הטסט
     page.close()
+    if pool:
+        pool.release(context)
+    if sample:
+        Logger.debug(f"Memory: JS heap {sample.js_heap_mb}MB, RSS {sample.rss_mb}MB, "
+                     f"{sample.tests_in_context} tests / {sample.pages_in_context} pages in context")
+        recycler.after_test(sample)
+
+
+def storage_state_cache(browser_context_args, config):
+    """
+    ה-cache של storage state לפי locale + account (או None אם כבוי / במצב replay).
+    משותף ל-storage_state ול-async_storage_state
+    """
+    settings = config.get("storage_state", {})
+    if not settings.get("enabled") or config["ebay"].get("replay", {}).get("mode") == "replay":
+        return None
+    
+    return StorageStateCache(
+        directory=settings.get("directory", ".cache/storage_state"),
+        locale=browser_context_args.get("locale", "en-US"),
+        account=os.environ.get("EBAY_USERNAME") or "guest",
+        max_age_hours=settings.get("max_age_hours", 12),
+    )
 
 
 @pytest.fixture(scope="session")
-def context(browser: Browser, browser_context_args):
+def storage_state(browser: "Browser", browser_context_args, config):
+    """
+    נתיב לקובץ storage state מוכן (או None אם כבוי).
+    מפתח לפי locale + account, bootstrap רק פעם אחת לכל ה-workers
+    """
+    cache = storage_state_cache(browser_context_args, config)
+    if cache is None:
+        return None
+    
+    def bootstrap(context):
+        page = context.new_page()
+        HomePage(page, base_url=config["ebay"]["base_url"]).open()
+        page.close()
+    
+    return cache.get_or_create(browser, browser_context_args, bootstrap)
+
+
+def new_configured_context(browser: "Browser", browser_context_args, config, storage_state=None):
+    """
+    context חדש עם כל ההגדרות מהקונפיגורציה: storage state, פילטר רשת, popup watcher, record/replay
+    מחזיר (context, network_filter, replay)
+    """
+    context = browser.new_context(**browser_context_args, storage_state=storage_state)
+    network_filter = NetworkFilter(config.get("network_filter", {})).install(context)
+    if config.get("popups", {}).get("watcher"):
+        context.add_init_script(BasePage.popup_watcher_script())
+    # record/replay - נרשם אחרי הפילטר כדי לקבל עדיפות (החמצה ממשיכה לפילטר)
+    replay = install_replay_mode(context, config["ebay"].get("replay", {}))
+    return context, network_filter, replay
+
+
+async def new_configured_async_context(browser, browser_context_args, config, storage_state=None, replay=None):
+    """
+    כמו new_configured_context, ל-Browser של async_api. מחזיר (context, network_filter).
+    replay - recorder/router מ-replay_mode, משותף לכל ה-contexts (ארכיון אחד שנשמר פעם אחת)
+    """
+    context = await browser.new_context(**browser_context_args, storage_state=storage_state)
+    network_filter = await NetworkFilter(config.get("network_filter", {})).install_async(context)
+    if config.get("popups", {}).get("watcher"):
+        await context.add_init_script(BasePage.popup_watcher_script())
+    if replay:
+        await replay.install_async(context)
+    return context, network_filter
+
+
+def report_replay(replay):
+    """שמירת ההקלטה (record) או סטטיסטיקת ההשמעה (replay)"""
+    if isinstance(replay, ResponseRecorder):
+        replay.save()
+    elif isinstance(replay, ReplayRouter):
+        Logger.info(replay.summary())
+
+
+def close_configured_context(context, network_filter, replay):
+    """סגירת context מ-new_configured_context: סטטיסטיקת פילטר, שמירת הקלטה"""
+    if network_filter.enabled:
+        Logger.info(network_filter.stats.summary())
+    report_replay(replay)
+    context.close()
+
+
+@pytest.fixture(scope="session")
+def context(browser: "Browser", browser_context_args, config, storage_state):
     """קונטקסט דפדפן - משותף לכל הטסטים בסשן"""
-    context = browser.new_context(**browser_context_args)
+    context, network_filter, replay = new_configured_context(browser, browser_context_args, config, storage_state)
     
     yield context
     
-    context.close()
+    close_configured_context(context, network_filter, replay)
+
+
+@pytest.fixture(scope="session")
+def context_recycler(browser: "Browser", browser_context_args, config, storage_state):
+    """
+    context של הסשן שמוחלף כשעוברים סף (טסטים, דפים, JS heap, RSS).
+    ה-context הראשון נטען מ-storage_state, והבאים מה-state של הקודם
+    """
+    extras = {}
+    
+    def factory(state):
+        context, network_filter, replay = new_configured_context(
+            browser, browser_context_args, config, state if state is not None else storage_state)
+        extras[id(context)] = (network_filter, replay)
+        return context
+    
+    def on_close(context):
+        close_configured_context(context, *extras.pop(id(context)))
+    
+    recycler = ContextRecycler.from_config(factory, on_close, config["context_recycling"])
+    
+    yield recycler
+    
+    recycler.close()
+    Logger.info(recycler.summary())
+
+
+@pytest.fixture(scope="session")
+def context_pool(browser: "Browser", browser_context_args, config, storage_state):
+    """context חם לכל worker - מנוקה וממוחזר בין טסטים במקום להיסגר"""
+    def factory():
+        return new_configured_context(browser, browser_context_args, config, storage_state)[0]
+    
+    pool = ContextPool(factory)
+    
+    yield pool
+    
+    pool.close_all()
 
 
 @pytest.fixture(scope="session")
 def browser(playwright, browser_type_launch_args, config):
-    """דפדפן - נפתח פעם אחת לכל הטסטים"""
+    """
+    דפדפן - נפתח פעם אחת לכל הטסטים
+    עם browser.server.enabled - חיבור לשרת דפדפן שנשאר פתוח בין ריצות (בלי זמן הפעלה)
+    """
     browser_type = config["browser"]["type"]
     
+    if config["browser"].get("server", {}).get("enabled"):
+        manager = BrowserServerManager.from_config(config["browser"])
+        browser = manager.connect(playwright, slow_mo=browser_type_launch_args.get("slow_mo", 0))
+        
+        yield browser
+        
+        # רק ניתוק - ה-contexts של הסשן כבר נסגרו, והתהליך נשאר לריצה הבאה
+        return
+    
     if browser_type == "chromium":
         browser = playwright.chromium.launch(**browser_type_launch_args)
     elif browser_type == "firefox":
@@ -88,20 +409,86 @@ def browser(playwright, browser_type_launch_args, config):
 @pytest.fixture(scope="session")
 def playwright():
     """Playwright instance"""
+    from playwright.sync_api import sync_playwright
+    
     with sync_playwright() as p:
         yield p
 
 
+# Async fixtures - עבור pages_async (כמה תרחישים במקביל עם asyncio.gather)
+@pytest_asyncio.fixture
+async def async_browser(browser_type_launch_args, config):
+    """דפדפן async - נפתח לכל טסט async"""
+    from playwright.async_api import async_playwright
+    
+    async with async_playwright() as p:
+        if config["browser"].get("server", {}).get("enabled"):
+            manager = BrowserServerManager.from_config(config["browser"])
+            yield await manager.connect_async(p, slow_mo=browser_type_launch_args.get("slow_mo", 0))
+            return
+        
+        browser_type = getattr(p, config["browser"]["type"], p.chromium)
+        browser = await browser_type.launch(**browser_type_launch_args)
+        
+        yield browser
+        
+        await browser.close()
+
+
+@pytest_asyncio.fixture
+async def async_storage_state(async_browser, browser_context_args, config):
+    """כמו storage_state, עם bootstrap דרך async_api (אותו קובץ cache)"""
+    cache = storage_state_cache(browser_context_args, config)
+    if cache is None:
+        return None
+    
+    async def bootstrap(context):
+        from pages_async.home_page import HomePage as AsyncHomePage
+        
+        page = await context.new_page()
+        await AsyncHomePage(page, base_url=config["ebay"]["base_url"]).open()
+        await page.close()
+    
+    return await cache.get_or_create_async(async_browser, browser_context_args, bootstrap)
+
+
+@pytest_asyncio.fixture
+async def async_context_factory(async_browser, browser_context_args, config, async_storage_state):
+    """
+    יוצר contexts async מוגדרים כמו new_configured_context (storage state, פילטר רשת, popup watcher,
+    record/replay) - אחד לכל תרחיש מקבילי, כדי שלכל אחד יהיה סל משלו. כולם נסגרים בסוף הטסט
+    """
+    configured = []
+    replay = replay_mode(config["ebay"].get("replay", {}))
+    
+    async def factory():
+        context, network_filter = await new_configured_async_context(
+            async_browser, browser_context_args, config, async_storage_state, replay)
+        configured.append((context, network_filter))
+        return context
+    
+    yield factory
+    
+    for context, network_filter in configured:
+        if network_filter.enabled:
+            Logger.info(network_filter.stats.summary())
+        await context.close()
+    report_replay(replay)
+
+
 # Hooks לדוחות
 def pytest_runtest_makereport(item, call):
-    """הוק שרץ אחרי כל טסט - לצילום מסך במקרה של כשלון"""
+    """הוק שרץ אחרי כל טסט - לצילום מסך במקרה של כשלון, וצעדים איטיים ל-Allure"""
     if call.when == "call":
+        slow_spans = tracer.slow_spans(tracer.current_spans())
+        if slow_spans:
+            reporting.attach(tracer.format_spans(slow_spans), name=f"Slow steps (>= {tracer.slow_step_ms}ms)")
+        
         if call.excinfo is not None:
             # הטסט נכשל
             try:
                 page = item.funcargs.get("page")
-                if page:
-                    screenshot_name = f"failure_{item.name}"
-                    page.screenshot(path=f"screenshots/{screenshot_name}.png")
+                if page and artifacts.on_failure:
+                    artifacts.capture(page, f"failure_{item.name}", force=True)
             except:
                 pass
@@ -0,0 +1,174 @@
+"""
+Add To Cart Pool - הוספת פריטים לסל במקביל על כמה טאבים באותו context
+"""
+from pages.product_page import ProductPage
+from utils.helpers import Logger
+from utils.search_items import SearchItem
+from utils.timeout_budget import timeouts
+from utils.tracing import traced
+from utils.variants import make_rng
+from utils import reporting
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Iterable, List, Optional, Union
+import time
+
+if TYPE_CHECKING:
+    from playwright.sync_api import BrowserContext
+
+
+@dataclass
+class AddToCartResult:
+    """תוצאה של פריט בודד"""
+    index: int
+    url: str
+    worker: int
+    success: bool = False
+    duration: float = 0.0
+    screenshot: Optional[str] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class AddToCartReport:
+    """דוח מרוכז של כל הפריטים"""
+    results: List[AddToCartResult] = field(default_factory=list)
+    duration: float = 0.0
+    
+    @property
+    def succeeded(self) -> List[AddToCartResult]:
+        return [result for result in self.results if result.success]
+    
+    @property
+    def failed(self) -> List[AddToCartResult]:
+        return [result for result in self.results if not result.success]
+    
+    def summary(self) -> str:
+        return (f"{len(self.succeeded)}/{len(self.results)} items added to cart "
+                f"in {self.duration:.1f}s ({len(self.failed)} failed)")
+
+
+class AddToCartPool:
+    """
+    פותח עד N טאבים באותו context (כך שעוגיית הסל משותפת) ומפזר עליהם את ה-URLs.
+    ה-API הסינכרוני של Playwright מריץ פעולה אחת בכל רגע, לכן הטעינות רצות
+    במקביל ברקע בזמן שהטאב הבא מטופל (בחירת וריאנטים + הוספה לסל).
+    """
+    
+    def __init__(self, context: "BrowserContext", workers: int = 3, timeout: int = None,
+                 variant_seed: Union[int, str, None] = None):
+        """
+        timeout - ברירת מחדל timeout.navigation מהקונפיגורציה (מוגבל בתקציב הצעד/הטסט)
+        variant_seed - בחירת וריאנטים קבועה לכל מוצר (seed + URL), בלי תלות בסדר הטאבים
+        """
+        self.context = context
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.variant_seed = variant_seed
+        self.logger = Logger()
+    
+    @traced("AddToCartPool.run", "cart")
+    @reporting.step("Add items to cart ({self.workers} workers)")
+    def run(self, urls: Iterable[Union[str, SearchItem]]) -> AddToCartReport:
+        """
+        urls יכול להיות רשימה או זרם (generator) - למשל iter_search_by_url.
+        פריט נשלף מהזרם רק כשיש טאב פנוי, כך שהחיפוש ממשיך בזמן שהטאבים טוענים
+        """
+        report = AddToCartReport()
+        start = time.perf_counter()
+        total = len(urls) if hasattr(urls, "__len__") else None
+        stream = enumerate(urls, start=1)
+        exhausted = False
+        pages = []
+        free_workers = deque()
+        
+        # worker -> (index, url, started_at, navigation_error), לפי סדר ההתחלה
+        in_flight = OrderedDict()
+        try:
+            while True:
+                # מילוי טאבים פנויים מהזרם (טאב חדש נפתח רק כשצריך)
+                while not exhausted and (free_workers or len(pages) < self.workers):
+                    entry = next(stream, None)
+                    if entry is None:
+                        exhausted = True
+                        break
+                    if free_workers:
+                        worker = free_workers.popleft()
+                    else:
+                        worker = len(pages)
+                        pages.append(self._new_tab())
+                    index, item = entry
+                    self._start(worker, pages[worker], index, getattr(item, "url", item), in_flight)
+                
+                if not in_flight:
+                    break
+                
+                # הטיפול בפריט הוותיק ביותר - הוא הכי קרוב לסיום הטעינה
+                worker, (index, url, started, nav_error) = in_flight.popitem(last=False)
+                report.results.append(self._finish(worker, pages[worker], index, url, started, nav_error, total))
+                free_workers.append(worker)
+        finally:
+            for page in pages:
+                try:
+                    page.close()
+                except:
+                    pass
+        
+        report.results.sort(key=lambda result: result.index)
+        report.duration = time.perf_counter() - start
+        self.logger.info(report.summary())
+        return report
+    
+    def _navigation_timeout(self) -> int:
+        return timeouts.timeout_for("navigation", cap=self.timeout)
+    
+    def _new_tab(self):
+        page = self.context.new_page()
+        page.set_default_timeout(timeouts.timeout_for("default", cap=self.timeout))
+        return page
+    
+    def _start(self, worker: int, page, index: int, url: str, in_flight: OrderedDict):
+        """התחלת ניווט בלי לחכות לטעינה מלאה (wait_until=commit), עם ניסיון חוזר לניווט שנכשל"""
+        nav_error = None
+        try:
+            timeouts.retry.run(lambda: page.goto(url, wait_until="commit", timeout=self._navigation_timeout()),
+                               f"navigation to {url}")
+        except Exception as e:
+            nav_error = e
+        in_flight[worker] = (index, url, time.perf_counter(), nav_error)
+    
+    @traced("AddToCartPool.finish_item", "cart")
+    def _finish(self, worker: int, page, index: int, url: str, started: float,
+                nav_error: Optional[Exception], total: Optional[int]) -> AddToCartResult:
+        """השלמת הטיפול בפריט: וריאנטים, הוספה לסל וצילום מסך"""
+        result = AddToCartResult(index=index, url=url, worker=worker)
+        rng = make_rng(self.variant_seed, url) if self.variant_seed is not None else None
+        product_page = ProductPage(page, rng=rng)
+        
+        try:
+            self.logger.info(f"Adding item {index}/{total or '?'} to cart (worker {worker})...")
+            if nav_error:
+                raise nav_error
+            
+            product_page.wait_until_ready("product")
+            product_page.select_random_variants()
+            result.success = product_page.add_to_cart()
+            
+            if result.success:
+                result.screenshot = product_page.take_screenshot(f"item_{index}_added_to_cart")
+                self.logger.info(f"✓ Item {index} added successfully")
+            else:
+                result.error = "Add to cart failed"
+                self.logger.error(f"✗ Failed to add item {index}")
+                
+        except Exception as e:
+            result.success = False
+            result.error = str(e)
+            self.logger.error(f"Error adding item {index}: {e}")
+            try:
+                result.screenshot = product_page.take_screenshot(f"item_{index}_error")
+            except:
+                pass
+        
+        result.duration = time.perf_counter() - started
+        return result
@@ -1,18 +1,141 @@
-from playwright.sync_api import Page
-import allure
-import os
+from utils.helpers import Logger
+from utils.selector_registry import selector_registry
+from utils.tracing import instrument_class, tracer
+from utils.artifacts import artifacts
+from utils.timeout_budget import timeouts
+from utils import reporting
+from fnmatch import fnmatch
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+import json
+import time
+import weakref
 from datetime import datetime
 
+if TYPE_CHECKING:  # playwright נטען רק בזמן ריצה, לא ב-import של ה-Page Objects
+    from playwright.sync_api import Page
+
+
+class _PageActivity:
+    """מעקב אחרי בקשות רשת פתוחות וזמני המתנה - אחד לכל Page של Playwright"""
+    
+    def __init__(self, page: "Page"):
+        self.pending = {}
+        self.last_activity = time.monotonic()
+        self.wait_timings: List[Tuple[str, float, bool]] = []
+        page.on("request", self._on_request_started)
+        page.on("requestfinished", self._on_request_done)
+        page.on("requestfailed", self._on_request_done)
+    
+    def _on_request_started(self, request):
+        self.pending[id(request)] = request.url
+        self.last_activity = time.monotonic()
+    
+    def _on_request_done(self, request):
+        self.pending.pop(id(request), None)
+        self.last_activity = time.monotonic()
+    
+    def pending_count(self, url_patterns: List[str]) -> int:
+        return sum(1 for url in self.pending.values()
+                   if any(fnmatch(url, pattern) for pattern in url_patterns))
+
+
+_activity = weakref.WeakKeyDictionary()
+
 
 class BasePage:
     
-    def __init__(self, page: Page):
+    # תנאי מוכנות לפי סוג דף - כל Page מוסיף את שלו
+    # selector - אלמנט שצריך להופיע, load_state - מצב טעינה,
+    # network - תבניות URL שצריכות להגיע ל-idle, timeout - חריגה מברירת המחדל
+    READY_CONDITIONS: Dict[str, dict] = {
+        "page": {"load_state": "domcontentloaded"},
+        "network_idle": {"network": ["**/*"]},
+    }
+    NETWORK_IDLE_MS = 500
+    
+    # כפתורי סגירה נפוצים של popups: css + טקסט (כמו has-text של Playwright)
+    # watch=True רק לכפתורי הסכמה מוכרים - ה-watcher רץ בכל דף ובכל ניווט, ו-"Accept" לפי טקסט
+    # יכול להיות פקד אמיתי (הצעה, תנאים) בדף מוצר או בסל. השאר - רק לסגירה יזומה (close_popups)
+    POPUP_CLOSE_TARGETS = [
+        {"css": "button", "text": "Accept", "watch": False},
+        {"css": "button", "text": "Accept All", "watch": False},
+        {"css": "button", "text": "Close", "watch": False},
+        {"css": "button[aria-label='Close']", "text": None, "watch": False},
+        {"css": "button[aria-label='close']", "text": None, "watch": False},
+        {"css": "[class*='close']", "text": None, "watch": False},
+        {"css": "#gdpr-banner-accept", "text": None, "watch": True},
+    ]
+    
+    # מציאת כל ה-overlays הגלויים בשאילתת DOM אחת וסגירתם ביחד
+    DISMISS_POPUPS_SCRIPT = """
+    (targets) => {
+        const isVisible = (element) => {
+            if (!element.isConnected) return false;
+            const rect = element.getBoundingClientRect();
+            const style = getComputedStyle(element);
+            return rect.width > 0 && rect.height > 0 && style.visibility !== 'hidden' && style.display !== 'none';
+        };
+        // [class*='close'] תופס גם אייקוני SVG, שאין להם click() - לוחצים על הכפתור שעוטף אותם,
+        // ואם אין כזה שולחים אירוע click. כשלון באלמנט אחד לא עוצר את השאר
+        const press = (clickable) => {
+            if (typeof clickable.click === 'function') {
+                clickable.click();
+            } else {
+                clickable.dispatchEvent(new MouseEvent('click', {bubbles: true, cancelable: true, view: window}));
+            }
+        };
+        const clicked = [];
+        for (const target of targets) {
+            const text = target.text ? target.text.toLowerCase() : null;
+            const element = Array.from(document.querySelectorAll(target.css)).find((candidate) =>
+                isVisible(candidate)
+                && (!text || (candidate.innerText || candidate.textContent || '').toLowerCase().includes(text)));
+            if (!element) continue;
+            const clickable = element.closest('button, a, [role=button]') || element;
+            if (clicked.includes(clickable)) continue;
+            try {
+                press(clickable);
+                clicked.push(clickable);
+            } catch (error) {
+                // אלמנט שלא ניתן ללחוץ עליו - ממשיכים לאלמנט הבא
+            }
+        }
+        return clicked.length;
+    }
+    """
+    
+    # קבוצות חלופות לאלמנטים לוגיים (שם -> רשימת סלקטורים לפי עדיפות)
+    SELECTOR_GROUPS: Dict[str, List[str]] = {}
+    
+    def __init_subclass__(cls, **kwargs):
+        """כל מתודה ציבורית של Page Object נמדדת (זמן, קריאות Playwright, timeouts)"""
+        super().__init_subclass__(**kwargs)
+        instrument_class(cls)
+    
+    def __init__(self, page: "Page"):
         self.page = page
-        self.timeout = 30000
+        self.selectors = selector_registry
+        for name, alternatives in self.SELECTOR_GROUPS.items():
+            self.selectors.register(name, alternatives)
+        if page not in _activity:
+            _activity[page] = _PageActivity(page)
+        self._activity = _activity[page]
+    
+    @property
+    def timeout(self) -> int:
+        """timeout לקריאה הבאה - timeout.default מהקונפיגורציה, מוגבל במה שנשאר מתקציב הצעד/הטסט"""
+        return timeouts.timeout_for("default")
+    
+    def _element_key(self, locator: str) -> str:
+        """מפתח ל"אלמנט שלא נמצא" - לכל מופע של Page Object ולכל URL בנפרד"""
+        return f"{type(self).__name__}@{id(self):x}:{self.page.url}:{locator}"
         
     def navigate_to(self, url: str):
-        with allure.step(f"Navigate to {url}"):
-            self.page.goto(url, wait_until="domcontentloaded")
+        """ניווט עם timeout.navigation, וניסיון חוזר עם backoff לניווט שנכשל (test_settings.max_retries)"""
+        with reporting.step(f"Navigate to {url}"), timeouts.waiting("navigation"):
+            timeouts.retry.run(
+                lambda: self.page.goto(url, wait_until="domcontentloaded", timeout=timeouts.timeout_for("navigation")),
+                f"navigation to {url}")
             
     def click(self, locator: str):
         """לחיצה על אלמנט - עם גלילה אוטומטית"""
@@ -30,52 +153,137 @@ class BasePage:
         return self.page.locator(locator).inner_text(timeout=self.timeout)
         
     def wait_for_element(self, locator: str, state: str = "visible"):
-        self.page.locator(locator).wait_for(state=state, timeout=self.timeout)
+        """אלמנט שלא הופיע בפעם הקודמת באותו Page Object מקבל רק timeout.absent (fail fast)"""
+        key = self._element_key(locator)
+        with timeouts.waiting("element"):
+            try:
+                self.page.locator(locator).wait_for(state=state, timeout=timeouts.element_timeout(key))
+            except Exception:
+                timeouts.mark_absent(key)
+                raise
+        timeouts.mark_present(key)
         
     def is_visible(self, locator: str) -> bool:
         try:
-            return self.page.locator(locator).is_visible(timeout=5000)
+            return self.page.locator(locator).is_visible(timeout=timeouts.timeout_for("probe"))
         except:
+            tracer.note_timeout()
             return False
-            
-    def take_screenshot(self, name: str = None):
-        if not name:
-            name = f"screenshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    
+    def resolve_selector(self, name: str) -> Optional[str]:
+        """הסלקטור שמתאים בדף לאלמנט לוגי (מה-registry), או None"""
+        return self.selectors.resolve(self.page, name)
+    
+    def wait_until_ready(self, page_kind: str = "page", timeout: int = None) -> bool:
+        """
+        המתנה לתנאי מוכנות במקום sleep קבוע - חוזר ברגע שהתנאי מתקיים
+        מחזיר False אם התנאי לא התקיים עד ה-timeout (לא זורק, חוץ מתקציב טסט/צעד שנגמר)
+        """
+        condition = self.READY_CONDITIONS[page_kind]
+        timeout = timeouts.timeout_for("default", cap=timeout or condition.get("timeout"))
+        start = time.perf_counter()
+        ready = True
         
-        screenshot_dir = "screenshots"
-        os.makedirs(screenshot_dir, exist_ok=True)
+        try:
+            if "load_state" in condition:
+                self.page.wait_for_load_state(condition["load_state"], timeout=timeout)
+            if "selector" in condition:
+                self.page.locator(condition["selector"]).first.wait_for(
+                    state=condition.get("state", "visible"), timeout=timeout)
+            if "network" in condition:
+                ready = self.wait_for_network_idle(
+                    condition["network"], condition.get("idle_ms", self.NETWORK_IDLE_MS), timeout)
+        except Exception as e:
+            Logger.debug("Ready condition '%s' not met: %s", page_kind, e)
+            ready = False
         
-        filepath = os.path.join(screenshot_dir, f"{name}.png")
-        self.page.screenshot(path=filepath, full_page=True)
+        elapsed = time.perf_counter() - start
+        self._activity.wait_timings.append((page_kind, elapsed, ready))
+        timeouts.record_wait(f"ready:{page_kind}", elapsed, ready)
+        if not ready:
+            tracer.note_timeout()
+        Logger.debug("Wait '%s': %.2fs (%s)", page_kind, elapsed, "ready" if ready else "timed out")
+        return ready
+    
+    def wait_for_network_idle(self, url_patterns: List[str], idle_ms: int = None, timeout: int = None) -> bool:
+        """המתנה עד שאין בקשות פתוחות שתואמות לתבניות במשך idle_ms"""
+        idle_ms = idle_ms or self.NETWORK_IDLE_MS
+        deadline = time.monotonic() + (timeout or self.timeout) / 1000
         
-        with open(filepath, "rb") as image:
-            allure.attach(image.read(), name=name, attachment_type=allure.attachment_type.PNG)
+        while time.monotonic() < deadline:
+            quiet_for = (time.monotonic() - self._activity.last_activity) * 1000
+            if self._activity.pending_count(url_patterns) == 0 and quiet_for >= idle_ms:
+                return True
+            # wait_for_timeout מריץ את ה-event loop של Playwright כך שאירועי הרשת מתעדכנים
+            self.page.wait_for_timeout(50)
         
-        return filepath
+        return False
+    
+    def get_wait_timings(self) -> List[Tuple[str, float, bool]]:
+        """זמני ההמתנה שנמדדו בדף: (page_kind, seconds, ready)"""
+        return list(self._activity.wait_timings)
+            
+    def take_screenshot(self, name: str = None) -> Optional[str]:
+        """
+        צילום לזיכרון; הכתיבה לדיסק רצה ברקע והצירוף ל-Allure נעשה ב-flush בסוף הטסט.
+        מחזיר את נתיב הקובץ, או None אם המדיניות (screenshots.policy) דילגה על הצילום
+        """
+        if not name:
+            name = f"screenshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        return artifacts.capture(self.page, name)
         
     def get_current_url(self) -> str:
         return self.page.url
     
-    def close_popups(self):
-        """סגירת popups נפוצים (cookies, location, וכו')"""
-        import time
-        time.sleep(1)  # המתנה קצרה לטעינת popups
+    def close_popups(self) -> int:
+        """סגירת popups נפוצים (cookies, location, וכו') - מעבר אחד על ה-DOM"""
+        # המתנה לטעינת ה-DOM במקום sleep קבוע
+        self.wait_until_ready("page")
         
-        # רשימת סלקטורים נפוצים לכפתורי סגירה
-        close_buttons = [
-            "button:has-text('Accept')",
-            "button:has-text('Accept All')",
-            "button:has-text('Close')",
-            "button[aria-label='Close']",
-            "button[aria-label='close']",
-            "[class*='close']",
-            "#gdpr-banner-accept",
-        ]
+        try:
+            closed = self.page.evaluate(self.DISMISS_POPUPS_SCRIPT, self.POPUP_CLOSE_TARGETS)
+        except Exception as e:
+            Logger.debug(f"Could not dismiss popups: {e}")
+            return 0
         
-        for selector in close_buttons:
-            try:
-                if self.page.locator(selector).first.is_visible(timeout=2000):
-                    self.page.locator(selector).first.click(timeout=2000)
-                    time.sleep(0.5)
-            except:
-                continue
+        if closed:
+            Logger.debug(f"Closed {closed} popups")
+        return closed
+    
+    @classmethod
+    def popup_watcher_script(cls) -> str:
+        """
+        init script שסוגר overlays ברגע שהם מופיעים (MutationObserver),
+        במקום לבדוק מראש. מתאים ל-context.add_init_script / page.add_init_script
+        """
+        targets = [target for target in cls.POPUP_CLOSE_TARGETS if target["watch"]]
+        return f"""
+        (() => {{
+            const dismiss = {cls.DISMISS_POPUPS_SCRIPT.strip()};
+            const targets = {json.dumps(targets)};
+            let scheduled = false;
+            const observer = new MutationObserver(() => {{
+                if (scheduled) return;
+                scheduled = true;
+                setTimeout(() => {{ scheduled = false; dismiss(targets); }}, 50);
+            }});
+            const start = () => {{
+                dismiss(targets);
+                observer.observe(document.documentElement, {{childList: true, subtree: true}});
+            }};
+            if (document.readyState === 'loading') {{
+                document.addEventListener('DOMContentLoaded', start);
+            }} else {{
+                start();
+            }}
+        }})();
+        """
+    
+    def enable_popup_watcher(self):
+        """הפעלת ה-watcher על הדף הזה (לכל הניווטים הבאים + הדף הנוכחי)"""
+        script = self.popup_watcher_script()
+        self.page.add_init_script(script)
+        self.page.evaluate(script)
+
+
+instrument_class(BasePage)
@@ -1,7 +1,6 @@
 from pages.base_page import BasePage
 from utils.helpers import PriceParser, Logger
-import allure
-import time
+from utils import reporting
 
 
 class CartPage(BasePage):
@@ -13,19 +12,28 @@ class CartPage(BasePage):
     TOTAL = "div[data-test-id='TOTAL'] span.value"
     ITEM_PRICE = "span[data-test-id='ITEM_PRICE']"
     ITEM_QUANTITY = "select[data-test-id='qty-dropdown']"
+    EMPTY_CART = "div.empty-cart, [data-test-id='empty-cart']"
     
-    def __init__(self, page):
+    READY_CONDITIONS = {
+        **BasePage.READY_CONDITIONS,
+        "cart": {"selector": f"{SUBTOTAL}, {TOTAL}, {EMPTY_CART}"},
+    }
+    
+    def __init__(self, page, cart_url: str = None):
         super().__init__(page)
+        # ניתן להחליף לשרת מקומי (ebay.cart_url בקונפיגורציה)
+        self.cart_url = cart_url or self.CART_URL
         self.price_parser = PriceParser()
         self.logger = Logger()
     
-    @allure.step("Open cart")
+    @reporting.step("Open cart")
     def open_cart(self):
         """פתיחת סל הקניות"""
-        self.navigate_to(self.CART_URL)
-        time.sleep(2)
+        self.navigate_to(self.cart_url)
+        # המתנה לרינדור הסכום (או להודעת סל ריק)
+        self.wait_until_ready("cart")
     
-    @allure.step("Get cart total")
+    @reporting.step("Get cart total")
     def get_cart_total(self) -> float:
         """קבלת סכום כולל של הסל"""
         try:
@@ -51,7 +59,7 @@ class CartPage(BasePage):
             self.logger.error(f"Error getting cart total: {e}")
             return 0.0
     
-    @allure.step("Get cart items count")
+    @reporting.step("Get cart items count")
     def get_items_count(self) -> int:
         """ספירת פריטים בסל"""
         try:
@@ -62,7 +70,7 @@ class CartPage(BasePage):
         except:
             return 0
     
-    @allure.step("Assert cart total not exceeds ${budget}")
+    @reporting.step("Assert cart total not exceeds ${budget}")
     def assert_total_not_exceeds(self, budget: float):
         """אימות שסכום הסל לא עולה על תקציב"""
         total = self.get_cart_total()
@@ -2,7 +2,7 @@
 eBay Home Page - דף הבית
 """
 from pages.base_page import BasePage
-import allure
+from utils import reporting
 
 
 class HomePage(BasePage):
@@ -10,29 +10,43 @@ class HomePage(BasePage):
     
     # Locators - מיקומי אלמנטים
     SEARCH_BOX = "#gh-ac"
-    SEARCH_BUTTON = "#gh-btn, input[value='Search'], button[type='submit']"
+    SEARCH_BUTTON_SELECTORS = ["#gh-btn", "input[value='Search']", "button[type='submit']"]
+    SEARCH_BUTTON = ", ".join(SEARCH_BUTTON_SELECTORS)
     SIGN_IN_LINK = "text=Sign in"
     CART_ICON = "#gh-cart-n"
     
-    def __init__(self, page):
+    SELECTOR_GROUPS = {
+        "home.search_button": SEARCH_BUTTON_SELECTORS,
+    }
+    
+    READY_CONDITIONS = {
+        **BasePage.READY_CONDITIONS,
+        "home": {"selector": SEARCH_BOX},
+    }
+    
+    DEFAULT_URL = "https://www.ebay.com"
+    
+    def __init__(self, page, base_url: str = None):
         super().__init__(page)
-        self.url = "https://www.ebay.com"
+        # ניתן להחליף לשרת מקומי (ebay.base_url בקונפיגורציה)
+        self.url = base_url or self.DEFAULT_URL
     
-    @allure.step("Open eBay home page")
+    @reporting.step("Open eBay home page")
     def open(self):
         """פתיחת דף הבית"""
         self.navigate_to(self.url)
+        self.wait_until_ready("home")
         # סגירת popups
         self.close_popups()
         
-    @allure.step("Search for: {query}")
+    @reporting.step("Search for: {query}")
     def search_item(self, query: str):
         """חיפוש מוצר"""
         # המתנה לתיבת החיפוש
         self.wait_for_element(self.SEARCH_BOX, state="visible")
         self.fill(self.SEARCH_BOX, query)
         # לחיצה על כפתור החיפוש (עם גלילה אוטומטית)
-        self.click(self.SEARCH_BUTTON)
+        self.click(self.resolve_selector("home.search_button") or self.SEARCH_BUTTON)
         # אלטרנטיבה: שליחה באמצעות Enter
         # self.page.locator(self.SEARCH_BOX).press("Enter")
         
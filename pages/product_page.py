@@ -3,9 +3,11 @@ Product Page - דף מוצר בודד
 """
 from pages.base_page import BasePage
 from utils.helpers import Logger
-import allure
+from utils import reporting
+from utils.variants import (PLACEHOLDER_LABEL, PLACEHOLDER_VALUES, VariantChoice, VariantDimension,
+                            VariantOption, choose_variants, make_rng, parse_dimensions)
+from typing import List, Union
 import random
-import time
 
 
 class ProductPage(BasePage):
@@ -17,63 +19,136 @@ class ProductPage(BasePage):
     SIZE_SELECT = "select[id*='msku-ds-SELECT_SIZE']"
     COLOR_SELECT = "select[id*='msku-ds-SELECT_COLOR']"
     VARIANT_BUTTONS = "div.msku-variant button"
+    VARIANT_SELECTS = f"{SIZE_SELECT}, {COLOR_SELECT}, select[id*='msku-ds-SELECT']"
+    VARIANT_GROUPS = "div.msku-variant"
     POPUP_CLOSE = "button[aria-label='Close']"
     GO_TO_CART_BUTTON = "a:has-text('Go to cart')"
+    MAIN_CONTENT = "#mainContent, h1.x-item-title__mainTitle"
+    ADDED_OVERLAY = "div.lightbox-dialog__window, div[role='dialog']:has-text('Added to cart'), .vi-overlay-atc"
+    CART_SUBTOTAL = "div[data-test-id='SUB_TOTAL']"
     
-    def __init__(self, page):
+    READY_CONDITIONS = {
+        **BasePage.READY_CONDITIONS,
+        "product": {"selector": MAIN_CONTENT},
+        # עדכון מחיר/מלאי אחרי בחירת וריאנט
+        "variant": {"network": ["**/itm/**", "**/vi/**", "**/msku/**"], "idle_ms": 250, "timeout": 5000},
+        # חלון "Added to cart" או מעבר ישיר לסל
+        "add_to_cart": {"selector": f"{ADDED_OVERLAY}, {CART_SUBTOTAL}", "timeout": 10000},
+    }
+    
+    # האלמנטים מסומנים בזמן הקריאה, כך שהבחירה לא מחפשת אותם שוב
+    VARIANT_ATTRIBUTE = "data-e2e-variant"
+    # סבבי בחירה לכל היותר (סבב נוסף רק אם הדף הוציא מהמלאי אופציה שנבחרה)
+    VARIANT_ROUNDS = 3
+    
+    # כל המימדים בשאילתה אחת: selects (בלי ה-placeholder) וקבוצות כפתורים, עם מצב מלאי
+    READ_VARIANTS_SCRIPT = """
+    (args) => {
+        const isDisabled = (element) => element.disabled
+            || element.getAttribute('aria-disabled') === 'true'
+            || /disabled|out-of-stock|\\boos\\b/i.test(element.className || '')
+            || /out of stock|sold out|unavailable/i.test(element.textContent || '');
+        const labelOf = (element) => {
+            const label = element.labels && element.labels.length ? element.labels[0].textContent : null;
+            return (label || element.getAttribute('aria-label') || element.id || '').trim();
+        };
+        const placeholderLabel = new RegExp(args.placeholderLabel, 'i');
+        const isPlaceholder = (option, index) => args.placeholders.includes(option.value)
+            || (index === 0 && placeholderLabel.test(option.textContent || ''));
+        const dimensions = [];
+        const seen = new Set();
+        for (const select of document.querySelectorAll(args.selects)) {
+            if (seen.has(select)) continue;
+            seen.add(select);
+            const key = String(dimensions.length);
+            select.setAttribute(args.attribute, key);
+            dimensions.push({
+                kind: 'select', key: key, name: labelOf(select),
+                selected: select.selectedIndex < 0 || isPlaceholder(select.options[select.selectedIndex], select.selectedIndex)
+                    ? null : select.value,
+                options: Array.from(select.options).filter((option, index) => !isPlaceholder(option, index)).map((option) => ({
+                    value: option.value, label: option.textContent.trim(), disabled: isDisabled(option),
+                })),
+            });
+        }
+        for (const group of document.querySelectorAll(args.groups)) {
+            const key = String(dimensions.length);
+            let selected = null;
+            const options = Array.from(group.querySelectorAll('button')).map((button, index) => {
+                const value = `${key}-${index}`;
+                button.setAttribute(args.attribute, value);
+                if (button.getAttribute('aria-pressed') === 'true' || button.getAttribute('aria-checked') === 'true'
+                        || /selected|active/i.test(button.className || '')) {
+                    selected = value;
+                }
+                return {value: value, label: button.textContent.trim(), disabled: isDisabled(button)};
+            });
+            group.setAttribute(args.attribute, key);
+            dimensions.push({kind: 'buttons', key: key, name: labelOf(group), selected: selected, options: options});
+        }
+        return dimensions;
+    }
+    """
+    
+    def __init__(self, page, rng: Union[random.Random, int, str, None] = None):
+        """rng - random.Random או seed, לבחירת וריאנטים שחוזרת על עצמה"""
         super().__init__(page)
+        self.rng = rng if isinstance(rng, random.Random) else make_rng(rng)
         self.logger = Logger()
     
-    @allure.step("Open product: {url}")
+    @reporting.step("Open product: {url}")
     def open_product(self, url: str):
         """פתיחת דף מוצר"""
         self.navigate_to(url)
-        time.sleep(1)
+        self.wait_until_ready("product")
+    
+    @reporting.step("Select random variants")
+    def select_random_variants(self, max_rounds: int = VARIANT_ROUNDS) -> List[VariantChoice]:
+        """
+        בחירת וריאנטים אקראיים (מידה, צבע וכו'): קריאה אחת של כל המימדים, בחירה ב-Python,
+        אינטראקציה רק למימדים שמשתנים והמתנה אחת לעדכון הדף.
+        אחרי העדכון הבחירה נבדקת שוב - מימד שהאופציה שלו יצאה מהמלאי נבחר מחדש
+        """
+        applied = []
+        chosen = {}
+        for round_number in range(max_rounds):
+            changes = choose_variants(self.read_variants(), self.rng, keep_valid=round_number > 0,
+                                      previous=chosen)
+            if not changes:
+                break
+            for dimension, option in changes:
+                self._apply_variant(dimension, option)
+                applied.append((dimension, option))
+                chosen[dimension.key] = option.value
+            self.wait_until_ready("variant")
+        return applied
     
-    @allure.step("Select random variants")
-    def select_random_variants(self):
-        """בחירת וריאנטים אקראיים (מידה, צבע וכו')"""
-        
-        # בחירת מידה אקראית
-        if self.is_visible(self.SIZE_SELECT):
-            self.logger.info("Selecting random size...")
-            self._select_random_option(self.SIZE_SELECT)
-            time.sleep(0.5)
-        
-        # בחירת צבע אקראי
-        if self.is_visible(self.COLOR_SELECT):
-            self.logger.info("Selecting random color...")
-            self._select_random_option(self.COLOR_SELECT)
-            time.sleep(0.5)
-        
-        # אם יש כפתורי וריאנט (לפעמים זה לא select אלא כפתורים)
+    def _read_variants_args(self) -> dict:
+        """הארגומנטים של READ_VARIANTS_SCRIPT - הסלקטורים, שם ה-attribute לסימון, וכללי ה-placeholder"""
+        return {"selects": self.VARIANT_SELECTS, "groups": self.VARIANT_GROUPS, "attribute": self.VARIANT_ATTRIBUTE,
+                "placeholders": list(PLACEHOLDER_VALUES), "placeholderLabel": PLACEHOLDER_LABEL}
+    
+    def read_variants(self) -> List[VariantDimension]:
+        """כל מימדי הוריאנטים בדף (כולל אופציות שאזלו מהמלאי) בקריאה אחת לדפדפן"""
         try:
-            variant_buttons = self.page.locator(self.VARIANT_BUTTONS).all()
-            if len(variant_buttons) > 0:
-                random_button = random.choice(variant_buttons)
-                random_button.click()
-                time.sleep(0.5)
-        except:
-            pass
+            raw = self.page.evaluate(self.READ_VARIANTS_SCRIPT, self._read_variants_args())
+        except Exception as e:
+            self.logger.error(f"Could not read variants: {e}")
+            return []
+        return parse_dimensions(raw)
     
-    def _select_random_option(self, select_locator: str):
-        """בחירת אופציה אקראית מתוך select"""
+    def _apply_variant(self, dimension: VariantDimension, option: VariantOption):
+        """select_option למימד select, לחיצה על הכפתור למימד של כפתורים"""
         try:
-            select_element = self.page.locator(select_locator).first
-            options = select_element.locator("option").all()
-            
-            # דילוג על האופציה הראשונה (בדרך כלל "Select...")
-            valid_options = [opt for opt in options[1:] if opt.get_attribute("value")]
-            
-            if valid_options:
-                random_option = random.choice(valid_options)
-                value = random_option.get_attribute("value")
-                select_element.select_option(value)
-                self.logger.info(f"Selected option: {random_option.inner_text()}")
+            if dimension.kind == "select":
+                self.page.select_option(f"[{self.VARIANT_ATTRIBUTE}='{dimension.key}']", option.value)
+            else:
+                self.page.click(f"[{self.VARIANT_ATTRIBUTE}='{option.value}']")
+            self.logger.info(f"Selected {dimension.name}: {option.label}")
         except Exception as e:
-            self.logger.error(f"Could not select option: {e}")
+            self.logger.error(f"Could not select {dimension.name}: {e}")
     
-    @allure.step("Add item to cart")
+    @reporting.step("Add item to cart")
     def add_to_cart(self):
         """הוספת פריט לסל"""
         try:
@@ -82,7 +157,7 @@ class ProductPage(BasePage):
             
             # לחיצה על הכפתור
             self.click(self.ADD_TO_CART_BUTTON)
-            time.sleep(2)
+            self.wait_until_ready("add_to_cart")
             
             # סגירת popup אם מופיע
             if self.is_visible(self.POPUP_CLOSE):
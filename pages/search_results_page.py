@@ -3,9 +3,11 @@ Search Results Page - דף תוצאות חיפוש
 """
 from pages.base_page import BasePage
 from utils.helpers import PriceParser, Logger
-import allure
-from typing import List
-import time
+from utils.search_items import SearchItem, SearchItemCollection
+from utils import reporting
+from utils.timeout_budget import timeouts
+from typing import Any, Dict, Iterator, List
+from urllib.parse import urlencode
 
 
 class SearchResultsPage(BasePage):
@@ -13,33 +15,221 @@ class SearchResultsPage(BasePage):
     
     # Locators - גמישים יותר כדי לתמוך בשינויים של eBay
     ITEMS_LIST = "li.s-item, [class*='s-item'], [data-view='mi']"
-    ITEM_LINK = "a.s-item__link, a[href*='/itm/'], .s-item__link"
-    ITEM_PRICE = ".s-item__price, [class*='s-item__price'], span[class*='price']"
-    ITEM_TITLE = ".s-item__title, h3, [class*='title']"
+    # חלופות לפי סדר עדיפות - ה-registry לומד איזו מהן עובדת בפועל
+    ITEM_LINK_SELECTORS = ["a.s-item__link", "a[href*='/itm/']", ".s-item__link"]
+    ITEM_PRICE_SELECTORS = [".s-item__price", "[class*='s-item__price']", "span[class*='price']"]
+    ITEM_TITLE_SELECTORS = [".s-item__title", "h3", "[class*='title']"]
+    ITEM_LINK = ", ".join(ITEM_LINK_SELECTORS)
+    ITEM_PRICE = ", ".join(ITEM_PRICE_SELECTORS)
+    ITEM_TITLE = ", ".join(ITEM_TITLE_SELECTORS)
     NEXT_PAGE_BUTTON = "a.pagination__next, a[aria-label='Go to next search page'], nav a:has-text('Next')"
     MIN_PRICE_INPUT = "input[aria-label*='Minimum Value'], input[aria-label*='Minimum']"
     MAX_PRICE_INPUT = "input[aria-label*='Maximum Value'], input[aria-label*='Maximum']"
     PRICE_SUBMIT_BUTTON = "button[aria-label='Submit price range'], button[type='submit']"
+    RESULTS_COUNT = "h1.srp-controls__count-heading, .srp-controls__count"
+    # הפילטר יכול לרענן את התוצאות בלי ניווט - לא מחכים לניווט יותר מזה
+    PRICE_FILTER_NAVIGATION_MS = 5000
     
-    def __init__(self, page):
+    READY_CONDITIONS = {
+        **BasePage.READY_CONDITIONS,
+        "search": {"selector": f"{RESULTS_COUNT}, li.s-item"},
+    }
+    
+    # סלקטורים לרשימת הפריטים - לפי סדר עדיפות
+    ITEM_SELECTORS = [
+        "li.s-item",
+        ".srp-results li",
+        "[class*='s-item']",
+        "div.s-item",
+        "ul li[data-view]",
+        "//li[contains(@class, 's-item')]",  # XPath
+    ]
+    
+    # סקריפט לחילוץ כל הפריטים בדף בקריאה אחת לדפדפן
+    # כל שדה מקבל רשימת חלופות לפי סדר, ומדווח איזו חלופה התאימה
+    EXTRACT_ITEMS_SCRIPT = """
+    (args) => {
+        let elements = [];
+        let matched = null;
+        for (const selector of args.itemSelectors) {
+            if (selector.startsWith('//')) {
+                const snapshot = document.evaluate(
+                    selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+                elements = [];
+                for (let i = 0; i < snapshot.snapshotLength; i++) {
+                    elements.push(snapshot.snapshotItem(i));
+                }
+            } else {
+                elements = Array.from(document.querySelectorAll(selector));
+            }
+            if (elements.length > 0) {
+                matched = selector;
+                break;
+            }
+        }
+        const used = {price: {}, link: {}, title: {}};
+        const find = (item, field, selectors) => {
+            for (const selector of selectors) {
+                const element = item.querySelector(selector);
+                if (element) {
+                    used[field][selector] = (used[field][selector] || 0) + 1;
+                    return element;
+                }
+            }
+            return null;
+        };
+        const records = elements.map((item, position) => {
+            const price = find(item, 'price', args.price);
+            const link = find(item, 'link', args.link);
+            const title = find(item, 'title', args.title);
+            return {
+                position: position,
+                price_text: price ? price.innerText : null,
+                href: link ? link.getAttribute('href') : null,
+                title: title ? title.innerText : '',
+            };
+        });
+        return {selector: matched, used: used, items: records};
+    }
+    """
+    
+    # שמות לוגיים ב-selector registry
+    SELECTOR_GROUPS = {
+        "search.item": ITEM_SELECTORS,
+        "search.item_price": ITEM_PRICE_SELECTORS,
+        "search.item_link": ITEM_LINK_SELECTORS,
+        "search.item_title": ITEM_TITLE_SELECTORS,
+    }
+    
+    # חיפוש ישיר דרך URL - פרמטרים של eBay
+    DEFAULT_BASE_URL = "https://www.ebay.com"
+    SEARCH_PATH = "/sch/i.html"
+    MAX_ITEMS_PER_PAGE = 240
+    
+    def __init__(self, page, base_url: str = None):
         super().__init__(page)
+        self.base_url = base_url or self.DEFAULT_BASE_URL
         self.price_parser = PriceParser()
         self.logger = Logger()
     
-    @allure.step("Get items under price: ${max_price}, limit: {limit}")
-    def get_items_under_price(self, max_price: float, limit: int = 5) -> List[str]:
+    def build_search_url(self, query: str, max_price: float = None, per_page: int = MAX_ITEMS_PER_PAGE,
+                         page_number: int = 1) -> str:
+        """
+        URL של דף תוצאות עם פילטר מחיר בצד השרת
+        _nkw = חיפוש, _udhi = מחיר מקסימלי, _ipg = פריטים לעמוד, _pgn = מספר עמוד
+        """
+        params = {"_nkw": query}
+        if max_price:
+            params["_udhi"] = f"{max_price:g}"
+        params["_ipg"] = per_page
+        params["_pgn"] = page_number
+        return f"{self.base_url}{self.SEARCH_PATH}?{urlencode(params)}"
+    
+    @reporting.step("Search by URL: '{query}' under ${max_price}, limit: {limit}")
+    def search_by_url(self, query: str, max_price: float, limit: int = 5, per_page: int = MAX_ITEMS_PER_PAGE,
+                      prefetch: bool = True, max_pages: int = 10,
+                      collected: SearchItemCollection = None) -> List[str]:
+        """
+        חיפוש בניווט אחד לכל עמוד - בלי דף הבית, תיבת חיפוש ופילטר UI.
+        prefetch=True - עמוד N+1 נטען בטאב שני בזמן שעמוד N מעובד
+        (אם עמוד N מספיק, הטעינה המוקדמת פשוט נזרקת)
+        """
+        return [item.url for item in self.iter_search_by_url(query, max_price, limit, per_page, prefetch, max_pages,
+                                                             collected)]
+    
+    def iter_search_by_url(self, query: str, max_price: float, limit: int = 5, per_page: int = MAX_ITEMS_PER_PAGE,
+                           prefetch: bool = True, max_pages: int = 10,
+                           collected: SearchItemCollection = None) -> Iterator[SearchItem]:
+        """
+        גרסת generator של search_by_url - כל פריט מוחזר ברגע שעבר את בדיקת המחיר,
+        כך שהצרכן (למשל הוספה לסל) עובד בזמן שהעמוד הבא עוד נטען.
+        collected - אוסף משותף בין כמה חיפושים (פריט שכבר נאסף לא יוחזר שוב)
+        """
+        collected = collected if collected is not None else SearchItemCollection()
+        found = 0
+        current = self
+        next_tab = None
+        
+        try:
+            current.navigate_to(self.build_search_url(query, max_price, per_page, 1))
+            
+            for page_number in range(1, max_pages + 1):
+                self.logger.info(f"Scanning page {page_number} for items under ${max_price}")
+                current.wait_until_ready("search")
+                
+                next_tab = None
+                if prefetch and page_number < max_pages:
+                    next_tab = self._prefetch(self.build_search_url(query, max_price, per_page, page_number + 1))
+                
+                records = current.extract_items()
+                if not records:
+                    self.logger.info(f"No more results. Found {found} items total.")
+                    return
+                
+                for item in self._matching_items(records, max_price, collected, page_number, query):
+                    yield item
+                    found += 1
+                    if found >= limit:
+                        return
+                
+                if next_tab is not None:
+                    # הטאב הקודם כבר נסרק - נסגר מיד, כך שפתוחים לכל היותר שני טאבים
+                    if current is not self:
+                        self._close_tab(current)
+                    current, next_tab = next_tab, None
+                elif page_number < max_pages:
+                    current.navigate_to(self.build_search_url(query, max_price, per_page, page_number + 1))
+        finally:
+            # גם כשהצרכן עוצר באמצע (GeneratorExit) - סגירת הטאב הנוכחי והטעינה שעוד לא נצרכה
+            for tab in (current, next_tab):
+                if tab is not None and tab is not self:
+                    self._close_tab(tab)
+    
+    def _close_tab(self, tab: "SearchResultsPage"):
+        """סגירת טאב prefetch - כשל בסגירה לא מפיל את החיפוש"""
+        try:
+            tab.page.close()
+        except Exception as e:
+            self.logger.debug(f"Failed to close prefetch tab: {e}")
+    
+    def _prefetch(self, url: str) -> "SearchResultsPage":
+        """פתיחת טאב נוסף באותו context והתחלת טעינה בלי לחכות לה"""
+        tab = SearchResultsPage(self.page.context.new_page(), self.base_url)
+        try:
+            tab.page.goto(url, wait_until="commit", timeout=self.timeout)
+        except Exception as e:
+            self.logger.error(f"Prefetch failed for {url}: {e}")
+        return tab
+    
+    @reporting.step("Get items under price: ${max_price}, limit: {limit}")
+    def get_items_under_price(self, max_price: float, limit: int = 5, bulk: bool = True,
+                              collected: SearchItemCollection = None, query: str = None) -> List[str]:
         """
         מחזיר רשימת URLs של פריטים במחיר נמוך מ-max_price
         עם תמיכה ב-Paging
+        
+        bulk=True - חילוץ כל הפריטים בדף בקריאה אחת (page.evaluate)
+        bulk=False - המצב הישן, כמה קריאות Playwright לכל פריט
+        """
+        # החזרת מה שנמצא (גם אם פחות מ-limit)
+        return [item.url for item in self.iter_items_under_price(max_price, limit, bulk, collected, query)]
+    
+    def iter_items_under_price(self, max_price: float, limit: int = 5, bulk: bool = True,
+                               collected: SearchItemCollection = None, query: str = None) -> Iterator[SearchItem]:
+        """
+        גרסת generator של get_items_under_price - מחזיר SearchItem
+        ברגע שהפריט עבר את בדיקת המחיר, לפני שהעמודים הבאים נסרקו.
+        query - החיפוש שהוביל לדף (נשמר ב-SearchItem)
         """
-        collected_urls = []
+        collected = collected if collected is not None else SearchItemCollection()
+        found = 0
         page_number = 1
         
-        while len(collected_urls) < limit:
+        while found < limit:
             self.logger.info(f"Scanning page {page_number} for items under ${max_price}")
             
-            # המתנה לטעינת הדף
-            time.sleep(3)
+            # המתנה לטעינת הדף - עד שמונה התוצאות/הפריטים מופיעים
+            self.wait_until_ready("search")
             
             # דיבאג - הדפסת URL ומצב הדף
             current_url = self.get_current_url()
@@ -56,80 +246,125 @@ class SearchResultsPage(BasePage):
                 if "sign in" in page_text.lower() and "results" not in page_text.lower():
                     self.logger.error("Might be on wrong page - check screenshot")
             
-            # ניסיון למצוא פריטים עם סלקטורים שונים
-            items = []
-            selectors_to_try = [
-                "li.s-item",
-                ".srp-results li",
-                "[class*='s-item']",
-                "div.s-item",
-                "ul li[data-view]",
-                "//li[contains(@class, 's-item')]",  # XPath
-            ]
-            
-            for selector in selectors_to_try:
-                try:
-                    if selector.startswith("//"):
-                        # XPath
-                        items = self.page.locator(f"xpath={selector}").all()
-                    else:
-                        items = self.page.locator(selector).all()
-                    
-                    if len(items) > 0:
-                        self.logger.info(f"✓ Found {len(items)} items with selector: {selector}")
-                        break
-                except Exception as e:
-                    continue
+            if bulk:
+                records = self.extract_items()
+                page_items = (self._matching_items(records, max_price, collected, page_number, query)
+                              if records else None)
+            else:
+                # הסלקטור שעבד בפעם הקודמת נבדק ראשון, השאר רק בהחטאה
+                selector = self.resolve_selector("search.item")
+                page_items = (self._matching_locator_items(selector, max_price, collected, page_number, query)
+                              if selector else None)
             
-            if len(items) == 0:
+            if page_items is None:
                 self.logger.error("No items found on page with any selector!")
                 self.logger.error(f"URL: {current_url}")
-                break
+                return
             
-            for item in items:
-                if len(collected_urls) >= limit:
-                    break
-                
-                try:
-                    # קריאת מחיר
-                    price_element = item.locator(self.ITEM_PRICE).first
-                    price_text = price_element.inner_text(timeout=5000)
-                    price = self.price_parser.extract_price(price_text)
-                    
-                    # בדיקה אם המחיר תקין
-                    if self.price_parser.is_price_valid(price, max_price):
-                        # קבלת הקישור
-                        link_element = item.locator(self.ITEM_LINK).first
-                        url = link_element.get_attribute("href")
-                        
-                        if url and url not in collected_urls:
-                            title = item.locator(self.ITEM_TITLE).first.inner_text(timeout=5000)
-                            self.logger.info(f"Found item: {title[:50]}... - ${price}")
-                            collected_urls.append(url)
-                            
-                except Exception as e:
-                    # דילוג על פריטים שגורמים לשגיאה (מודעות וכו')
-                    continue
-            
-            # אם אספנו מספיק - עצירה
-            if len(collected_urls) >= limit:
-                break
+            for item in page_items:
+                yield item
+                found += 1
+                # אם אספנו מספיק - עצירה
+                if found >= limit:
+                    return
             
             # בדיקה אם יש עמוד הבא
             if self.is_visible(self.NEXT_PAGE_BUTTON):
                 self.logger.info(f"Moving to next page...")
-                self.click(self.NEXT_PAGE_BUTTON)
+                # המתנה לניווט לעמוד החדש (ה-ready בתחילת הלולאה יחכה לתוצאות)
+                with self.page.expect_navigation(wait_until="domcontentloaded", timeout=self.timeout):
+                    self.click(self.NEXT_PAGE_BUTTON)
                 page_number += 1
-                time.sleep(2)  # המתנה לטעינת עמוד חדש
             else:
                 # אין עוד עמודים
-                self.logger.info(f"No more pages available. Found {len(collected_urls)} items total.")
-                break
+                self.logger.info(f"No more pages available. Found {found} items total.")
+                return
+    
+    def extract_items(self) -> List[Dict[str, Any]]:
+        """
+        חילוץ מחיר, קישור וכותרת של כל הפריטים בדף - round trip אחד לדפדפן
+        מחזיר רשימת dicts: position, price_text, href, title
+        """
+        result = self.page.evaluate(self.EXTRACT_ITEMS_SCRIPT, self.extract_items_args())
+        self.record_extraction(result)
         
-        # החזרת מה שנמצא (גם אם פחות מ-limit)
-        return collected_urls[:limit]
+        if result["selector"]:
+            self.logger.info(f"✓ Found {len(result['items'])} items with selector: {result['selector']}")
+        
+        return result["items"]
+    
+    def extract_items_args(self) -> Dict[str, List[str]]:
+        """הארגומנטים לסקריפט - כל רשימה מתחילה בחלופה שעבדה בפעם הקודמת"""
+        return {
+            "itemSelectors": self.selectors.ordered("search.item"),
+            "price": self.selectors.ordered("search.item_price"),
+            "link": self.selectors.ordered("search.item_link"),
+            "title": self.selectors.ordered("search.item_title"),
+        }
+    
+    def record_extraction(self, result: Dict[str, Any]):
+        """עדכון ה-registry לפי החלופות שהתאימו בדף"""
+        self.selectors.record("search.item", result["selector"])
+        for field, name in (("price", "search.item_price"), ("link", "search.item_link"),
+                            ("title", "search.item_title")):
+            used = result["used"][field]
+            if used:
+                self.selectors.record(name, max(used, key=used.get))
+    
+    def _matching_items(self, records: List[Dict[str, Any]], max_price: float, collected: SearchItemCollection,
+                        page_number: int, query: str = None) -> Iterator[SearchItem]:
+        """סינון מחיר והסרת כפילויות (לפי מזהה הפריט של eBay) על רשומות שחולצו מהדף"""
+        for record in records:
+            # פריטים בלי מחיר/קישור (מודעות וכו') - דילוג
+            if not record["price_text"] or not record["href"]:
+                continue
+            
+            # בטווח ("$20.00 to $45.00") בודקים את הקצה העליון
+            price = self.price_parser.extract_max_price(record["price_text"])
+            if not self.price_parser.is_price_valid(price, max_price):
+                continue
+            
+            item = SearchItem(record["href"], record["title"], price, page_number, record["position"], query)
+            if collected.add(item):
+                self.logger.info(f"Found item: {record['title'][:50]}... - ${price}")
+                yield item
+    
+    def _matching_locator_items(self, selector: str, max_price: float, collected: SearchItemCollection,
+                                page_number: int, query: str = None) -> Iterator[SearchItem]:
+        """המצב הישן - קריאות Playwright נפרדות לכל פריט"""
+        items = self.page.locator(selector).all()
+        self.logger.info(f"✓ Found {len(items)} items with selector: {selector}")
+        
+        for position, item in enumerate(items):
+            try:
+                # קריאת מחיר
+                price_element = item.locator(self.ITEM_PRICE).first
+                price_text = price_element.inner_text(timeout=timeouts.timeout_for("probe"))
+                price = self.price_parser.extract_max_price(price_text)
+                
+                # בדיקה אם המחיר תקין
+                if self.price_parser.is_price_valid(price, max_price):
+                    # קבלת הקישור
+                    link_element = item.locator(self.ITEM_LINK).first
+                    url = link_element.get_attribute("href")
+                    
+                    if url and url not in collected:
+                        title = item.locator(self.ITEM_TITLE).first.inner_text(timeout=timeouts.timeout_for("probe"))
+                        self.logger.info(f"Found item: {title[:50]}... - ${price}")
+                        found_item = SearchItem(url, title, price, page_number, position, query)
+                        collected.add(found_item)
+                    else:
+                        continue
+                else:
+                    continue
+                        
+            except Exception as e:
+                # דילוג על פריטים שגורמים לשגיאה (מודעות וכו')
+                continue
+            
+            yield found_item
     
-    @allure.step("Apply price filter: max ${max_price}")
+    @reporting.step("Apply price filter: max ${max_price}")
     def apply_price_filter(self, max_price: float):
         """הפעלת פילטר מחיר (אם זמין)"""
         try:
@@ -137,8 +372,15 @@ class SearchResultsPage(BasePage):
                 self.fill(self.MAX_PRICE_INPUT, str(int(max_price)))
                 
                 if self.is_visible(self.PRICE_SUBMIT_BUTTON):
-                    self.click(self.PRICE_SUBMIT_BUTTON)
-                    time.sleep(2)
+                    # נטען רק כאן - import של ה-pages (ו-collection) לא טוען את playwright
+                    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+                    timeout = timeouts.timeout_for("navigation", cap=self.PRICE_FILTER_NAVIGATION_MS)
+                    try:
+                        with self.page.expect_navigation(wait_until="domcontentloaded", timeout=timeout):
+                            self.click(self.PRICE_SUBMIT_BUTTON)
+                    except PlaywrightTimeoutError:
+                        self.logger.info("Price filter applied without navigation")
+                    self.wait_until_ready("search")
                     self.logger.info(f"Applied price filter: max ${max_price}")
         except Exception as e:
             self.logger.error(f"Could not apply price filter: {e}")
@@ -0,0 +1 @@
+"""Async pages package - אותם Page Objects על playwright.async_api"""
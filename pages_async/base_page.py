@@ -0,0 +1,164 @@
+"""
+Async Base Page - מחלקת בסיס לדפים על playwright.async_api
+"""
+from pages.base_page import BasePage as _SyncBasePage, _PageActivity
+from utils.helpers import Logger
+from utils.selector_registry import selector_registry
+from utils.tracing import instrument_class, tracer
+from utils.artifacts import artifacts
+from utils.timeout_budget import timeouts
+from utils import reporting
+from typing import TYPE_CHECKING, List, Optional, Tuple
+import asyncio
+import time
+import weakref
+from datetime import datetime
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+
+_activity = weakref.WeakKeyDictionary()
+
+
+class BasePage:
+    
+    READY_CONDITIONS = _SyncBasePage.READY_CONDITIONS
+    NETWORK_IDLE_MS = _SyncBasePage.NETWORK_IDLE_MS
+    POPUP_CLOSE_TARGETS = _SyncBasePage.POPUP_CLOSE_TARGETS
+    DISMISS_POPUPS_SCRIPT = _SyncBasePage.DISMISS_POPUPS_SCRIPT
+    popup_watcher_script = _SyncBasePage.popup_watcher_script
+    
+    SELECTOR_GROUPS = {}
+    
+    def __init_subclass__(cls, **kwargs):
+        """כל מתודה ציבורית של Page Object נמדדת (זמן, קריאות Playwright, timeouts)"""
+        super().__init_subclass__(**kwargs)
+        instrument_class(cls)
+    
+    timeout = _SyncBasePage.timeout
+    _element_key = _SyncBasePage._element_key
+    
+    def __init__(self, page: "Page"):
+        self.page = page
+        self.selectors = selector_registry
+        for name, alternatives in self.SELECTOR_GROUPS.items():
+            self.selectors.register(name, alternatives)
+        if page not in _activity:
+            _activity[page] = _PageActivity(page)
+        self._activity = _activity[page]
+    
+    async def navigate_to(self, url: str):
+        """ניווט עם timeout.navigation וניסיון חוזר עם backoff"""
+        with reporting.task_step(f"Navigate to {url}"), timeouts.waiting("navigation"):
+            await timeouts.retry.run_async(
+                lambda: self.page.goto(url, wait_until="domcontentloaded", timeout=timeouts.timeout_for("navigation")),
+                f"navigation to {url}")
+    
+    async def click(self, locator: str):
+        """לחיצה על אלמנט - עם גלילה אוטומטית"""
+        element = self.page.locator(locator).first
+        await element.scroll_into_view_if_needed(timeout=self.timeout)
+        await element.click(timeout=self.timeout)
+    
+    async def fill(self, locator: str, text: str):
+        """מילוי טקסט - עם גלילה אוטומטית"""
+        element = self.page.locator(locator).first
+        await element.scroll_into_view_if_needed(timeout=self.timeout)
+        await element.fill(text, timeout=self.timeout)
+    
+    async def get_text(self, locator: str) -> str:
+        return await self.page.locator(locator).inner_text(timeout=self.timeout)
+    
+    async def wait_for_element(self, locator: str, state: str = "visible"):
+        """אלמנט שלא הופיע בפעם הקודמת מקבל רק timeout.absent (fail fast)"""
+        key = self._element_key(locator)
+        with timeouts.waiting("element"):
+            try:
+                await self.page.locator(locator).wait_for(state=state, timeout=timeouts.element_timeout(key))
+            except Exception:
+                timeouts.mark_absent(key)
+                raise
+        timeouts.mark_present(key)
+    
+    async def is_visible(self, locator: str) -> bool:
+        try:
+            return await self.page.locator(locator).is_visible(timeout=timeouts.timeout_for("probe"))
+        except:
+            tracer.note_timeout()
+            return False
+    
+    async def wait_until_ready(self, page_kind: str = "page", timeout: int = None) -> bool:
+        """המתנה לתנאי מוכנות - כמו בגרסה הסינכרונית"""
+        condition = self.READY_CONDITIONS[page_kind]
+        timeout = timeouts.timeout_for("default", cap=timeout or condition.get("timeout"))
+        start = time.perf_counter()
+        ready = True
+        
+        try:
+            if "load_state" in condition:
+                await self.page.wait_for_load_state(condition["load_state"], timeout=timeout)
+            if "selector" in condition:
+                await self.page.locator(condition["selector"]).first.wait_for(
+                    state=condition.get("state", "visible"), timeout=timeout)
+            if "network" in condition:
+                ready = await self.wait_for_network_idle(
+                    condition["network"], condition.get("idle_ms", self.NETWORK_IDLE_MS), timeout)
+        except Exception as e:
+            Logger.debug("Ready condition '%s' not met: %s", page_kind, e)
+            ready = False
+        
+        elapsed = time.perf_counter() - start
+        self._activity.wait_timings.append((page_kind, elapsed, ready))
+        timeouts.record_wait(f"ready:{page_kind}", elapsed, ready)
+        if not ready:
+            tracer.note_timeout()
+        Logger.debug("Wait '%s': %.2fs (%s)", page_kind, elapsed, "ready" if ready else "timed out")
+        return ready
+    
+    async def wait_for_network_idle(self, url_patterns: List[str], idle_ms: int = None, timeout: int = None) -> bool:
+        """המתנה עד שאין בקשות פתוחות שתואמות לתבניות במשך idle_ms"""
+        idle_ms = idle_ms or self.NETWORK_IDLE_MS
+        deadline = time.monotonic() + (timeout or self.timeout) / 1000
+        
+        while time.monotonic() < deadline:
+            quiet_for = (time.monotonic() - self._activity.last_activity) * 1000
+            if self._activity.pending_count(url_patterns) == 0 and quiet_for >= idle_ms:
+                return True
+            await asyncio.sleep(0.05)
+        
+        return False
+    
+    def get_wait_timings(self) -> List[Tuple[str, float, bool]]:
+        return list(self._activity.wait_timings)
+    
+    async def take_screenshot(self, name: str = None) -> Optional[str]:
+        """צילום לזיכרון - כתיבה וצירוף דרך ה-ArtifactManager, כמו בגרסה הסינכרונית"""
+        if not name:
+            name = f"screenshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        options = artifacts.screenshot_options()
+        if options is None:
+            return None
+        return artifacts.save(name, await self.page.screenshot(**options), options["type"])
+    
+    def get_current_url(self) -> str:
+        return self.page.url
+    
+    async def close_popups(self) -> int:
+        """סגירת popups נפוצים - מעבר אחד על ה-DOM"""
+        await self.wait_until_ready("page")
+        
+        try:
+            return await self.page.evaluate(self.DISMISS_POPUPS_SCRIPT, self.POPUP_CLOSE_TARGETS)
+        except Exception as e:
+            Logger.debug(f"Could not dismiss popups: {e}")
+            return 0
+    
+    async def enable_popup_watcher(self):
+        """הפעלת ה-watcher על הדף הזה"""
+        script = self.popup_watcher_script()
+        await self.page.add_init_script(script)
+        await self.page.evaluate(script)
+
+
+instrument_class(BasePage)
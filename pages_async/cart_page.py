@@ -0,0 +1,68 @@
+"""
+Async Cart Page - סל קניות
+"""
+from pages_async.base_page import BasePage
+from pages.cart_page import CartPage as _SyncCartPage
+from utils.helpers import PriceParser, Logger
+from utils import reporting
+
+
+class CartPage(BasePage):
+    
+    CART_URL = _SyncCartPage.CART_URL
+    CART_ITEMS = _SyncCartPage.CART_ITEMS
+    SUBTOTAL = _SyncCartPage.SUBTOTAL
+    TOTAL = _SyncCartPage.TOTAL
+    READY_CONDITIONS = _SyncCartPage.READY_CONDITIONS
+    
+    def __init__(self, page, cart_url: str = None):
+        super().__init__(page)
+        self.cart_url = cart_url or self.CART_URL
+        self.price_parser = PriceParser()
+        self.logger = Logger()
+    
+    async def open_cart(self):
+        """פתיחת סל הקניות"""
+        with reporting.task_step("Open cart"):
+            await self.navigate_to(self.cart_url)
+            await self.wait_until_ready("cart")
+    
+    async def get_cart_total(self) -> float:
+        """קבלת סכום כולל של הסל"""
+        with reporting.task_step("Get cart total"):
+            try:
+                if await self.is_visible(self.TOTAL):
+                    total = self.price_parser.extract_price(await self.get_text(self.TOTAL))
+                    self.logger.info(f"Cart total: ${total}")
+                    return total
+                
+                elif await self.is_visible(self.SUBTOTAL):
+                    subtotal = self.price_parser.extract_price(await self.get_text(self.SUBTOTAL))
+                    self.logger.info(f"Cart subtotal: ${subtotal}")
+                    return subtotal
+                
+                else:
+                    self.logger.error("Could not find cart total")
+                    return 0.0
+                    
+            except Exception as e:
+                self.logger.error(f"Error getting cart total: {e}")
+                return 0.0
+    
+    async def get_items_count(self) -> int:
+        """ספירת פריטים בסל"""
+        with reporting.task_step("Get cart items count"):
+            try:
+                count = await self.page.locator(self.CART_ITEMS).count()
+                self.logger.info(f"Items in cart: {count}")
+                return count
+            except:
+                return 0
+    
+    async def assert_total_not_exceeds(self, budget: float):
+        """אימות שסכום הסל לא עולה על תקציב"""
+        with reporting.task_step(f"Assert cart total not exceeds ${budget}"):
+            total = await self.get_cart_total()
+            self.logger.info(f"Budget: ${budget}, Actual: ${total}")
+            assert total <= budget, f"Cart total ${total} exceeds budget ${budget}"
+            self.logger.info(f"✓ Cart total is within budget!")
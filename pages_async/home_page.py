@@ -0,0 +1,39 @@
+"""
+Async eBay Home Page - דף הבית
+"""
+from pages_async.base_page import BasePage
+from pages.home_page import HomePage as _SyncHomePage
+from utils import reporting
+
+
+class HomePage(BasePage):
+    """דף הבית של eBay"""
+    
+    SEARCH_BOX = _SyncHomePage.SEARCH_BOX
+    SEARCH_BUTTON = _SyncHomePage.SEARCH_BUTTON
+    SIGN_IN_LINK = _SyncHomePage.SIGN_IN_LINK
+    CART_ICON = _SyncHomePage.CART_ICON
+    READY_CONDITIONS = _SyncHomePage.READY_CONDITIONS
+    SELECTOR_GROUPS = _SyncHomePage.SELECTOR_GROUPS
+    
+    def __init__(self, page, base_url: str = None):
+        super().__init__(page)
+        self.url = base_url or _SyncHomePage.DEFAULT_URL
+    
+    async def open(self):
+        """פתיחת דף הבית"""
+        with reporting.task_step("Open eBay home page"):
+            await self.navigate_to(self.url)
+            await self.wait_until_ready("home")
+            await self.close_popups()
+    
+    async def search_item(self, query: str):
+        """חיפוש מוצר"""
+        with reporting.task_step(f"Search for: {query}"):
+            await self.wait_for_element(self.SEARCH_BOX, state="visible")
+            await self.fill(self.SEARCH_BOX, query)
+            await self.click(self.SEARCH_BUTTON)
+    
+    async def is_logged_in(self) -> bool:
+        """בדיקה אם משתמש מחובר"""
+        return not await self.is_visible(self.SIGN_IN_LINK)
@@ -0,0 +1,92 @@
+"""
+Async Product Page - דף מוצר בודד
+"""
+from pages_async.base_page import BasePage
+from pages.product_page import ProductPage as _SyncProductPage
+from utils.helpers import Logger
+from utils import reporting
+from utils.variants import (VariantChoice, VariantDimension, VariantOption, choose_variants,
+                            make_rng, parse_dimensions)
+from typing import List, Union
+import random
+
+
+class ProductPage(BasePage):
+    """דף מוצר"""
+    
+    ADD_TO_CART_BUTTON = _SyncProductPage.ADD_TO_CART_BUTTON
+    SIZE_SELECT = _SyncProductPage.SIZE_SELECT
+    COLOR_SELECT = _SyncProductPage.COLOR_SELECT
+    VARIANT_BUTTONS = _SyncProductPage.VARIANT_BUTTONS
+    VARIANT_SELECTS = _SyncProductPage.VARIANT_SELECTS
+    VARIANT_GROUPS = _SyncProductPage.VARIANT_GROUPS
+    VARIANT_ATTRIBUTE = _SyncProductPage.VARIANT_ATTRIBUTE
+    READ_VARIANTS_SCRIPT = _SyncProductPage.READ_VARIANTS_SCRIPT
+    _read_variants_args = _SyncProductPage._read_variants_args
+    POPUP_CLOSE = _SyncProductPage.POPUP_CLOSE
+    READY_CONDITIONS = _SyncProductPage.READY_CONDITIONS
+    
+    def __init__(self, page, rng: Union[random.Random, int, str, None] = None):
+        super().__init__(page)
+        self.rng = rng if isinstance(rng, random.Random) else make_rng(rng)
+        self.logger = Logger()
+    
+    async def open_product(self, url: str):
+        """פתיחת דף מוצר"""
+        with reporting.task_step(f"Open product: {url}"):
+            await self.navigate_to(url)
+            await self.wait_until_ready("product")
+    
+    async def select_random_variants(self, max_rounds: int = _SyncProductPage.VARIANT_ROUNDS) -> List[VariantChoice]:
+        """בחירת וריאנטים אקראיים (מידה, צבע וכו') - קריאה אחת, בחירה ב-Python, המתנה אחת לכל סבב"""
+        with reporting.task_step("Select random variants"):
+            applied = []
+            chosen = {}
+            for round_number in range(max_rounds):
+                changes = choose_variants(await self.read_variants(), self.rng, keep_valid=round_number > 0,
+                                          previous=chosen)
+                if not changes:
+                    break
+                for dimension, option in changes:
+                    await self._apply_variant(dimension, option)
+                    applied.append((dimension, option))
+                    chosen[dimension.key] = option.value
+                await self.wait_until_ready("variant")
+            return applied
+    
+    async def read_variants(self) -> List[VariantDimension]:
+        """כל מימדי הוריאנטים בדף בקריאה אחת לדפדפן"""
+        try:
+            raw = await self.page.evaluate(self.READ_VARIANTS_SCRIPT, self._read_variants_args())
+        except Exception as e:
+            self.logger.error(f"Could not read variants: {e}")
+            return []
+        return parse_dimensions(raw)
+    
+    async def _apply_variant(self, dimension: VariantDimension, option: VariantOption):
+        try:
+            if dimension.kind == "select":
+                await self.page.select_option(f"[{self.VARIANT_ATTRIBUTE}='{dimension.key}']", option.value)
+            else:
+                await self.page.click(f"[{self.VARIANT_ATTRIBUTE}='{option.value}']")
+            self.logger.info(f"Selected {dimension.name}: {option.label}")
+        except Exception as e:
+            self.logger.error(f"Could not select {dimension.name}: {e}")
+    
+    async def add_to_cart(self):
+        """הוספת פריט לסל"""
+        with reporting.task_step("Add item to cart"):
+            try:
+                await self.wait_for_element(self.ADD_TO_CART_BUTTON, state="visible")
+                await self.click(self.ADD_TO_CART_BUTTON)
+                await self.wait_until_ready("add_to_cart")
+                
+                if await self.is_visible(self.POPUP_CLOSE):
+                    await self.click(self.POPUP_CLOSE)
+                
+                self.logger.info("Item added to cart successfully")
+                return True
+                
+            except Exception as e:
+                self.logger.error(f"Failed to add to cart: {e}")
+                return False
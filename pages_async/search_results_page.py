@@ -0,0 +1,167 @@
+"""
+Async Search Results Page - דף תוצאות חיפוש
+"""
+from pages_async.base_page import BasePage
+from pages.search_results_page import SearchResultsPage as _SyncSearchResultsPage
+from utils.helpers import PriceParser, Logger
+from utils.search_items import SearchItem, SearchItemCollection
+from utils import reporting
+from utils.timeout_budget import timeouts
+from typing import Any, AsyncIterator, Dict, List
+
+
+class SearchResultsPage(BasePage):
+    """דף תוצאות החיפוש"""
+    
+    ITEM_LINK = _SyncSearchResultsPage.ITEM_LINK
+    ITEM_PRICE = _SyncSearchResultsPage.ITEM_PRICE
+    ITEM_TITLE = _SyncSearchResultsPage.ITEM_TITLE
+    NEXT_PAGE_BUTTON = _SyncSearchResultsPage.NEXT_PAGE_BUTTON
+    MAX_PRICE_INPUT = _SyncSearchResultsPage.MAX_PRICE_INPUT
+    PRICE_SUBMIT_BUTTON = _SyncSearchResultsPage.PRICE_SUBMIT_BUTTON
+    PRICE_FILTER_NAVIGATION_MS = _SyncSearchResultsPage.PRICE_FILTER_NAVIGATION_MS
+    ITEM_SELECTORS = _SyncSearchResultsPage.ITEM_SELECTORS
+    EXTRACT_ITEMS_SCRIPT = _SyncSearchResultsPage.EXTRACT_ITEMS_SCRIPT
+    SELECTOR_GROUPS = _SyncSearchResultsPage.SELECTOR_GROUPS
+    extract_items_args = _SyncSearchResultsPage.extract_items_args
+    record_extraction = _SyncSearchResultsPage.record_extraction
+    READY_CONDITIONS = _SyncSearchResultsPage.READY_CONDITIONS
+    DEFAULT_BASE_URL = _SyncSearchResultsPage.DEFAULT_BASE_URL
+    SEARCH_PATH = _SyncSearchResultsPage.SEARCH_PATH
+    MAX_ITEMS_PER_PAGE = _SyncSearchResultsPage.MAX_ITEMS_PER_PAGE
+    build_search_url = _SyncSearchResultsPage.build_search_url
+    _matching_items = _SyncSearchResultsPage._matching_items
+    
+    def __init__(self, page, base_url: str = None):
+        super().__init__(page)
+        self.base_url = base_url or self.DEFAULT_BASE_URL
+        self.price_parser = PriceParser()
+        self.logger = Logger()
+    
+    async def search_by_url(self, query: str, max_price: float, limit: int = 5,
+                            per_page: int = MAX_ITEMS_PER_PAGE, prefetch: bool = True,
+                            max_pages: int = 10) -> List[str]:
+        """חיפוש ישיר דרך URL, עם טעינה מוקדמת של העמוד הבא בטאב שני"""
+        with reporting.task_step(f"Search by URL: '{query}' under ${max_price}, limit: {limit}"):
+            return [item.url async for item in self.iter_search_by_url(query, max_price, limit, per_page,
+                                                                         prefetch, max_pages)]
+    
+    async def iter_search_by_url(self, query: str, max_price: float, limit: int = 5,
+                                 per_page: int = MAX_ITEMS_PER_PAGE, prefetch: bool = True,
+                                 max_pages: int = 10,
+                                 collected: SearchItemCollection = None) -> AsyncIterator[SearchItem]:
+        """גרסת async generator - כל פריט מוחזר ברגע שעבר את בדיקת המחיר"""
+        collected = collected if collected is not None else SearchItemCollection()
+        found = 0
+        current = self
+        next_tab = None
+        
+        try:
+            await current.navigate_to(self.build_search_url(query, max_price, per_page, 1))
+            
+            for page_number in range(1, max_pages + 1):
+                await current.wait_until_ready("search")
+                
+                next_tab = None
+                if prefetch and page_number < max_pages:
+                    next_tab = SearchResultsPage(await self.page.context.new_page(), self.base_url)
+                    try:
+                        await next_tab.page.goto(self.build_search_url(query, max_price, per_page, page_number + 1),
+                                                 wait_until="commit", timeout=self.timeout)
+                    except Exception as e:
+                        self.logger.error(f"Prefetch failed: {e}")
+                
+                records = await current.extract_items()
+                if not records:
+                    return
+                
+                for item in self._matching_items(records, max_price, collected, page_number, query):
+                    yield item
+                    found += 1
+                    if found >= limit:
+                        return
+                
+                if next_tab is not None:
+                    if current is not self:
+                        await self._close_tab(current)
+                    current, next_tab = next_tab, None
+                elif page_number < max_pages:
+                    await current.navigate_to(self.build_search_url(query, max_price, per_page, page_number + 1))
+        finally:
+            for tab in (current, next_tab):
+                if tab is not None and tab is not self:
+                    await self._close_tab(tab)
+    
+    async def _close_tab(self, tab: "SearchResultsPage"):
+        """סגירת טאב prefetch - כשל בסגירה לא מפיל את החיפוש"""
+        try:
+            await tab.page.close()
+        except Exception as e:
+            self.logger.debug(f"Failed to close prefetch tab: {e}")
+    
+    async def get_items_under_price(self, max_price: float, limit: int = 5, query: str = None) -> List[str]:
+        """
+        מחזיר רשימת URLs של פריטים במחיר נמוך מ-max_price
+        עם תמיכה ב-Paging (חילוץ בקריאה אחת לכל עמוד)
+        """
+        with reporting.task_step(f"Get items under price: ${max_price}, limit: {limit}"):
+            return [item.url async for item in self.iter_items_under_price(max_price, limit, query=query)]
+    
+    async def iter_items_under_price(self, max_price: float, limit: int = 5, collected: SearchItemCollection = None,
+                                     query: str = None) -> AsyncIterator[SearchItem]:
+        """גרסת async generator של get_items_under_price"""
+        collected = collected if collected is not None else SearchItemCollection()
+        found = 0
+        page_number = 1
+        
+        while found < limit:
+            self.logger.info(f"Scanning page {page_number} for items under ${max_price}")
+            await self.wait_until_ready("search")
+            
+            records = await self.extract_items()
+            if not records:
+                self.logger.error("No items found on page with any selector!")
+                self.logger.error(f"URL: {self.get_current_url()}")
+                return
+            
+            for item in self._matching_items(records, max_price, collected, page_number, query):
+                yield item
+                found += 1
+                if found >= limit:
+                    return
+            
+            if await self.is_visible(self.NEXT_PAGE_BUTTON):
+                self.logger.info(f"Moving to next page...")
+                async with self.page.expect_navigation(wait_until="domcontentloaded", timeout=self.timeout):
+                    await self.click(self.NEXT_PAGE_BUTTON)
+                page_number += 1
+            else:
+                self.logger.info(f"No more pages available. Found {found} items total.")
+                return
+    
+    async def extract_items(self) -> List[Dict[str, Any]]:
+        """חילוץ כל הפריטים בדף בקריאה אחת לדפדפן"""
+        result = await self.page.evaluate(self.EXTRACT_ITEMS_SCRIPT, self.extract_items_args())
+        self.record_extraction(result)
+        return result["items"]
+    
+    async def apply_price_filter(self, max_price: float):
+        """הפעלת פילטר מחיר (אם זמין)"""
+        with reporting.task_step(f"Apply price filter: max ${max_price}"):
+            try:
+                if await self.is_visible(self.MAX_PRICE_INPUT):
+                    await self.fill(self.MAX_PRICE_INPUT, str(int(max_price)))
+                    
+                    if await self.is_visible(self.PRICE_SUBMIT_BUTTON):
+                        # נטען רק כאן - import של ה-pages (ו-collection) לא טוען את playwright
+                        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+                        timeout = timeouts.timeout_for("navigation", cap=self.PRICE_FILTER_NAVIGATION_MS)
+                        try:
+                            async with self.page.expect_navigation(wait_until="domcontentloaded", timeout=timeout):
+                                await self.click(self.PRICE_SUBMIT_BUTTON)
+                        except PlaywrightTimeoutError:
+                            self.logger.info("Price filter applied without navigation")
+                        await self.wait_until_ready("search")
+                        self.logger.info(f"Applied price filter: max ${max_price}")
+            except Exception as e:
+                self.logger.error(f"Could not apply price filter: {e}")
@@ -0,0 +1,86 @@
+"""
+Unit tests - ArtifactManager (בלי דפדפן)
+"""
+import os
+import pytest
+
+pytest.importorskip("allure")
+
+from utils import reporting
+from utils.artifacts import ArtifactManager
+
+
+class FakePage:
+    def __init__(self, frames):
+        self.frames = list(frames)
+        self.calls = []
+    
+    def screenshot(self, **options):
+        self.calls.append(options)
+        return self.frames.pop(0)
+
+
+def make_manager(tmp_path, **settings):
+    manager = ArtifactManager()
+    manager.configure(dict({"path": str(tmp_path)}, **settings))
+    return manager
+
+
+def test_duplicate_frames_are_written_once(tmp_path):
+    manager = make_manager(tmp_path)
+    page = FakePage([b"frame-a", b"frame-a", b"frame-b"])
+    
+    first = manager.capture(page, "first")
+    second = manager.capture(page, "second")
+    third = manager.capture(page, "third")
+    manager.close()
+    
+    assert second == first
+    assert sorted(os.listdir(tmp_path)) == ["first_0001.png", "third_0002.png"]
+    assert manager.stats["duplicates"] == 1
+
+
+def test_each_test_gets_its_own_attachments(tmp_path, monkeypatch):
+    attached = []
+    monkeypatch.setattr(reporting, "attach_file", lambda path, name, kind: attached.append(os.path.basename(path)))
+    manager = make_manager(tmp_path)
+    page = FakePage([b"cart", b"cart", b"cart"])
+    
+    manager.capture(page, "cart")
+    manager.flush()
+    # טסט הבא: אותו פריים ואותו שם - נכתב לקובץ חדש ומצורף לטסט הזה
+    manager.capture(page, "cart")
+    manager.capture(page, "cart")
+    manager.flush()
+    manager.close()
+    
+    assert attached == ["cart_0001.png", "cart_0002.png"]
+    assert sorted(os.listdir(tmp_path)) == ["cart_0001.png", "cart_0002.png"]
+
+
+def test_sampled_policy_captures_every_nth(tmp_path):
+    manager = make_manager(tmp_path, policy="sampled", sample_every=3)
+    page = FakePage([b"1", b"2", b"3"])
+    
+    paths = [manager.capture(page, f"shot_{i}") for i in range(7)]
+    manager.close()
+    
+    assert [path is not None for path in paths] == [True, False, False, True, False, False, True]
+
+
+def test_on_failure_policy_only_captures_forced(tmp_path):
+    manager = make_manager(tmp_path, policy="on_failure")
+    page = FakePage([b"failure"])
+    
+    assert manager.capture(page, "step") is None
+    assert os.path.basename(manager.capture(page, "failure_test", force=True)) == "failure_test_0001.png"
+    manager.close()
+
+
+def test_viewport_jpeg_options(tmp_path):
+    manager = make_manager(tmp_path, policy="viewport_jpeg", jpeg_quality=60)
+    page = FakePage([b"jpeg"])
+    
+    assert manager.capture(page, "cart").endswith("cart_0001.jpg")
+    assert page.calls == [{"full_page": False, "type": "jpeg", "quality": 60}]
+    manager.close()
@@ -0,0 +1,75 @@
+"""
+Unit tests - BrowserServerManager מול "דפדפן" מדומה (שרת HTTP קטן שעונה על /json/version)
+"""
+import os
+import socket
+import stat
+import sys
+import time
+
+import pytest
+
+from utils.browser_server import BrowserServerManager
+
+
+FAKE_CHROMIUM = f"""#!{sys.executable}
+import http.server, json, sys
+port = int(next(arg.split("=")[1] for arg in sys.argv if arg.startswith("--remote-debugging-port=")))
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = json.dumps({{"webSocketDebuggerUrl": f"ws://127.0.0.1:{{port}}/devtools/browser/x"}}).encode()
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+http.server.HTTPServer(("127.0.0.1", port), Handler).serve_forever()
+"""
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def manager(tmp_path):
+    executable = tmp_path / "fake-chromium"
+    executable.write_text(FAKE_CHROMIUM)
+    executable.chmod(executable.stat().st_mode | stat.S_IEXEC)
+    manager = BrowserServerManager(directory=str(tmp_path / "servers"), port=free_port(), startup_timeout=10)
+    manager.executable = str(executable)
+    yield manager
+    manager.stop()
+
+
+@pytest.mark.skipif(os.name == "nt", reason="fake executable is a shebang script")
+def test_server_is_reused_until_it_stops_answering(manager):
+    first = manager.ensure(executable_path=manager.executable, slot=0)
+    again = manager.ensure(executable_path=manager.executable, slot=0)
+    
+    assert first["pid"] == again["pid"]
+    assert manager.status()[0]["healthy"]
+    
+    # התהליך נעלם (קריסה / הפעלה מחדש של המחשב) - ensure מפעיל חדש
+    manager._kill(first)
+    deadline = time.monotonic() + 5
+    while manager.is_healthy(first) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    restarted = manager.ensure(executable_path=manager.executable, slot=0)
+    
+    assert restarted["pid"] != first["pid"]
+    assert manager.is_healthy(restarted)
+
+
+def test_slot_follows_xdist_worker(monkeypatch):
+    manager = BrowserServerManager(pool_size=2)
+    
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw3")
+    assert manager.slot() == 1
+    monkeypatch.delenv("PYTEST_XDIST_WORKER")
+    assert manager.slot() == 0
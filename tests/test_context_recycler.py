@@ -0,0 +1,85 @@
+"""
+Unit tests - ContextRecycler עם context מדומה (בלי דפדפן)
+"""
+from utils.context_recycler import ContextRecycler
+
+
+class FakeContext:
+    def __init__(self, storage_state):
+        self.initial_state = storage_state
+        self.closed = False
+        self._page_handlers = []
+    
+    def on(self, event, handler):
+        self._page_handlers.append(handler)
+    
+    def new_page(self):
+        page = object()
+        for handler in self._page_handlers:
+            handler(page)
+        return page
+    
+    def storage_state(self):
+        return {"cookies": [{"name": "cart", "value": "1"}], "origins": []}
+    
+    def close(self):
+        self.closed = True
+
+
+def run_tests(recycler, count, pages_per_test=1):
+    for index in range(count):
+        for _ in range(pages_per_test):
+            recycler.new_page()
+        recycler.after_test(recycler.sample(None, f"test_{index}"))
+
+
+def test_recycles_after_max_tests_and_carries_storage_state():
+    contexts = []
+    
+    def factory(state):
+        contexts.append(FakeContext(state))
+        return contexts[-1]
+    
+    recycler = ContextRecycler(factory, max_tests=3, max_pages=0)
+    run_tests(recycler, 7)
+    
+    assert recycler.recycles == 2
+    assert [context.closed for context in contexts] == [True, True, False]
+    assert contexts[0].initial_state is None
+    assert contexts[1].initial_state["cookies"][0]["name"] == "cart"
+    assert [sample.recycled is not None for sample in recycler.samples] == [False, False, True] * 2 + [False]
+
+
+def test_page_threshold_counts_extra_tabs():
+    recycler = ContextRecycler(FakeContext, max_tests=0, max_pages=5)
+    run_tests(recycler, 3, pages_per_test=3)
+    
+    assert recycler.samples[1].recycled == "6 pages"
+    assert recycler.generation == 2
+    assert recycler.samples[2].pages_in_context == 3
+
+
+def test_memory_threshold_and_report(tmp_path):
+    report = tmp_path / "memory.jsonl"
+    recycler = ContextRecycler(FakeContext, max_tests=0, max_pages=0, max_js_heap_mb=100, report_path=str(report))
+    recycler.new_page()
+    sample = recycler.sample(None, "test_heavy")
+    sample.js_heap_mb = 150.0
+    recycler.after_test(sample)
+    
+    assert recycler.recycles == 1
+    assert '"recycled": "JS heap 150.0MB"' in report.read_text()
+
+
+def test_rss_threshold_without_psutil_is_reported_once(monkeypatch):
+    from utils import context_recycler
+    
+    errors = []
+    monkeypatch.setattr(context_recycler, "psutil", None)
+    monkeypatch.setattr(context_recycler.Logger, "error", staticmethod(errors.append))
+    recycler = ContextRecycler(FakeContext, max_tests=0, max_rss_mb=2048)
+    
+    run_tests(recycler, 3)
+    
+    assert len(errors) == 1 and "psutil" in errors[0]
+    assert recycler.recycles == 0 and all(sample.rss_mb is None for sample in recycler.samples)
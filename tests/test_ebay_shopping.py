@@ -4,12 +4,18 @@ Main E2E Test - eBay Shopping Flow
 """
 import pytest
 import allure
+import itertools
 import json
+import os
+import time
 from pages.home_page import HomePage
 from pages.search_results_page import SearchResultsPage
 from pages.product_page import ProductPage
 from pages.cart_page import CartPage
-from utils.helpers import Logger, ConfigReader
+from pages.add_to_cart_pool import AddToCartPool, AddToCartReport
+from utils.helpers import Logger
+from utils.search_items import SearchItemCollection
+from utils.timeout_budget import timeouts
 
 
 @allure.feature("eBay Shopping")
@@ -18,13 +24,14 @@ class TestEbayShopping:
     """מחלקת הטסט הראשית"""
     
     @pytest.fixture(autouse=True)
-    def setup(self, page):
+    def setup(self, page, config):
         """הגדרות לפני כל טסט"""
         self.page = page
-        self.home_page = HomePage(page)
-        self.search_page = SearchResultsPage(page)
-        self.product_page = ProductPage(page)
-        self.cart_page = CartPage(page)
+        self.config = config
+        self.home_page = HomePage(page, base_url=config["ebay"]["base_url"])
+        self.search_page = SearchResultsPage(page, base_url=config["ebay"]["base_url"])
+        self.product_page = ProductPage(page, rng=config["test_settings"].get("variant_seed"))
+        self.cart_page = CartPage(page, cart_url=config["ebay"]["cart_url"])
         self.logger = Logger()
     
     def search_items_by_name_under_price(self, query: str, max_price: float, limit: int = 5) -> list:
@@ -39,7 +46,17 @@ class TestEbayShopping:
         Returns:
             רשימת URLs של פריטים שעומדים בתנאי המחיר
         """
-        with allure.step(f"Search for '{query}' under ${max_price}"):
+        with allure.step(f"Search for '{query}' under ${max_price}"), timeouts.step("search"):
+            collected = SearchItemCollection()
+            
+            # חיפוש ישיר דרך URL: ניווט אחד לכל עמוד, פילטר מחיר בצד השרת
+            if self.config["test_settings"].get("search_mode", "ui") == "url":
+                urls = self.search_page.search_by_url(query, max_price, limit, collected=collected)
+                self.logger.info(f"Found {len(urls)} items under ${max_price}")
+                self.search_page.take_screenshot(f"search_results_{query}")
+                self.save_search_items(collected)
+                return urls
+            
             # 1. פתיחת דף הבית
             self.home_page.open()
             
@@ -50,47 +67,83 @@ class TestEbayShopping:
             self.search_page.apply_price_filter(max_price)
             
             # 4. איסוף URLs של פריטים במחיר נמוך
-            urls = self.search_page.get_items_under_price(max_price, limit)
+            urls = self.search_page.get_items_under_price(max_price, limit, collected=collected, query=query)
             
             self.logger.info(f"Found {len(urls)} items under ${max_price}")
             
             # 5. צילום מסך של התוצאות
             self.search_page.take_screenshot(f"search_results_{query}")
+            self.save_search_items(collected)
             
             return urls
     
-    def add_items_to_cart(self, urls: list):
+    def iter_items_by_name_under_price(self, query: str, max_price: float, limit: int = 5):
+        """
+        גרסת זרם של פונקציה 1 - מחזירה SearchItem ברגע שנמצא,
+        כך שההוספה לסל מתחילה לפני שהחיפוש הסתיים
+        """
+        collected = SearchItemCollection()
+        
+        def search():
+            if self.config["test_settings"].get("search_mode", "ui") == "url":
+                yield from self.search_page.iter_search_by_url(query, max_price, limit, collected=collected)
+            else:
+                self.home_page.open()
+                self.home_page.search_item(query)
+                self.search_page.apply_price_filter(max_price)
+                yield from self.search_page.iter_items_under_price(max_price, limit, collected=collected,
+                                                                   query=query)
+            
+            self.search_page.take_screenshot(f"search_results_{query}")
+            self.save_search_items(collected)
+        
+        yield from self.charged_to_search(search(), f"Search for '{query}' under ${max_price}")
+    
+    @staticmethod
+    def charged_to_search(items, description: str):
+        """
+        כל משיכה מהזרם (ניווט, טעינת עמוד, סינון) רצה בצעד search - ב-Allure ובתקציב timeouts -
+        גם כשהצרכן הוא ההוספה לסל, שרצה בצעד add_to_cart. תקציב search מצטבר על פני כל המשיכות
+        """
+        budget_ms = timeouts.settings["steps"].get("search")
+        spent_ms = 0.0
+        iterator = iter(items)
+        for index in itertools.count(1):
+            start = time.perf_counter()
+            with allure.step(f"{description} (streamed, #{index})"), \
+                    timeouts.step("search", max(budget_ms - spent_ms, 1) if budget_ms else None):
+                item = next(iterator, None)
+            spent_ms += (time.perf_counter() - start) * 1000
+            if item is None:
+                return
+            yield item
+    
+    def save_search_items(self, collected: SearchItemCollection):
+        """הוספת הפריטים שנמצאו לקובץ JSON lines (קובץ לכל worker של xdist) לניתוח אחרי הריצה"""
+        path = self.config["test_settings"].get("search_items_path")
+        if not path or not len(collected):
+            return
+        worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        collected.to_jsonl(path.format(worker=worker), append=True)
+    
+    def add_items_to_cart(self, urls) -> AddToCartReport:
         """
         פונקציה 2: הוספת פריטים לסל קניות
         
         Args:
-            urls: רשימת URLs של מוצרים להוספה
+            urls: רשימת URLs של מוצרים להוספה, או זרם של פריטים מהחיפוש
+        
+        Returns:
+            דוח עם תוצאה לכל פריט (הצלחה/כשלון, צילום מסך, שגיאה)
         """
-        with allure.step(f"Add {len(urls)} items to cart"):
-            for index, url in enumerate(urls, start=1):
-                try:
-                    self.logger.info(f"Adding item {index}/{len(urls)} to cart...")
-                    
-                    # 1. פתיחת דף המוצר
-                    self.product_page.open_product(url)
-                    
-                    # 2. בחירת וריאנטים אקראיים (מידה, צבע וכו')
-                    self.product_page.select_random_variants()
-                    
-                    # 3. הוספה לסל
-                    success = self.product_page.add_to_cart()
-                    
-                    if success:
-                        # 4. צילום מסך
-                        self.product_page.take_screenshot(f"item_{index}_added_to_cart")
-                        self.logger.info(f"✓ Item {index} added successfully")
-                    else:
-                        self.logger.error(f"✗ Failed to add item {index}")
-                    
-                except Exception as e:
-                    self.logger.error(f"Error adding item {index}: {e}")
-                    self.product_page.take_screenshot(f"item_{index}_error")
-                    continue
+        count = len(urls) if isinstance(urls, list) else "streamed"
+        with allure.step(f"Add {count} items to cart"), timeouts.step("add_to_cart"):
+            # כל worker הוא טאב נוסף באותו context - הסל משותף
+            settings = self.config["test_settings"]
+            pool = AddToCartPool(self.page.context, workers=settings.get("cart_workers", 1),
+                                 variant_seed=settings.get("variant_seed"))
+            return pool.run(urls)
     
     def assert_cart_total_not_exceeds(self, budget_per_item: float, items_count: int):
         """
@@ -100,7 +153,7 @@ class TestEbayShopping:
             budget_per_item: תקציב לכל פריט
             items_count: כמות פריטים
         """
-        with allure.step(f"Assert cart total ≤ ${budget_per_item * items_count}"):
+        with allure.step(f"Assert cart total ≤ ${budget_per_item * items_count}"), timeouts.step("cart"):
             # 1. פתיחת סל הקניות
             self.cart_page.open_cart()
             
@@ -124,23 +177,30 @@ class TestEbayShopping:
         max_price = 220
         items_limit = 5
         
-        # שלב 1: חיפוש
-        urls = self.search_items_by_name_under_price(search_query, max_price, items_limit)
-        
-        # אימות שמצאנו פריטים
-        assert len(urls) > 0, "No items found!"
-        
-        # שלב 2: הוספה לסל
-        self.add_items_to_cart(urls)
+        if self.config["test_settings"].get("stream_search_to_cart", False):
+            # שלבים 1+2 בצינור אחד: כל פריט שנמצא נשלח מיד לטאב פנוי
+            report = self.add_items_to_cart(
+                self.iter_items_by_name_under_price(search_query, max_price, items_limit))
+            urls = [result.url for result in report.results]
+            assert len(urls) > 0, "No items found!"
+        else:
+            # שלב 1: חיפוש
+            urls = self.search_items_by_name_under_price(search_query, max_price, items_limit)
+            
+            # אימות שמצאנו פריטים
+            assert len(urls) > 0, "No items found!"
+            
+            # שלב 2: הוספה לסל
+            self.add_items_to_cart(urls)
         
         # שלב 3: אימות סכום
         self.assert_cart_total_not_exceeds(max_price, len(urls))
     
     @allure.title("Data-Driven Test: Multiple search scenarios")
-    @pytest.mark.parametrize("test_data", ConfigReader.read_json("test_data/search_data.json")["test_scenarios"])
     def test_data_driven_search(self, test_data):
         """
-        טסט Data-Driven - מריץ מספר תרחישים מקובץ JSON
+        טסט Data-Driven - מריץ מספר תרחישים מהקטלוג
+        (test_data מגיע מ-pytest_generate_tests, עם סינון --scenario-tag / --scenario-max-price וכו')
         """
         # קריאת נתונים
         query = test_data["search_query"]
@@ -0,0 +1,59 @@
+"""
+Async E2E Test - כמה תרחישי חיפוש במקביל באותו תהליך
+כל תרחיש רץ ב-context משלו (סל נפרד), כולם על אותו דפדפן. התרחישים - לפי אותו סינון
+של --scenario-* כמו בטסטים הסינכרוניים
+"""
+import pytest
+import allure
+import asyncio
+from pages_async.home_page import HomePage
+from pages_async.search_results_page import SearchResultsPage
+from utils.helpers import Logger
+
+
+@allure.feature("eBay Shopping")
+@allure.story("Concurrent Scenarios (async)")
+class TestEbayShoppingAsync:
+    """תרחישים מקבילים על playwright.async_api"""
+    
+    async def search_items_by_name_under_price(self, context, config, query: str, max_price: float,
+                                               limit: int = 5) -> list:
+        """חיפוש פריטים לפי שם ומחיר מקסימלי - על דף חדש ב-context הנתון"""
+        page = await context.new_page()
+        page.set_default_timeout(config["timeout"]["default"])
+        page.set_default_navigation_timeout(config["timeout"]["navigation"])
+        try:
+            home_page = HomePage(page, base_url=config["ebay"]["base_url"])
+            search_page = SearchResultsPage(page, base_url=config["ebay"]["base_url"])
+            
+            if config["test_settings"].get("search_mode", "ui") == "url":
+                urls = await search_page.search_by_url(query, max_price, limit)
+            else:
+                await home_page.open()
+                await home_page.search_item(query)
+                await search_page.apply_price_filter(max_price)
+                urls = await search_page.get_items_under_price(max_price, limit, query=query)
+            
+            Logger.info(f"[{query}] Found {len(urls)} items under ${max_price}")
+            await search_page.take_screenshot(f"search_results_{query}")
+            return urls
+        finally:
+            await page.close()
+    
+    async def run_scenario(self, new_context, config, test_data: dict) -> list:
+        context = await new_context()
+        return await self.search_items_by_name_under_price(
+            context, config, test_data["search_query"], test_data["max_price"], test_data["items_limit"])
+    
+    @allure.title("Data-Driven Test: all scenarios concurrently (asyncio.gather)")
+    @pytest.mark.asyncio
+    async def test_data_driven_search_concurrent(self, async_context_factory, selected_scenarios, config):
+        scenarios = selected_scenarios
+        if not scenarios:
+            pytest.skip("No scenarios match the --scenario-* filters")
+        
+        results = await asyncio.gather(
+            *(self.run_scenario(async_context_factory, config, test_data) for test_data in scenarios))
+        
+        for test_data, urls in zip(scenarios, results):
+            assert len(urls) > 0, f"No items found for '{test_data['search_query']}'"
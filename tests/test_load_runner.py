@@ -0,0 +1,62 @@
+"""
+Unit tests - Load Runner: היסטוגרמה, ו-flow של HTTP מול ReplayServer מקומי (בלי דפדפן)
+"""
+import asyncio
+import urllib.error
+import urllib.request
+
+from utils.load_runner import LatencyHistogram, LoadProfile, UserFlow, run_load
+from utils.replay import ReplayArchive, ReplayServer
+
+
+class HttpFlow(UserFlow):
+    """צעד שמצליח (דף מוקלט) וצעד שנכשל (404 - לא מוקלט)"""
+    
+    def __init__(self, base_url):
+        self.base_url = base_url
+    
+    async def iteration(self, user):
+        async with user.step("search"):
+            await asyncio.to_thread(urllib.request.urlopen, f"{self.base_url}/sch/i.html?_nkw=shoes")
+        async with user.step("cart_total"):
+            await asyncio.to_thread(urllib.request.urlopen, f"{self.base_url}/missing")
+
+
+def test_histogram_percentiles_within_precision():
+    histogram = LatencyHistogram(precision=0.02)
+    for value in range(1, 1001):
+        histogram.record(float(value))
+    
+    for pct, expected in ((50, 500), (95, 950), (99, 990)):
+        assert abs(histogram.percentile(pct) - expected) <= expected * 0.02
+    assert histogram.percentile(100) == 1000
+
+
+def test_histograms_merge_like_one():
+    first, second, combined = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for value in range(1, 200):
+        (first if value % 2 else second).record(value)
+        combined.record(value)
+    first.merge(LatencyHistogram.from_dict(second.to_dict()))
+    
+    assert first.count == combined.count
+    assert first.percentile(95) == combined.percentile(95)
+
+
+def test_virtual_users_against_local_server():
+    archive = ReplayArchive(path="")
+    archive.add_response("GET", "https://www.ebay.com/sch/i.html?_nkw=shoes", 200,
+                         {"content-type": "text/html"}, b"<html>results</html>")
+    profile = LoadProfile(users=3, ramp_up=0.2, duration=0.6, think_time=(0.0, 0.02), seed=1)
+    
+    with ReplayServer(archive, port=0) as server:
+        report = run_load(HttpFlow(server.base_url), profile)
+    
+    search = report.step_summary("search")
+    cart = report.step_summary("cart_total")
+    assert search["ok"] > 0 and search["errors"] == 0
+    assert search["p50_ms"] <= search["p95_ms"] <= search["p99_ms"] <= search["max_ms"]
+    assert cart["ok"] == 0 and cart["error_rate"] == 1.0
+    assert cart["error_types"] == {"HTTPError": cart["errors"]}
+    assert report.failed_iterations == report.iterations > 0
+    assert "search" in report.format_table()
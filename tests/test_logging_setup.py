@@ -0,0 +1,69 @@
+"""
+Unit tests - Logger על גבי logging עם תור (בלי דפדפן)
+"""
+import json
+import pytest
+from utils.helpers import Logger
+from utils.logging_setup import (configure_logging, flush_logs, logging_settings, restore_logging,
+                                 set_current_test)
+
+
+@pytest.fixture
+def json_log(tmp_path):
+    # ההגדרות של הסשן (pytest_configure) חוזרות בסוף - לא ברירת המחדל
+    previous = logging_settings()
+    path = tmp_path / "{worker}.jsonl"
+    configure_logging({"level": "INFO", "console": False, "json_path": str(path)})
+    yield tmp_path / "main.jsonl"
+    set_current_test(None)
+    restore_logging(previous)
+
+
+def read_records(path):
+    flush_logs()
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+
+def test_records_carry_level_worker_and_test(json_log, monkeypatch):
+    monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+    set_current_test("tests/test_x.py::test_y")
+    
+    Logger.info("Found item: %s - $%.2f", "shoes", 99.5)
+    Logger().error("boom 100%")
+    
+    records = read_records(json_log)
+    assert [(record["level"], record["message"]) for record in records] == [
+        ("INFO", "Found item: shoes - $99.50"), ("ERROR", "boom 100%")]
+    assert {record["test"] for record in records} == {"tests/test_x.py::test_y"}
+    assert {record["worker"] for record in records} == {"main"}
+
+
+def test_disabled_level_is_dropped_without_formatting(json_log):
+    class Expensive:
+        def __str__(self):
+            raise AssertionError("formatted a disabled debug message")
+    
+    Logger.debug("value: %s", Expensive())
+    Logger.info("kept")
+    
+    assert [record["message"] for record in read_records(json_log)] == ["kept"]
+
+
+def test_previous_configuration_is_restored(tmp_path):
+    previous = logging_settings()
+    session = {"level": "ERROR", "console": False, "json_path": str(tmp_path / "session.jsonl")}
+    configure_logging(session)
+    try:
+        saved = logging_settings()
+        configure_logging({"level": "DEBUG", "console": False})
+        restore_logging(saved)
+        
+        assert logging_settings() == session
+        Logger.info("dropped at ERROR")
+        Logger.error("kept")
+        flush_logs()
+        with open(tmp_path / "session.jsonl", encoding="utf-8") as file:
+            assert [json.loads(line)["message"] for line in file] == ["kept"]
+    finally:
+        restore_logging(previous)
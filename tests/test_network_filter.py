@@ -0,0 +1,53 @@
+"""
+Unit tests - NetworkFilter (החלטת block/stub/allow לפי סוג דף) והערכת הבייטים שנחסכו
+"""
+from utils.network_filter import ALLOW, BLOCK, DEFAULT_ESTIMATED_SIZES, STUB, NetworkFilter
+
+
+FILTER_CONFIG = {
+    "enabled": True,
+    "page_kinds": {
+        "search": {"urls": ["*/sch/*"], "block": ["image", "media", "font"]},
+        "product": {"urls": ["*/itm/*"], "block": ["media", "font"]},
+    },
+    "default_block": ["media"],
+    "block_url_patterns": ["*doubleclick.net*"],
+    "stub_url_patterns": ["*rover.ebay.com*"],
+}
+
+SEARCH_URL = "https://www.ebay.com/sch/i.html?_nkw=shoes"
+PRODUCT_URL = "https://www.ebay.com/itm/123"
+
+
+def test_resource_types_are_blocked_per_page_kind():
+    network_filter = NetworkFilter(FILTER_CONFIG)
+    image = "https://i.ebayimg.com/images/g/1.jpg"
+
+    assert network_filter.decide(image, "image", SEARCH_URL) == BLOCK
+    assert network_filter.decide(image, "image", PRODUCT_URL) == ALLOW
+    assert network_filter.decide("https://www.ebay.com/v.mp4", "media", PRODUCT_URL) == BLOCK
+    # דף שלא מתאים לאף סוג - default_block
+    assert network_filter.decide(image, "image", "https://www.ebay.com/") == ALLOW
+    assert network_filter.decide("https://www.ebay.com/v.mp4", "media", "https://www.ebay.com/") == BLOCK
+
+
+def test_url_patterns_and_main_navigation():
+    network_filter = NetworkFilter(FILTER_CONFIG)
+
+    assert network_filter.decide("https://ad.doubleclick.net/x", "script", PRODUCT_URL) == BLOCK
+    assert network_filter.decide("https://rover.ebay.com/b", "image", SEARCH_URL) == STUB
+    assert network_filter.decide(SEARCH_URL, "document", SEARCH_URL, is_main_navigation=True) == ALLOW
+
+
+def test_bytes_saved_averages_only_sized_responses():
+    stats = NetworkFilter(FILTER_CONFIG).stats
+    stats.allowed["image"] += 3
+    stats.record_response("image", 10_000)
+    stats.record_response("image", 30_000)
+    # תגובה בלי content-length (למשל chunked) לא מורידה את הממוצע
+    stats.record_response("image", 0)
+    stats.blocked["image"] += 2
+    stats.stubbed["font"] += 1
+
+    assert stats.estimated_bytes_saved() == 2 * 20_000 + DEFAULT_ESTIMATED_SIZES["font"]
+    assert stats.as_dict()["allowed_bytes"] == 40_000
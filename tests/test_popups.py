@@ -0,0 +1,31 @@
+"""
+Unit tests - DISMISS_POPUPS_SCRIPT על HTML מקומי (blank_page - מדולג אם אין דפדפן מותקן)
+"""
+from pages.base_page import BasePage
+
+
+POPUP_HTML = """
+<div id="banner">
+  <svg class="close-icon" width="16" height="16" onclick="document.body.dataset.svg = 'closed'">
+    <rect width="16" height="16"></rect>
+  </svg>
+  <button id="wrapper" onclick="document.body.dataset.wrapped = 'closed'">
+    <svg class="close" width="16" height="16"><rect width="16" height="16"></rect></svg>
+  </button>
+  <button id="gdpr-banner-accept" onclick="document.body.dataset.consent = 'accepted'">Accept</button>
+</div>
+"""
+
+
+def test_svg_close_targets_do_not_abort_dismissal(blank_page):
+    blank_page.set_content(POPUP_HTML)
+
+    closed = blank_page.evaluate(BasePage.DISMISS_POPUPS_SCRIPT, [
+        {"css": "svg.close-icon", "text": None},
+        {"css": "[class*='close']:not(.close-icon)", "text": None},
+        {"css": "#gdpr-banner-accept", "text": None},
+    ])
+
+    assert closed == 3
+    assert blank_page.evaluate("() => ({...document.body.dataset})") == {
+        "svg": "closed", "wrapped": "closed", "consent": "accepted"}
@@ -0,0 +1,52 @@
+"""
+Unit tests - PriceParser (בלי דפדפן)
+"""
+import pytest
+from utils.price_parser import PriceParser, ParsedPrice
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("$123.45", ParsedPrice(123.45, 123.45, "USD", True)),
+    ("US $1,234.56", ParsedPrice(1234.56, 1234.56, "USD", True)),
+    ("$20.00 to $45.00", ParsedPrice(20.0, 45.0, "USD", True)),
+    ("EUR 1.234,56", ParsedPrice(1234.56, 1234.56, "EUR", True)),
+    ("12,50 €", ParsedPrice(12.5, 12.5, "EUR", True)),
+    ("ILS 45.90", ParsedPrice(45.9, 45.9, "ILS", True)),
+    ("C $30.00", ParsedPrice(30.0, 30.0, "CAD", True)),
+    ("£1 299,00", ParsedPrice(1299.0, 1299.0, "GBP", True)),
+])
+def test_parse(text, expected):
+    assert PriceParser.parse(text) == expected
+
+
+@pytest.mark.parametrize("text", ["", "Free shipping", "See price"])
+def test_parse_failure_flag(text):
+    parsed = PriceParser.parse(text)
+    assert not parsed.ok
+    assert PriceParser.extract_price(text) == 0.0
+
+
+def test_range_uses_upper_bound_for_budget():
+    assert PriceParser.extract_price("$20.00 to $45.00") == 20.0
+    assert PriceParser.extract_max_price("$20.00 to $45.00") == 45.0
+
+
+def test_parse_batch_without_numpy():
+    batch = PriceParser.parse_batch(["$10.00", "n/a", "$5.00 to $50.00"], use_numpy=False)
+    
+    assert batch.low == [10.0, 0.0, 5.0]
+    assert batch.high == [10.0, 0.0, 50.0]
+    assert batch.ok == [True, False, True]
+    assert PriceParser.within_budget(batch, 20) == [True, False, False]
+
+
+def test_parse_batch_with_numpy_matches_python():
+    pytest.importorskip("numpy")
+    texts = ["$10.00", "n/a", "$5.00 to $50.00", "$10.00", "EUR 1.234,56"]
+    
+    batch = PriceParser.parse_batch(texts, use_numpy=True)
+    expected = PriceParser.parse_batch(texts, use_numpy=False)
+    
+    assert batch.high.tolist() == expected.high
+    assert batch.currency.tolist() == expected.currency
+    assert PriceParser.within_budget(batch, 20).tolist() == PriceParser.within_budget(expected, 20)
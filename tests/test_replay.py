@@ -0,0 +1,92 @@
+"""
+Unit tests - מפתח קנוני, ארכיון gzip, ReplayRouter עם route מדומה ו-ReplayServer מקומי (בלי דפדפן)
+"""
+from types import SimpleNamespace
+from urllib.request import urlopen
+
+import pytest
+
+from utils.replay import ReplayArchive, ReplayRouter, ReplayServer, ResponseRecorder, replay_mode, request_key
+
+
+SEARCH_URL = "https://www.ebay.com/sch/i.html?_nkw=shoes&_udhi=220"
+
+
+class FakeRoute:
+    def __init__(self, url, method="GET"):
+        self.request = SimpleNamespace(method=method, url=url)
+        self.action = None
+    
+    def fulfill(self, status, headers, body):
+        self.action = ("fulfill", status, body)
+    
+    def abort(self, error_code):
+        self.action = ("abort", error_code)
+    
+    def fallback(self):
+        self.action = ("fallback",)
+
+
+def make_archive(tmp_path):
+    archive = ReplayArchive(str(tmp_path / "ebay.jsonl.gz"))
+    archive.add_response("GET", SEARCH_URL, 200, {"Content-Type": "text/html", "Set-Cookie": "x=1"},
+                         b'<a href="https://www.ebay.com/itm/1">item</a>')
+    return archive
+
+
+def test_request_key_drops_tracking_params_and_sorts_query():
+    tracked = "https://www.ebay.com/sch/i.html?_udhi=220&_trksid=p123&_nkw=shoes&mkevt=1"
+    
+    assert request_key("get", tracked) == request_key("GET", SEARCH_URL)
+    assert request_key("GET", SEARCH_URL, include_host=False) == "GET /sch/i.html?_nkw=shoes&_udhi=220"
+    assert request_key("GET", SEARCH_URL) != request_key("POST", SEARCH_URL)
+
+
+def test_archive_round_trip_keeps_last_recording(tmp_path):
+    archive = make_archive(tmp_path)
+    archive.add_response("GET", SEARCH_URL + "&_trksid=p1", 200, {"content-type": "text/html"}, b"newer")
+    archive.save()
+    
+    loaded = ReplayArchive.load(archive.path)
+    entry = loaded.lookup("GET", SEARCH_URL)
+    
+    assert len(loaded) == 1
+    assert ReplayArchive.body(entry) == b"newer"
+    assert entry["headers"] == {"content-type": "text/html"}
+    assert loaded.lookup("GET", "https://cart.ebay.com/sch/i.html?_nkw=shoes&_udhi=220") is None
+    assert loaded.lookup("GET", "https://cart.ebay.com/sch/i.html?_nkw=shoes&_udhi=220", any_host=True)
+
+
+def test_router_strict_aborts_and_fallback_continues(tmp_path):
+    archive = make_archive(tmp_path)
+    strict, lenient = ReplayRouter(archive, strict=True), ReplayRouter(archive, strict=False)
+    hit = FakeRoute(SEARCH_URL)
+    strict_miss = FakeRoute("https://www.ebay.com/not-recorded")
+    lenient_miss = FakeRoute("https://www.ebay.com/not-recorded")
+    
+    strict._handle_route(hit)
+    strict._handle_route(strict_miss)
+    lenient._handle_route(lenient_miss)
+    
+    assert hit.action[:2] == ("fulfill", 200)
+    assert strict_miss.action == ("abort", "internetdisconnected")
+    assert lenient_miss.action == ("fallback",)
+    assert strict.summary() == "Replay: 1 hits, 1 misses"
+
+
+def test_server_rewrites_ebay_hosts_to_local_address(tmp_path):
+    with ReplayServer(make_archive(tmp_path), port=0) as server:
+        with urlopen(f"{server.base_url}/sch/i.html?_udhi=220&_nkw=shoes") as response:
+            body = response.read().decode()
+    
+    assert body == f'<a href="{server.base_url}/itm/1">item</a>'
+
+
+def test_replay_mode_from_config(tmp_path):
+    archive = str(tmp_path / "ebay.jsonl.gz")
+    
+    assert replay_mode({"mode": "live"}) is None
+    assert isinstance(replay_mode({"mode": "record", "archive": archive}), ResponseRecorder)
+    assert not replay_mode({"mode": "replay", "archive": archive, "strict": False}).strict
+    with pytest.raises(ValueError):
+        replay_mode({"mode": "proxy", "archive": archive})
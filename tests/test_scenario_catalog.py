@@ -0,0 +1,39 @@
+"""
+Unit tests - טעינת קטלוג התרחישים דרך ה-DB של ScenarioStore (בלי דפדפן)
+"""
+import json
+import os
+from utils import scenario_catalog
+from utils.scenario_catalog import load_scenarios, scenario_id
+
+
+def write_catalog(path, queries):
+    scenarios = [{"test_name": f"search_{query}", "search_query": query, "max_price": 100, "items_limit": 1}
+                 for query in queries]
+    path.write_text(json.dumps({"test_scenarios": scenarios}), encoding="utf-8")
+
+
+def test_second_load_comes_from_disk_cache(tmp_path, monkeypatch):
+    catalog = tmp_path / "catalog.json"
+    cache_dir = str(tmp_path / "cache")
+    write_catalog(catalog, ["shoes", "laptop"])
+    
+    first = load_scenarios(str(catalog), cache_dir=cache_dir)
+    monkeypatch.setattr(scenario_catalog.ConfigReader, "read_json",
+                        staticmethod(lambda path: (_ for _ in ()).throw(AssertionError("parsed again"))))
+    
+    assert load_scenarios(str(catalog), cache_dir=cache_dir) == first
+    assert len(os.listdir(cache_dir)) == 1
+
+
+def test_changed_file_is_reparsed(tmp_path):
+    catalog = tmp_path / "catalog.json"
+    cache_dir = str(tmp_path / "cache")
+    write_catalog(catalog, ["shoes"])
+    load_scenarios(str(catalog), cache_dir=cache_dir)
+    
+    write_catalog(catalog, ["shoes", "headphones", "laptop"])
+    os.utime(catalog, ns=(0, os.stat(catalog).st_mtime_ns + 1_000_000))
+    
+    assert [scenario_id(s) for s in load_scenarios(str(catalog), cache_dir=cache_dir)] == [
+        "search_shoes", "search_headphones", "search_laptop"]
@@ -0,0 +1,161 @@
+"""
+Unit tests - DurationStore (ממוצע נע), סדר הארוך-ראשון של ה-scheduler (nodes מדומים של xdist)
+ו-ContextPool עם context מדומה
+"""
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from utils.scenario_scheduler import ContextPool, DurationStore, make_longest_first_scheduling
+
+pytest.importorskip("xdist")
+
+
+class FakeConfig:
+    def __init__(self, workers, maxschedchunk=None):
+        self.options = {"tx": [f"{workers}*popen"], "maxschedchunk": maxschedchunk}
+    
+    def getvalue(self, name):
+        return self.options[name]
+    
+    getoption = getvalue
+
+
+class FakeNode:
+    def __init__(self, name):
+        self.gateway = SimpleNamespace(id=name)
+        self.sent = []
+        self.shutting_down = False
+    
+    def send_runtest_some(self, indices):
+        self.sent.extend(indices)
+    
+    def shutdown(self):
+        self.shutting_down = True
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.url = "about:blank"
+        context.pages.append(self)
+    
+    def route(self, pattern, handler):
+        pass
+    
+    def goto(self, url):
+        self.url = url
+    
+    def evaluate(self, script, items):
+        self.context.local_storage[self.url] = list(items)
+    
+    def close(self):
+        self.context.pages.remove(self)
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages = []
+        self.cookies = [{"name": "consent", "value": "1"}]
+        self.local_storage = {"https://www.ebay.com": [{"name": "seen", "value": "1"}]}
+        self.closed = False
+    
+    def new_page(self):
+        return FakePage(self)
+    
+    def storage_state(self):
+        return {"cookies": list(self.cookies),
+                "origins": [{"origin": origin, "localStorage": list(items)}
+                            for origin, items in self.local_storage.items() if items]}
+    
+    def clear_cookies(self):
+        self.cookies = []
+    
+    def add_cookies(self, cookies):
+        self.cookies.extend(cookies)
+    
+    def close(self):
+        self.closed = True
+
+
+class FakeLog:
+    def loadsched(self, *args):
+        pass
+
+
+def test_duration_store_smooths_with_moving_average(tmp_path):
+    path = str(tmp_path / "durations.json")
+    store = DurationStore(path, smoothing=0.5)
+    store.add("test_a", 1.0)
+    store.add("test_a", 3.0)
+    store.save()
+    
+    store = DurationStore(path, smoothing=0.5)
+    store.add("test_a", 8.0)
+    store.save()
+    
+    with open(path) as file:
+        assert json.load(file) == {"test_a": 6.0}
+    assert store.estimate("test_new") == 6.0
+
+
+def schedule(store, collection, workers, maxschedchunk=None):
+    scheduler = make_longest_first_scheduling(FakeConfig(workers, maxschedchunk), FakeLog(), store)
+    nodes = [FakeNode(f"gw{index}") for index in range(workers)]
+    for node in nodes:
+        scheduler.add_node(node)
+        scheduler.add_node_collection(node, collection)
+    scheduler.schedule()
+    return scheduler, nodes
+
+
+def test_pending_queue_is_longest_first(tmp_path):
+    collection = [f"test_{index}" for index in range(12)]
+    store = DurationStore(str(tmp_path / "durations.json"))
+    store.durations = {nodeid: float(index) for index, nodeid in enumerate(collection)}
+    
+    scheduler, nodes = schedule(store, collection, workers=2)
+    sent = [collection[index] for node in nodes for index in node.sent]
+    
+    # xdist שולח חבילה התחלתית (מינימום 2) לכל worker - מראש התור הממוין
+    assert sent == ["test_11", "test_10", "test_9", "test_8"]
+    assert [collection[index] for index in scheduler.pending] == [f"test_{index}" for index in range(7, -1, -1)]
+
+
+def test_maxschedchunk_is_respected(tmp_path):
+    collection = [f"test_{index}" for index in range(40)]
+    store = DurationStore(str(tmp_path / "durations.json"))
+    
+    _, nodes = schedule(store, collection, workers=2)
+    assert [len(node.sent) for node in nodes] == [5, 5]
+    
+    _, nodes = schedule(store, collection, workers=2, maxschedchunk=2)
+    assert [len(node.sent) for node in nodes] == [2, 2]
+
+
+def test_context_pool_reuses_one_cleaned_context():
+    contexts = []
+    pool = ContextPool(lambda: contexts.append(FakeContext()) or contexts[-1])
+    
+    context = pool.acquire()
+    context.new_page()
+    context.cookies.append({"name": "cart", "value": "3"})
+    context.local_storage["https://www.ebay.com"].append({"name": "cart", "value": "3"})
+    context.local_storage["https://cart.ebay.com"] = [{"name": "draft", "value": "1"}]
+    pool.release(context)
+    
+    assert pool.acquire() is context
+    assert context.pages == []
+    assert context.storage_state() == {
+        "cookies": [{"name": "consent", "value": "1"}],
+        "origins": [{"origin": "https://www.ebay.com", "localStorage": [{"name": "seen", "value": "1"}]}]}
+    
+    # context נוסף (טסט שפתח שניים) נסגר ולא נשמר
+    extra = pool.acquire()
+    pool.release(context)
+    pool.release(extra)
+    pool.close_all()
+    
+    assert (pool.created, pool.reused) == (2, 1)
+    assert extra.closed and context.closed
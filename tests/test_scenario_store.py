@@ -0,0 +1,54 @@
+"""
+Unit tests - ScenarioStore (SQLite) ומחולל התרחישים (בלי דפדפן)
+"""
+import os
+from utils.scenario_store import ScenarioStore, generate_scenarios, price_band, write_jsonl
+
+
+def build_store(tmp_path):
+    catalog = str(tmp_path / "catalog.jsonl")
+    write_jsonl(generate_scenarios(["shoes", "laptop", "headphones"], [50, 100, 500], [1, 3],
+                                   {"laptop": ["electronics"], "headphones": ["electronics", "audio"]}), catalog)
+    return catalog, ScenarioStore.open(catalog, cache_dir=str(tmp_path / "cache"))
+
+
+def test_generator_covers_all_combinations(tmp_path):
+    catalog, store = build_store(tmp_path)
+    
+    assert store.count() == 3 * 3 * 2
+    assert store.tags() == {"audio": 6, "electronics": 12}
+    store.close()
+
+
+def test_select_by_tag_and_price(tmp_path):
+    catalog, store = build_store(tmp_path)
+    
+    matches = list(store.select(tags=["electronics"], max_price=100))
+    
+    assert {(s["search_query"], s["max_price"]) for s in matches} == {
+        ("laptop", 50), ("laptop", 100), ("headphones", 50), ("headphones", 100)}
+    assert [s["search_query"] for s in store.select(tags=["electronics", "audio"], band="0-50")] == [
+        "headphones", "headphones"]
+    assert len(list(store.select(query="shoes", limit=2))) == 2
+    store.close()
+
+
+def test_store_rebuilt_only_when_catalog_changes(tmp_path):
+    catalog, store = build_store(tmp_path)
+    store.close()
+    cache_dir = str(tmp_path / "cache")
+    db_mtime = os.stat(store.db_path).st_mtime_ns
+    
+    reopened = ScenarioStore.open(catalog, cache_dir=cache_dir)
+    assert os.stat(reopened.db_path).st_mtime_ns == db_mtime
+    reopened.close()
+    
+    write_jsonl(generate_scenarios(["watch"], [80], [1]), catalog)
+    os.utime(catalog, ns=(0, os.stat(catalog).st_mtime_ns + 1_000_000))
+    rebuilt = ScenarioStore.open(catalog, cache_dir=cache_dir)
+    assert [s["search_query"] for s in rebuilt.select()] == ["watch"]
+    rebuilt.close()
+
+
+def test_price_band():
+    assert [price_band(price) for price in (20, 50, 75, 220, 1500)] == ["0-50", "0-50", "50-100", "100-250", "1000+"]
@@ -0,0 +1,47 @@
+"""
+Unit tests - SearchItem / SearchItemCollection (בלי דפדפן)
+"""
+from utils.search_items import SearchItem, SearchItemCollection, canonical_item_id
+
+
+SLUG_URL = "https://www.ebay.com/itm/Nike-Air-Max/284736251234?hash=item42&_trkparms=abc"
+PLAIN_URL = "https://www.ebay.com/itm/284736251234?var=0"
+
+
+def test_canonical_item_id_ignores_slug_and_tracking_params():
+    assert canonical_item_id(SLUG_URL) == "284736251234"
+    assert canonical_item_id(PLAIN_URL) == "284736251234"
+
+
+def test_canonical_item_id_falls_back_to_path_without_query():
+    assert canonical_item_id("https://example.com/p/shoe/?ref=1") == "example.com/p/shoe"
+
+
+def test_collection_dedups_by_item_id():
+    collection = SearchItemCollection()
+    
+    assert collection.add(SearchItem(SLUG_URL, "Nike Air Max", 99.5, 1, 3))
+    assert not collection.add(SearchItem(PLAIN_URL, "Nike Air Max", 99.5, 2, 0))
+    assert PLAIN_URL in collection
+    assert collection.urls() == [SLUG_URL]
+
+
+def test_items_are_hashable():
+    item = SearchItem(SLUG_URL, "Nike Air Max", 99.5, 1, 3)
+    
+    assert len({item, SearchItem(SLUG_URL, "Nike Air Max", 99.5, 1, 3)}) == 1
+    assert {item: "shoes"}[SearchItem(SLUG_URL, "Nike Air Max", 99.5, 1, 3)] == "shoes"
+
+
+def test_jsonl_round_trip(tmp_path):
+    path = str(tmp_path / "items.jsonl")
+    collection = SearchItemCollection([
+        SearchItem(SLUG_URL, "Nike Air Max", 99.5, 1, 3, query="shoes"),
+        SearchItem("https://www.ebay.com/itm/123456789012", "Boots", 40.0, 2, 7, query="shoes"),
+    ])
+    
+    collection.to_jsonl(path)
+    loaded = SearchItemCollection.from_jsonl(path)
+    
+    assert list(loaded) == list(collection)
+    assert loaded.urls() == collection.urls()
@@ -0,0 +1,76 @@
+"""
+Unit tests - SelectorRegistry (בלי דפדפן)
+"""
+from utils.selector_registry import SelectorRegistry, compile_selector
+
+
+ALTERNATIVES = ["li.s-item", ".srp-results li", "//li[contains(@class, 's-item')]"]
+
+
+class FakeLocator:
+    def __init__(self, count):
+        self._count = count
+    
+    def count(self):
+        return self._count
+
+
+class FakePage:
+    """דף מדומה - רק הסלקטורים ב-matching מחזירים התאמה"""
+    
+    def __init__(self, matching):
+        self.matching = set(matching)
+        self.queries = []
+    
+    def locator(self, selector):
+        self.queries.append(selector)
+        return FakeLocator(1 if selector in self.matching else 0)
+
+
+def test_compile_selector_prefixes_xpath():
+    assert compile_selector("//li") == "xpath=//li"
+    assert compile_selector("li.s-item") == "li.s-item"
+
+
+def test_winning_selector_is_tried_first_next_time():
+    registry = SelectorRegistry()
+    registry.register("search.item", ALTERNATIVES)
+    page = FakePage(matching=[".srp-results li"])
+    
+    assert registry.resolve(page, "search.item") == ".srp-results li"
+    assert registry.stats["search.item"]["misses"] == 1
+    
+    page.queries.clear()
+    assert registry.resolve(page, "search.item") == ".srp-results li"
+    assert page.queries == [".srp-results li"]
+    assert registry.stats["search.item"]["hits"] == 1
+
+
+def test_not_found_returns_none():
+    registry = SelectorRegistry()
+    registry.register("search.item", ALTERNATIVES)
+    
+    assert registry.resolve(FakePage(matching=[]), "search.item") is None
+    assert registry.stats["search.item"]["not_found"] == 1
+
+
+def test_cache_persists_to_disk(tmp_path):
+    cache_path = str(tmp_path / "selectors.json")
+    registry = SelectorRegistry(cache_path)
+    registry.register("search.item", ALTERNATIVES)
+    registry.record("search.item", ALTERNATIVES[2])
+    registry.save()
+    
+    reloaded = SelectorRegistry(cache_path)
+    reloaded.register("search.item", ALTERNATIVES)
+    assert reloaded.ordered("search.item")[0] == ALTERNATIVES[2]
+
+
+def test_untouched_registry_is_not_written(tmp_path):
+    cache_path = tmp_path / "selectors.json"
+    registry = SelectorRegistry(str(cache_path))
+    registry.register("search.item", ALTERNATIVES)
+    registry.record("search.item", ALTERNATIVES[0])
+    registry.save()
+    
+    assert not cache_path.exists()
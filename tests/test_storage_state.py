@@ -0,0 +1,98 @@
+"""
+Unit tests - FileLock ו-StorageStateCache עם browser מדומה (בלי דפדפן)
+"""
+import json
+import os
+import time
+
+import pytest
+
+from utils.storage_state import FileLock, StorageStateCache
+
+
+class FakeContext:
+    def __init__(self, cookies):
+        self.cookies = cookies
+        self.closed = False
+    
+    def storage_state(self, path):
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"cookies": self.cookies, "origins": []}, file)
+    
+    def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self, cookies=None):
+        self.cookies = cookies if cookies is not None else [{"name": "consent", "expires": -1}]
+        self.contexts = []
+    
+    def new_context(self, **context_args):
+        self.contexts.append(FakeContext(self.cookies))
+        return self.contexts[-1]
+
+
+def write_state(cache, cookies):
+    os.makedirs(cache.directory, exist_ok=True)
+    with open(cache.path, "w", encoding="utf-8") as file:
+        json.dump({"cookies": cookies, "origins": []}, file)
+
+
+def test_lock_contention_times_out_until_released(tmp_path):
+    path = str(tmp_path / "state.lock")
+    
+    with FileLock(path):
+        with pytest.raises(TimeoutError):
+            FileLock(path, timeout=0.3).acquire()
+    
+    assert not os.path.exists(path)
+    with FileLock(path, timeout=0.3):
+        assert os.path.exists(path)
+
+
+def test_stale_lock_is_removed(tmp_path):
+    path = str(tmp_path / "state.lock")
+    with open(path, "w") as file:
+        file.write("12345")
+    old = time.time() - 600
+    os.utime(path, (old, old))
+    
+    with FileLock(path, timeout=0.3, stale_after=300):
+        with open(path) as file:
+            assert file.read() == str(os.getpid())
+
+
+def test_fresh_vs_expired_state(tmp_path):
+    cache = StorageStateCache(str(tmp_path), max_age_hours=1)
+    assert not cache.is_fresh()
+    
+    write_state(cache, [{"name": "session", "expires": -1}])
+    assert cache.is_fresh()
+    
+    write_state(cache, [{"name": "consent", "expires": time.time() - 10}])
+    assert not cache.is_fresh()
+    
+    write_state(cache, [{"name": "consent", "expires": time.time() + 3600}])
+    old = time.time() - 7200
+    os.utime(cache.path, (old, old))
+    assert not cache.is_fresh()
+
+
+def test_bootstrap_once_per_locale_and_account(tmp_path):
+    browser = FakeBrowser()
+    bootstraps = []
+    guest = StorageStateCache(str(tmp_path))
+    
+    path = guest.get_or_create(browser, {}, bootstraps.append)
+    assert guest.get_or_create(browser, {}, bootstraps.append) == path
+    assert len(bootstraps) == 1 and bootstraps[0].closed
+    
+    other_account = StorageStateCache(str(tmp_path), account="buyer@example.com")
+    other_locale = StorageStateCache(str(tmp_path), locale="de-DE")
+    paths = {path, other_account.get_or_create(browser, {}, bootstraps.append),
+             other_locale.get_or_create(browser, {}, bootstraps.append)}
+    
+    assert len(paths) == 3
+    assert len(bootstraps) == 3
+    assert not any(name.endswith((".lock", ".tmp")) for name in os.listdir(tmp_path))
@@ -0,0 +1,128 @@
+"""
+Unit tests - TimeoutBudget / RetryPolicy (בלי דפדפן)
+"""
+import asyncio
+import time
+
+import pytest
+
+from utils.timeout_budget import RetryPolicy, TimeoutBudget, TimeoutBudgetExceeded
+
+
+@pytest.fixture
+def budget():
+    budget = TimeoutBudget()
+    budget.configure({"default": 30000, "navigation": 20000, "probe": 2000, "absent": 500, "min_call": 100,
+                      "steps": {"search": 1000}}, max_retries=2)
+    yield budget
+    budget.end_test()
+
+
+def test_timeouts_come_from_config_without_budget(budget):
+    budget.begin_test(budget_ms=0)
+    
+    assert budget.timeout_for() == 30000
+    assert budget.timeout_for("navigation") == 20000
+    assert budget.timeout_for("default", cap=5000) == 5000
+
+
+def test_step_budget_caps_calls_and_then_fails_fast(budget):
+    budget.begin_test(budget_ms=60000)
+    
+    with budget.step("search"):
+        assert 900 <= budget.timeout_for("navigation") <= 1000
+        time.sleep(1.05)
+        with pytest.raises(TimeoutBudgetExceeded, match="search"):
+            budget.timeout_for()
+    
+    # אחרי הצעד חוזרים לתקציב של הטסט
+    assert budget.timeout_for() == 30000
+
+
+def test_known_absent_element_gets_short_timeout(budget):
+    budget.begin_test(budget_ms=0)
+    key = "ProductPage:select#size"
+    
+    assert budget.element_timeout(key) == 30000
+    budget.mark_absent(key)
+    assert budget.element_timeout(key) == 500
+    budget.mark_present(key)
+    assert budget.element_timeout(key) == 30000
+    assert budget.stats.fast_fails == 1
+
+
+def test_known_absent_elements_do_not_leak_into_next_test(budget):
+    budget.begin_test(budget_ms=0)
+    key = "ProductPage@1:https://www.ebay.com/itm/1:select#size"
+    budget.mark_absent(key)
+    assert budget.element_timeout(key) == 500
+    budget.end_test()
+    
+    budget.begin_test(budget_ms=0)
+    assert not budget.is_known_absent(key)
+    assert budget.element_timeout(key) == 30000
+    assert budget.stats.fast_fails == 0
+
+
+def test_retry_with_backoff_until_success(budget):
+    budget.begin_test(budget_ms=0)
+    attempts, sleeps = [], []
+    
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("net::ERR_CONNECTION_RESET")
+        return "ok"
+    
+    assert budget.retry.run(flaky, "navigation", sleep=sleeps.append) == "ok"
+    assert len(attempts) == 3 and budget.stats.retries == 2
+    assert sleeps[1] > sleeps[0]
+
+
+def test_no_retry_when_budget_cannot_cover_backoff():
+    budget = TimeoutBudget()
+    budget.begin_test(budget_ms=200)
+    policy = RetryPolicy(max_retries=3, backoff_ms=1000, budget=budget)
+    attempts = []
+    
+    def failing():
+        attempts.append(1)
+        raise ConnectionError("down")
+    
+    with pytest.raises(ConnectionError):
+        policy.run(failing, sleep=lambda seconds: None)
+    assert len(attempts) == 1
+    budget.end_test()
+
+
+def test_wait_stats_per_test(budget):
+    budget.begin_test(budget_ms=0)
+    with budget.waiting("element"):
+        pass
+    with pytest.raises(TimeoutError):
+        with budget.waiting("navigation"):
+            raise TimeoutError("slow")
+    
+    stats = budget.end_test()
+    assert stats.calls == 2 and stats.timeouts == 1
+    assert set(stats.by_kind) == {"element", "navigation"}
+    assert "2 calls" in stats.summary()
+
+
+def test_concurrent_tasks_keep_their_own_wait_state(budget):
+    async def user(name, waits):
+        budget.begin_test(budget_ms=0)
+        budget.mark_absent(f"ProductPage@{name}:select#size")
+        for _ in range(waits):
+            with budget.waiting("element"):
+                await asyncio.sleep(0)
+        sees_a = budget.is_known_absent("ProductPage@a:select#size")
+        return budget.end_test(), sees_a
+    
+    async def run():
+        return await asyncio.gather(user("a", 1), user("b", 3))
+    
+    (stats_a, a_sees_a), (stats_b, b_sees_a) = asyncio.run(run())
+    assert (stats_a.calls, stats_b.calls) == (1, 3)
+    assert a_sees_a and not b_sees_a
+    assert budget.stats.calls == 0
@@ -0,0 +1,100 @@
+"""
+Unit tests - StepTracer / instrument_class (בלי דפדפן)
+"""
+import asyncio
+import json
+import pytest
+from utils.tracing import StepTracer, instrument_class, tracer
+
+
+class FakeTimeoutError(Exception):
+    """כמו playwright TimeoutError - מזוהה לפי השם"""
+
+
+@instrument_class
+class FakePage:
+    def open(self, url):
+        self.navigate(url)
+    
+    def navigate(self, url):
+        return url
+    
+    def wait(self, selector):
+        raise FakeTimeoutError(f"{selector} not found")
+    
+    def is_visible(self, selector):
+        tracer.note_timeout()
+        return False
+    
+    def iter_items(self):
+        yield 1
+
+
+@pytest.fixture
+def recording():
+    # ה-step_trace של conftest כבר פתח טסט (tracing.enabled בקונפיגורציה) - סוגרים אותו ומקליטים לבד
+    enabled = tracer.enabled
+    tracer.end_test()
+    tracer.enabled = True
+    tracer.begin_test("test_fake")
+    yield tracer
+    tracer.end_test()
+    tracer.enabled = enabled
+
+
+@pytest.fixture
+def not_recording():
+    enabled = tracer.enabled
+    tracer.end_test()
+    tracer.enabled = False
+    yield tracer
+    tracer.enabled = enabled
+
+
+def test_no_spans_when_not_recording(not_recording):
+    FakePage().open("https://example.com")
+    assert tracer.current_spans() == []
+
+
+def test_nested_spans_and_timeouts(recording):
+    page = FakePage()
+    page.open("https://example.com")
+    page.is_visible("#cart")
+    with pytest.raises(FakeTimeoutError):
+        page.wait("#missing")
+    list(page.iter_items())
+    
+    spans = {span.name: span for span in recording.current_spans()}
+    assert set(spans) == {"FakePage.open", "FakePage.navigate", "FakePage.is_visible", "FakePage.wait"}
+    assert spans["FakePage.navigate"].depth == 1
+    assert spans["FakePage.open"].args == {"arg": "https://example.com"}
+    assert spans["FakePage.is_visible"].timeouts == 1
+    assert spans["FakePage.wait"].timeouts == 1 and "TimeoutError" in spans["FakePage.wait"].error
+
+
+def test_chrome_trace_and_summary(recording, tmp_path):
+    FakePage().open("https://example.com")
+    spans = recording.current_spans()
+    
+    path = recording.export_chrome_trace(str(tmp_path / "trace.json"), spans)
+    with open(path) as file:
+        trace = json.load(file)
+    
+    assert [event["name"] for event in trace["traceEvents"]] == ["FakePage.navigate", "FakePage.open"]
+    assert all(event["ph"] == "X" for event in trace["traceEvents"])
+    assert [row["name"] for row in recording.summarize(spans)][0] == "FakePage.open"
+    assert recording.slow_spans(spans, threshold_ms=0) and not StepTracer().slow_spans(spans)
+
+
+def test_concurrent_tasks_record_their_own_spans(recording):
+    async def scenario(url):
+        recording.begin_test(url)
+        FakePage().navigate(url)
+        await asyncio.sleep(0)
+        return [span.args["arg"] for span in recording.end_test()]
+    
+    async def run():
+        return await asyncio.gather(scenario("https://a.example"), scenario("https://b.example"))
+    
+    assert asyncio.run(run()) == [["https://a.example"], ["https://b.example"]]
+    assert recording.current_spans() == []
@@ -0,0 +1,103 @@
+"""
+Unit tests - בחירת וריאנטים (בלי דפדפן)
+"""
+import random
+
+from pages.product_page import ProductPage
+from utils.variants import VariantDimension, choose_variants, make_rng, parse_dimensions
+
+
+RAW = [
+    {"kind": "select", "key": "0", "name": "Size", "selected": None, "options": [
+        {"value": "10", "label": "US 6", "disabled": False},
+        {"value": "11", "label": "US 6.5 (Out of stock)", "disabled": True},
+        {"value": "12", "label": "US 7", "disabled": False},
+    ]},
+    {"kind": "select", "key": "1", "name": "Color", "selected": None, "options": [
+        {"value": "20", "label": "Black (Out of stock)", "disabled": True},
+    ]},
+    {"kind": "buttons", "key": "2", "name": "Width", "selected": "2-0", "options": [
+        {"value": "2-0", "label": "Regular", "disabled": False},
+        {"value": "2-1", "label": "Narrow", "disabled": True},
+    ]},
+]
+
+
+def test_choice_skips_out_of_stock_and_already_selected():
+    dimensions = parse_dimensions(RAW)
+    
+    for seed in range(20):
+        changes = choose_variants(dimensions, make_rng(seed))
+        # Color - אין אף אופציה במלאי, Width - האופציה היחידה במלאי כבר מסומנת
+        assert [dimension.name for dimension, _ in changes] == ["Size"]
+        assert changes[0][1].value in ("10", "12")
+
+
+def test_same_seed_same_choice():
+    dimensions = parse_dimensions(RAW)
+    first = [option.value for _, option in choose_variants(dimensions, make_rng(7, "url"))]
+    second = [option.value for _, option in choose_variants(dimensions, make_rng(7, "url"))]
+    
+    assert first == second
+
+
+def test_keep_valid_only_repicks_invalid_selection():
+    dimensions = parse_dimensions(RAW)
+    dimensions[0].selected = "11"  # נבחר ואז יצא מהמלאי
+    dimensions.append(VariantDimension.from_dict(
+        {"kind": "select", "key": "3", "name": "Style", "selected": "30",
+         "options": [{"value": "30", "label": "A"}, {"value": "31", "label": "B"}]}))
+    
+    changes = choose_variants(dimensions, random.Random(1), keep_valid=True)
+    
+    assert [dimension.name for dimension, _ in changes] == ["Size"]
+
+
+def test_earlier_choice_is_kept_when_page_shows_no_selection():
+    # קבוצת כפתורים שהדף לא מסמן בה את הכפתור שנלחץ
+    dimension = VariantDimension.from_dict(
+        {"kind": "buttons", "key": "0", "name": "Width", "selected": None, "options": [
+            {"value": "0-0", "label": "Regular"}, {"value": "0-1", "label": "Wide"}]})
+    
+    for seed in range(20):
+        assert choose_variants([dimension], make_rng(seed), keep_valid=True, previous={"0": "0-1"}) == []
+    
+    # הבחירה הקודמת יצאה מהמלאי - נבחרת מחדש
+    dimension.options[1].disabled = True
+    changes = choose_variants([dimension], make_rng(1), keep_valid=True, previous={"0": "0-1"})
+    assert [option.value for _, option in changes] == ["0-0"]
+
+
+def test_options_are_kept_as_read_from_the_page():
+    # ה-placeholder כבר סונן ב-READ_VARIANTS_SCRIPT - אופציה אמיתית שהטקסט שלה "Select..." נשארת
+    dimension = VariantDimension.from_dict(
+        {"kind": "select", "key": "0", "name": "Fit", "selected": None, "options": [
+            {"value": "7", "label": "Select Comfort"}, {"value": "8", "label": "Regular"}]})
+    
+    assert [option.value for option in dimension.options] == ["7", "8"]
+
+
+VARIANTS_HTML = """
+<div id="mainContent">
+  <label for="msku-ds-SELECT_SIZE">Size</label>
+  <select id="msku-ds-SELECT_SIZE">
+    <option value="-1">- Select -</option>
+    <option value="7">Select Comfort</option>
+    <option value="8">Regular</option>
+  </select>
+  <select id="msku-ds-SELECT_COLOR" aria-label="Color">
+    <option value="0">Choose a color</option>
+    <option value="21">Red</option>
+  </select>
+</div>
+"""
+
+
+def test_read_script_drops_placeholders_once(blank_page):
+    blank_page.set_content(VARIANTS_HTML)
+    product_page = ProductPage(blank_page)
+    
+    dimensions = product_page.read_variants()
+    
+    assert [[option.value for option in dimension.options] for dimension in dimensions] == [["7", "8"], ["21"]]
+    assert [dimension.selected for dimension in dimensions] == [None, None]
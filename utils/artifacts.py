@@ -0,0 +1,142 @@
+"""
+Artifacts - צילומי מסך בזיכרון, כתיבה לדיסק ב-thread pool וצירוף ל-Allure ב-flush
+"""
+import hashlib
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils import reporting
+from utils.helpers import Logger
+
+
+class ArtifactManager:
+    """
+    מדיניות (screenshots.policy):
+        always        - כל take_screenshot, עמוד מלא PNG
+        on_failure    - רק צילום הכשלון מ-pytest_runtest_makereport
+        sampled       - כל צילום N-י (sample_every), עמוד מלא PNG
+        viewport_jpeg - כל take_screenshot, רק ה-viewport, JPEG באיכות jpeg_quality
+
+    פריים שכבר נשמר באותו טסט (אותו hash של התוכן) לא נכתב ולא מצורף שוב - ה-flush בסוף
+    כל טסט מאפס את זה, כך שכל טסט מקבל את הצילומים שלו. לכל קובץ מספר רץ (וה-worker של xdist),
+    כדי שצילומים באותו שם לא ידרסו זה את זה.
+    allure.attach חייב לרוץ ב-thread של הטסט, ולכן הצירוף נעשה ב-flush (ב-teardown)
+    """
+
+    POLICIES = ("always", "on_failure", "sampled", "viewport_jpeg")
+
+    def __init__(self):
+        self.enabled = True
+        self.on_failure = True
+        self.directory = "screenshots"
+        self.policy = "always"
+        self.sample_every = 5
+        self.jpeg_quality = 70
+        self.workers = 2
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: List[Tuple[Future, str, str]] = []
+        self._hashes: Dict[str, str] = {}
+        self._requests = 0
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self.stats = {"captured": 0, "duplicates": 0, "skipped": 0, "written": 0}
+
+    def configure(self, settings: Dict[str, Any]):
+        self.enabled = settings.get("enabled", self.enabled)
+        self.on_failure = settings.get("on_failure", self.on_failure)
+        self.directory = settings.get("path", self.directory)
+        self.policy = settings.get("policy", self.policy)
+        if self.policy not in self.POLICIES:
+            raise ValueError(f"Unknown screenshots.policy '{self.policy}' (expected one of {self.POLICIES})")
+        self.sample_every = max(1, settings.get("sample_every", self.sample_every))
+        self.jpeg_quality = settings.get("jpeg_quality", self.jpeg_quality)
+        self.workers = max(1, settings.get("workers", self.workers))
+
+    def screenshot_options(self, force: bool = False) -> Optional[Dict[str, Any]]:
+        """ארגומנטים ל-page.screenshot לפי המדיניות, או None אם לא מצלמים הפעם"""
+        if force:
+            return {"full_page": True, "type": "png"}
+        with self._lock:
+            self._requests += 1
+            if (not self.enabled or self.policy == "on_failure"
+                    or (self.policy == "sampled" and (self._requests - 1) % self.sample_every != 0)):
+                self.stats["skipped"] += 1
+                return None
+        if self.policy == "viewport_jpeg":
+            return {"full_page": False, "type": "jpeg", "quality": self.jpeg_quality}
+        return {"full_page": True, "type": "png"}
+
+    def capture(self, page, name: str, force: bool = False) -> Optional[str]:
+        """צילום (sync API) - מחזיר את הנתיב שהקובץ ייכתב אליו, או None אם דולג"""
+        options = self.screenshot_options(force)
+        if options is None:
+            return None
+        return self.save(name, page.screenshot(**options), options["type"])
+
+    def save(self, name: str, data: bytes, image_type: str = "png") -> str:
+        """
+        רישום תמונה שצולמה לזיכרון: בדיקת כפילות, כתיבה ברקע, צירוף ל-Allure ב-flush.
+        מחזיר את הנתיב מיד (הקובץ עשוי להיכתב רגע אחר כך)
+        """
+        digest = hashlib.sha1(data).hexdigest()
+        with self._lock:
+            self.stats["captured"] += 1
+            existing = self._hashes.get(digest)
+            if existing:
+                self.stats["duplicates"] += 1
+                Logger.debug("Screenshot '%s' identical to %s - not saved again", name, existing)
+                return existing
+            path = self._path(name, image_type)
+            self._hashes[digest] = path
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="artifacts")
+            future = self._executor.submit(self._write, path, data)
+            self._pending.append((future, name, image_type))
+        return path
+
+    def _path(self, name: str, image_type: str) -> str:
+        """screenshots/<name>_[<worker>_]<מספר רץ>.<ext> (נקרא תחת הנעילה)"""
+        self._sequence += 1
+        worker = os.environ.get("PYTEST_XDIST_WORKER")
+        suffix = f"{worker}_{self._sequence:04d}" if worker else f"{self._sequence:04d}"
+        return os.path.join(self.directory, f"{name}_{suffix}.{'jpg' if image_type == 'jpeg' else 'png'}")
+
+    def _write(self, path: str, data: bytes) -> str:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "wb") as file:
+            file.write(data)
+        with self._lock:
+            self.stats["written"] += 1
+        return path
+
+    def flush(self, attach: bool = True):
+        """
+        סוף טסט: המתנה לכל הכתיבות, צירוף הקבצים ל-Allure (ב-thread הנוכחי - של הטסט)
+        ואיפוס הכפילויות - טסט הבא מצלם ומצרף גם פריים שכבר נשמר קודם
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+            self._hashes.clear()
+        for future, name, image_type in pending:
+            try:
+                path = future.result()
+            except Exception as e:
+                Logger.error(f"Could not save screenshot '{name}': {e}")
+                continue
+            if attach:
+                reporting.attach_file(path, name=name, kind="jpg" if image_type == "jpeg" else "png")
+
+    def close(self):
+        self.flush(attach=False)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def summary(self) -> str:
+        return (f"Screenshots ({self.policy}): {self.stats['written']} written, "
+                f"{self.stats['duplicates']} duplicates, {self.stats['skipped']} skipped by policy")
+
+
+artifacts = ArtifactManager()
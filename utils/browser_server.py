@@ -0,0 +1,249 @@
+"""
+Browser Server - דפדפן שנשאר פתוח בין ריצות של pytest (opt-in: browser.server.enabled)
+Chromium רץ כתהליך מנותק עם --remote-debugging-port, והפיקצ'ר מתחבר ב-connect_over_cdp.
+Firefox / WebKit - שרת `playwright run-server` מנותק, והפיקצ'ר מתחבר ב-connect (ws).
+מצב כל שרת (pid, endpoint) נשמר ב-.cache/browser_server, ונבדק (health check) לפני כל חיבור.
+
+הרצה (מתיקיית הפרויקט):
+    python -m utils.browser_server start    # הפעלה מראש (אחרת הפיקצ'ר מפעיל בפעם הראשונה)
+    python -m utils.browser_server status
+    python -m utils.browser_server stop
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import Any, Dict, List, Optional
+
+from utils.helpers import Logger, load_config
+from utils.storage_state import FileLock
+
+
+class BrowserServerManager:
+    """
+    pool של pool_size שרתים על פורטים עוקבים (port, port + 1, ...).
+    כל worker של xdist משויך לשרת לפי המספר שלו (gw3 -> 3 % pool_size), וכל ריצה פותחת context חדש משלה.
+    שרת שלא עונה (קרס, נסגר ידנית, מחשב הופעל מחדש) מופעל מחדש תחת נעילה, כך שרק worker אחד מפעיל אותו
+    """
+
+    def __init__(self, browser_type: str = "chromium", directory: str = ".cache/browser_server",
+                 port: int = 9333, pool_size: int = 1, headless: bool = True,
+                 startup_timeout: float = 20, args: List[str] = None):
+        self.browser_type = browser_type
+        self.directory = directory
+        self.port = port
+        self.pool_size = max(1, pool_size)
+        self.headless = headless
+        self.startup_timeout = startup_timeout
+        self.args = list(args or [])
+        self.logger = Logger()
+
+    @classmethod
+    def from_config(cls, browser_settings: Dict[str, Any]) -> "BrowserServerManager":
+        """מתוך החלק browser בקונפיגורציה (type, headless, server.*)"""
+        server = browser_settings.get("server", {})
+        return cls(browser_type=browser_settings.get("type", "chromium"),
+                   directory=server.get("directory", ".cache/browser_server"),
+                   port=server.get("port", 9333),
+                   pool_size=server.get("pool_size", 1),
+                   headless=browser_settings.get("headless", True),
+                   startup_timeout=server.get("startup_timeout", 20),
+                   args=server.get("args"))
+
+    @property
+    def uses_cdp(self) -> bool:
+        return self.browser_type == "chromium"
+
+    def slot(self) -> int:
+        """השרת של ה-worker הנוכחי"""
+        worker = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+        digits = "".join(ch for ch in worker if ch.isdigit())
+        return int(digits or 0) % self.pool_size
+
+    def state_path(self, slot: int) -> str:
+        return os.path.join(self.directory, f"{self.browser_type}-{slot}.json")
+
+    def read_state(self, slot: int) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.state_path(slot), "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def is_healthy(self, state: Optional[Dict[str, Any]], timeout: float = 1.0) -> bool:
+        """השרת עונה: /json/version של CDP, או חיבור TCP לפורט של run-server"""
+        if not state:
+            return False
+        try:
+            if state.get("protocol") == "cdp":
+                with urllib.request.urlopen(f"{state['endpoint']}/json/version", timeout=timeout) as response:
+                    return "webSocketDebuggerUrl" in json.loads(response.read().decode("utf-8"))
+            with socket.create_connection(("127.0.0.1", state["port"]), timeout=timeout):
+                return True
+        except (OSError, ValueError, KeyError):
+            return False
+
+    def ensure(self, executable_path: str = None, slot: int = None) -> Dict[str, Any]:
+        """מצב שרת תקין ל-slot - הקיים אם הוא עונה, אחרת מופעל חדש"""
+        slot = self.slot() if slot is None else slot
+        state = self.read_state(slot)
+        if self.is_healthy(state):
+            return state
+
+        os.makedirs(self.directory, exist_ok=True)
+        with FileLock(self.state_path(slot) + ".lock", timeout=self.startup_timeout + 30):
+            # אולי worker אחר הפעיל אותו בזמן שחיכינו לנעילה
+            state = self.read_state(slot)
+            if self.is_healthy(state):
+                return state
+            if state:
+                self._kill(state)
+            return self.start(slot, executable_path)
+
+    def start(self, slot: int, executable_path: str = None) -> Dict[str, Any]:
+        """הפעלת תהליך מנותק (ממשיך לרוץ אחרי שה-pytest מסתיים) והמתנה עד שהוא עונה"""
+        port = self.port + slot
+        if self.uses_cdp:
+            if not executable_path:
+                raise ValueError("Starting a Chromium server needs the browser executable_path")
+            command = [executable_path, f"--remote-debugging-port={port}", "--remote-debugging-address=127.0.0.1",
+                       f"--user-data-dir={os.path.abspath(os.path.join(self.directory, f'profile-{slot}'))}",
+                       "--no-first-run", "--no-default-browser-check", *self.args]
+            if self.headless:
+                command.append("--headless=new")
+            command.append("about:blank")
+            state = {"protocol": "cdp", "endpoint": f"http://127.0.0.1:{port}"}
+        else:
+            command = [sys.executable, "-m", "playwright", "run-server", "--port", str(port), "--host", "127.0.0.1"]
+            state = {"protocol": "ws", "endpoint": f"ws://127.0.0.1:{port}/"}
+
+        log_path = os.path.join(self.directory, f"{self.browser_type}-{slot}.log")
+        with open(log_path, "ab") as log:
+            process = subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=log, stderr=log,
+                                       **self._detached_options())
+        state.update({"browser_type": self.browser_type, "slot": slot, "port": port, "pid": process.pid,
+                      "headless": self.headless, "started_at": time.time()})
+
+        deadline = time.monotonic() + self.startup_timeout
+        while not self.is_healthy(state):
+            if process.poll() is not None:
+                raise RuntimeError(f"Browser server exited with code {process.returncode} (see {log_path})")
+            if time.monotonic() > deadline:
+                self._kill(state)
+                raise TimeoutError(f"Browser server on port {port} not ready within {self.startup_timeout}s")
+            time.sleep(0.1)
+
+        tmp_path = f"{self.state_path(slot)}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(state, file, indent=2)
+        os.replace(tmp_path, self.state_path(slot))
+        self.logger.info(f"Started {self.browser_type} server on port {port} (pid {process.pid})")
+        return state
+
+    @staticmethod
+    def _detached_options() -> Dict[str, Any]:
+        """תהליך בקבוצה משלו - Ctrl+C או סיום של pytest לא הורגים אותו"""
+        if os.name == "nt":
+            return {"creationflags": subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP}
+        return {"start_new_session": True}
+
+    def connect(self, playwright, slow_mo: float = 0):
+        """Browser מחובר לשרת של ה-worker. חיבור שנכשל - הפעלה מחדש של השרת וניסיון נוסף"""
+        browser_type = getattr(playwright, self.browser_type)
+        for attempt in range(2):
+            state = self.ensure(executable_path=browser_type.executable_path)
+            try:
+                if self.uses_cdp:
+                    return browser_type.connect_over_cdp(state["endpoint"], slow_mo=slow_mo)
+                return browser_type.connect(state["endpoint"], slow_mo=slow_mo, headers=self._launch_headers())
+            except Exception as e:
+                if attempt:
+                    raise
+                self.logger.error(f"Could not connect to browser server ({e}) - restarting it")
+                self.stop(state["slot"])
+
+    async def connect_async(self, playwright, slow_mo: float = 0):
+        """כמו connect, עבור async_playwright"""
+        browser_type = getattr(playwright, self.browser_type)
+        for attempt in range(2):
+            state = self.ensure(executable_path=browser_type.executable_path)
+            try:
+                if self.uses_cdp:
+                    return await browser_type.connect_over_cdp(state["endpoint"], slow_mo=slow_mo)
+                return await browser_type.connect(state["endpoint"], slow_mo=slow_mo, headers=self._launch_headers())
+            except Exception as e:
+                if attempt:
+                    raise
+                self.logger.error(f"Could not connect to browser server ({e}) - restarting it")
+                self.stop(state["slot"])
+
+    def _launch_headers(self) -> Dict[str, str]:
+        """run-server מפעיל דפדפן לכל חיבור - עם ה-headless מהקונפיגורציה"""
+        return {"x-playwright-launch-options": json.dumps({"headless": self.headless})}
+
+    def stop(self, slot: int = None):
+        """עצירת שרת אחד (או כל ה-pool) ומחיקת קובץ המצב"""
+        slots = range(self.pool_size) if slot is None else [slot]
+        for current in slots:
+            state = self.read_state(current)
+            if state:
+                self._kill(state)
+                self.logger.info(f"Stopped {self.browser_type} server on port {state['port']}")
+            try:
+                os.remove(self.state_path(current))
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def _kill(state: Dict[str, Any]):
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(state["pid"], signal.SIGTERM)
+            else:
+                os.kill(state["pid"], signal.SIGTERM)
+        except (OSError, KeyError):
+            pass
+
+    def status(self) -> List[Dict[str, Any]]:
+        """מצב כל השרתים ב-pool, עם healthy"""
+        result = []
+        for slot in range(self.pool_size):
+            state = self.read_state(slot) or {"slot": slot, "port": self.port + slot}
+            result.append({**state, "healthy": self.is_healthy(state) if "pid" in state else False})
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Persistent browser server for the test suite")
+    parser.add_argument("command", choices=["start", "stop", "status"])
+    parser.add_argument("--type", dest="browser_type", help="chromium / firefox / webkit (default: from config)")
+    args = parser.parse_args()
+
+    browser_settings = dict(load_config()["browser"])
+    if args.browser_type:
+        browser_settings["type"] = args.browser_type
+    manager = BrowserServerManager.from_config(browser_settings)
+
+    if args.command == "start":
+        executable_path = None
+        if manager.uses_cdp:
+            from playwright.sync_api import sync_playwright
+            with sync_playwright() as playwright:
+                executable_path = playwright.chromium.executable_path
+        for slot in range(manager.pool_size):
+            state = manager.ensure(executable_path=executable_path, slot=slot)
+            print(f"{manager.browser_type}[{slot}] {state['endpoint']} (pid {state['pid']})")
+    elif args.command == "stop":
+        manager.stop()
+    else:
+        for state in manager.status():
+            print(json.dumps(state))
+
+
+if __name__ == "__main__":
+    main()
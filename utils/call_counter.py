@@ -0,0 +1,53 @@
+"""
+Playwright Call Counter - ספירת הודעות שנשלחות ל-driver של Playwright
+כל הודעה היא round trip אחד (דפדפן <-> Python), זה המדד שמעניין בבנצ'מרקים
+"""
+from typing import List
+
+
+_active_counters: List["PlaywrightCallCounter"] = []
+_installed = False
+
+
+def _install():
+    """עטיפה חד-פעמית של Channel.send* (API פנימי של Playwright - נכשל בשקט אם השתנה)"""
+    global _installed
+    if _installed:
+        return
+    _installed = True
+    
+    try:
+        from playwright._impl._connection import Channel
+    except ImportError:
+        return
+    
+    def wrap(original):
+        def counted(self, *args, **kwargs):
+            for counter in _active_counters:
+                counter.count += 1
+            return original(self, *args, **kwargs)
+        return counted
+    
+    for name in ("send", "send_return_as_dict", "send_no_reply"):
+        if hasattr(Channel, name):
+            setattr(Channel, name, wrap(getattr(Channel, name)))
+
+
+class PlaywrightCallCounter:
+    """
+    שימוש:
+        with PlaywrightCallCounter() as calls:
+            search_page.get_items_under_price(100)
+        print(calls.count)
+    """
+    
+    def __init__(self):
+        self.count = 0
+    
+    def __enter__(self) -> "PlaywrightCallCounter":
+        _install()
+        _active_counters.append(self)
+        return self
+    
+    def __exit__(self, *exc):
+        _active_counters.remove(self)
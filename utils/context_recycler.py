@@ -0,0 +1,212 @@
+"""
+Context Recycler - החלפת ה-BrowserContext של הסשן כשהוא "מתנפח", עם מדידת זיכרון לכל טסט
+במקום context אחד שחי לאורך מאות תרחישים: אחרי כל טסט נמדד הזיכרון (CDP ב-Chromium, RSS של
+תהליכי הדפדפן עם psutil), ואם עברנו סף - context חדש נפתח עם ה-storage state של הקודם
+"""
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.helpers import Logger
+
+try:
+    import psutil
+except ImportError:  # ב-requirements, אבל לא חובה - בלעדיו אין RSS (ב-Chromium עדיין יש מדדי CDP)
+    psutil = None
+
+
+MB = 1024 * 1024
+
+
+@dataclass
+class MemorySample:
+    """מדידה אחת - בסוף טסט, לפני סגירת הדף שלו"""
+    test: Optional[str]
+    generation: int  # מספר ה-context (עולה בכל מחזור)
+    tests_in_context: int
+    pages_in_context: int
+    js_heap_mb: Optional[float] = None
+    dom_nodes: Optional[int] = None
+    documents: Optional[int] = None
+    rss_mb: Optional[float] = None
+    recycled: Optional[str] = None  # הסיבה, אם ה-context הוחלף אחרי הטסט
+    timestamp: float = 0.0
+
+
+def cdp_metrics(page) -> Dict[str, float]:
+    """Performance.getMetrics של ה-renderer (רק Chromium - בשאר הדפדפנים מחזיר {})"""
+    try:
+        session = page.context.new_cdp_session(page)
+    except Exception:
+        return {}
+    try:
+        session.send("Performance.enable")
+        metrics = session.send("Performance.getMetrics")["metrics"]
+        return {metric["name"]: metric["value"] for metric in metrics}
+    except Exception:
+        return {}
+    finally:
+        try:
+            session.detach()
+        except Exception:
+            pass
+
+
+def browser_rss_mb() -> Optional[float]:
+    """
+    סכום ה-RSS של תהליכי הבת של התהליך הנוכחי (driver של Playwright, דפדפן ו-renderers).
+    דפדפן מחובר מבחוץ (browser.server) לא נספר - שם מסתמכים על מדדי CDP
+    """
+    if psutil is None:
+        return None
+    total = 0
+    try:
+        for child in psutil.Process().children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+    except psutil.Error:
+        return None
+    return round(total / MB, 1)
+
+
+class ContextRecycler:
+    """
+    מחזיק את ה-context הנוכחי ומחליף אותו כשעוברים אחד מהספים (0 / None = ללא סף):
+        max_tests      - טסטים על אותו context
+        max_pages      - דפים שנפתחו ב-context (כולל טאבים של AddToCartPool)
+        max_js_heap_mb - JS heap של ה-renderer (CDP)
+        max_rss_mb     - RSS של תהליכי הדפדפן (psutil)
+
+    factory(storage_state) יוצר context מוגדר, on_close(context) סוגר אותו (סטטיסטיקות, הקלטות)
+    """
+
+    def __init__(self, factory: Callable, on_close: Callable = None, max_tests: int = 50,
+                 max_pages: int = 200, max_js_heap_mb: float = None, max_rss_mb: float = None,
+                 carry_storage_state: bool = True, report_path: str = None):
+        self.factory = factory
+        self.on_close = on_close or (lambda context: context.close())
+        self.max_tests = max_tests
+        self.max_pages = max_pages
+        self.max_js_heap_mb = max_js_heap_mb
+        self.max_rss_mb = max_rss_mb
+        self.carry_storage_state = carry_storage_state
+        self.report_path = report_path
+        self.samples: List[MemorySample] = []
+        self.generation = 0
+        self.recycles = 0
+        self._context = None
+        self._tests = 0
+        self._pages = 0
+        self.logger = Logger()
+        if max_rss_mb and psutil is None:
+            # בלי psutil אין rss_mb - הסף לא יופעל אף פעם
+            self.logger.error(f"max_rss_mb={max_rss_mb} is set but psutil is not installed - "
+                              "RSS will not be measured (pip install psutil)")
+
+    @classmethod
+    def from_config(cls, factory: Callable, on_close: Callable, settings: Dict[str, Any]) -> "ContextRecycler":
+        report_path = settings.get("report_path")
+        if report_path:
+            report_path = report_path.format(worker=os.environ.get("PYTEST_XDIST_WORKER", "main"))
+        return cls(factory, on_close, max_tests=settings.get("max_tests", 50),
+                   max_pages=settings.get("max_pages", 200), max_js_heap_mb=settings.get("max_js_heap_mb"),
+                   max_rss_mb=settings.get("max_rss_mb"),
+                   carry_storage_state=settings.get("carry_storage_state", True), report_path=report_path)
+
+    @property
+    def context(self):
+        """ה-context הנוכחי (נוצר בגישה הראשונה)"""
+        if self._context is None:
+            self._open(None)
+        return self._context
+
+    def _open(self, storage_state):
+        self._context = self.factory(storage_state)
+        self._context.on("page", self._count_page)
+        self.generation += 1
+        self._tests = 0
+        self._pages = 0
+
+    def _count_page(self, page):
+        self._pages += 1
+
+    def new_page(self):
+        return self.context.new_page()
+
+    def sample(self, page, test_id: str = None) -> MemorySample:
+        """מדידה בסוף טסט - הדף עדיין פתוח (CDP צריך דף חי)"""
+        self._tests += 1
+        metrics = cdp_metrics(page) if page is not None else {}
+        heap = metrics.get("JSHeapUsedSize")
+        sample = MemorySample(
+            test=test_id, generation=self.generation, tests_in_context=self._tests,
+            pages_in_context=self._pages,
+            js_heap_mb=round(heap / MB, 1) if heap is not None else None,
+            dom_nodes=int(metrics["Nodes"]) if "Nodes" in metrics else None,
+            documents=int(metrics["Documents"]) if "Documents" in metrics else None,
+            rss_mb=browser_rss_mb(), timestamp=time.time())
+        self.samples.append(sample)
+        return sample
+
+    def recycle_reason(self, sample: MemorySample) -> Optional[str]:
+        if self.max_tests and sample.tests_in_context >= self.max_tests:
+            return f"{sample.tests_in_context} tests"
+        if self.max_pages and sample.pages_in_context >= self.max_pages:
+            return f"{sample.pages_in_context} pages"
+        if self.max_js_heap_mb and sample.js_heap_mb is not None and sample.js_heap_mb >= self.max_js_heap_mb:
+            return f"JS heap {sample.js_heap_mb}MB"
+        if self.max_rss_mb and sample.rss_mb is not None and sample.rss_mb >= self.max_rss_mb:
+            return f"RSS {sample.rss_mb}MB"
+        return None
+
+    def after_test(self, sample: MemorySample):
+        """אחרי שהדף של הטסט נסגר: החלפת ה-context אם עברנו סף, ורישום המדידה לדוח"""
+        reason = self.recycle_reason(sample)
+        if reason:
+            sample.recycled = reason
+            self.recycle(reason)
+        self._write(sample)
+
+    def recycle(self, reason: str = "manual"):
+        """context חדש במקום הנוכחי - cookies ו-localStorage עוברים אליו (carry_storage_state)"""
+        if self._context is None:
+            return
+        state = None
+        if self.carry_storage_state:
+            try:
+                state = self._context.storage_state()
+            except Exception as e:
+                self.logger.error(f"Could not read storage state before recycling: {e}")
+        old, self._context = self._context, None
+        try:
+            self.on_close(old)
+        except Exception as e:
+            self.logger.error(f"Could not close recycled context: {e}")
+        self._open(state)
+        self.recycles += 1
+        self.logger.info(f"Context recycled ({reason}) - generation {self.generation}")
+
+    def _write(self, sample: MemorySample):
+        if not self.report_path:
+            return
+        os.makedirs(os.path.dirname(self.report_path) or ".", exist_ok=True)
+        with open(self.report_path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(asdict(sample)) + "\n")
+
+    def close(self):
+        if self._context is not None:
+            self.on_close(self._context)
+            self._context = None
+
+    def summary(self) -> str:
+        """מגמת הזיכרון: ראשון / אחרון / מקסימום - זיכרון יציב = אחרון קרוב לראשון"""
+        parts = [f"Context recycler: {len(self.samples)} tests, {self.recycles} recycles"]
+        for field_name, label in (("js_heap_mb", "JS heap"), ("rss_mb", "RSS")):
+            values = [getattr(sample, field_name) for sample in self.samples if getattr(sample, field_name) is not None]
+            if values:
+                parts.append(f"{label} first {values[0]}MB / last {values[-1]}MB / max {max(values)}MB")
+        return ", ".join(parts)
@@ -1,7 +1,9 @@
 import yaml
 import json
-import re
+from functools import lru_cache
 from typing import Any, Dict
+from utils.price_parser import PriceParser, ParsedPrice
+from utils.logging_setup import logger
 
 
 class ConfigReader:
@@ -18,39 +20,30 @@ class ConfigReader:
             return json.load(file)
 
 
-class PriceParser:
-    
-    @staticmethod
-    def extract_price(price_text: str) -> float:
-        """
-        מחלץ מחיר מטקסט
-        דוגמאות: "$123.45" -> 123.45, "US $1,234.56" -> 1234.56
-        """
-        # הסרת כל התווים חוץ ממספרים ונקודה
-        clean_text = re.sub(r'[^\d.]', '', price_text)
-        
-        try:
-            return float(clean_text)
-        except ValueError:
-            return 0.0
-    
-    @staticmethod
-    def is_price_valid(price: float, max_price: float) -> bool:
-        """בדיקה אם מחיר תקין"""
-        return 0 < price <= max_price
+CONFIG_PATH = "config/test_config.yaml"
+
+
+@lru_cache(maxsize=None)
+def load_config(path: str = CONFIG_PATH) -> Dict[str, Any]:
+    """קובץ הקונפיגורציה - נקרא פעם אחת לתהליך (pytest_configure והפיקצ'ר config חולקים אותו)"""
+    return ConfigReader.read_yaml(path)
 
 
 class Logger:
-    """לוגר פשוט"""
+    """
+    לוגר - אותו API כמו קודם (Logger.info / Logger().info), מאחוריו logging עם סינון רמות
+    ותור עם thread כותב (utils.logging_setup). רמה כבויה עולה בדיקת int אחת;
+    להודעות יקרות אפשר להעביר ארגומנטים בסגנון % כדי לדחות את הפירמוט
+    """
     
     @staticmethod
-    def info(message: str):
-        print(f"[INFO] {message}")
+    def info(message: str, *args):
+        logger.info(message, *args)
     
     @staticmethod
-    def error(message: str):
-        print(f"[ERROR] {message}")
+    def error(message: str, *args):
+        logger.error(message, *args)
     
     @staticmethod
-    def debug(message: str):
-        print(f"[DEBUG] {message}")
+    def debug(message: str, *args):
+        logger.debug(message, *args)
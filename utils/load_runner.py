@@ -0,0 +1,430 @@
+"""
+Load Runner - זרימת הקנייה (חיפוש -> הוספה לסל -> בדיקת סכום) כ-N משתמשים וירטואליים
+כל משתמש רץ ב-context משלו (סל נפרד) על pages_async, המשתמשים מתחלקים בין כמה תהליכים,
+וכל תהליך מריץ את המשתמשים שלו במקביל עם asyncio.
+לכל צעד נמדדים throughput, היסטוגרמת latency (p50/p95/p99) ואחוז שגיאות.
+
+הרצה (מתיקיית הפרויקט):
+    python -m utils.load_runner --users 20 --processes 4 --ramp-up 30 --duration 300 \\
+        --think-time 1 3 --base-url https://staging.example.com --output reports/load.json
+מול שרת מקומי (ReplayServer מגיש ארכיון מוקלט במקום האתר):
+    python -m utils.load_runner --archive recordings/ebay.jsonl.gz --users 5 --duration 60
+"""
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.helpers import Logger, load_config
+
+
+class LatencyHistogram:
+    """
+    היסטוגרמה לוגריתמית (דיוק ~precision לכל ערך): רישום ב-O(1), זיכרון קבוע,
+    וניתנת לאיחוד בין משתמשים ותהליכים (מילון bucket -> count)
+    """
+
+    def __init__(self, precision: float = 0.02):
+        self.precision = precision
+        self._log_base = math.log1p(precision)
+        self.buckets: Counter = Counter()
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def record(self, value_ms: float):
+        bucket = 0 if value_ms <= 1 else math.ceil(math.log(value_ms) / self._log_base)
+        self.buckets[bucket] += 1
+        self.count += 1
+        self.total += value_ms
+        self.min = value_ms if self.min is None else min(self.min, value_ms)
+        self.max = value_ms if self.max is None else max(self.max, value_ms)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """הערך שמתחתיו pct אחוז מהמדידות (חסום ע"י min / max האמיתיים)"""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(pct / 100 * self.count))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                value = 1.0 if bucket == 0 else math.exp(bucket * self._log_base)
+                return round(min(max(value, self.min), self.max), 1)
+        return round(self.max, 1)
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def merge(self, other: "LatencyHistogram"):
+        self.buckets.update(other.buckets)
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"precision": self.precision, "buckets": dict(self.buckets), "count": self.count,
+                "total": self.total, "min": self.min, "max": self.max}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        histogram = cls(data["precision"])
+        histogram.buckets = Counter({int(bucket): count for bucket, count in data["buckets"].items()})
+        histogram.count, histogram.total = data["count"], data["total"]
+        histogram.min, histogram.max = data["min"], data["max"]
+        return histogram
+
+
+class StepStats:
+    """צעד אחד: latency של הצלחות, מספר שגיאות לפי סוג"""
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.errors: Counter = Counter()
+
+    @property
+    def error_count(self) -> int:
+        return sum(self.errors.values())
+
+    def merge(self, other: "StepStats"):
+        self.latency.merge(other.latency)
+        self.errors.update(other.errors)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"latency": self.latency.to_dict(), "errors": dict(self.errors)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StepStats":
+        stats = cls()
+        stats.latency = LatencyHistogram.from_dict(data["latency"])
+        stats.errors = Counter(data["errors"])
+        return stats
+
+
+@dataclass
+class LoadProfile:
+    """
+    users      - משתמשים וירטואליים בסך הכל (מתחלקים בין processes)
+    ramp_up    - שניות עד שכל המשתמשים התחילו (משתמש i מתחיל ב-ramp_up * i / users)
+    duration   - שניות מתחילת הריצה; משתמש לא מתחיל איטרציה חדשה אחרי הזמן הזה
+    think_time - (מינימום, מקסימום) שניות בין צעדים
+    iterations - לכל היותר N איטרציות למשתמש (None = עד סוף duration)
+    """
+    users: int = 1
+    processes: int = 1
+    ramp_up: float = 0.0
+    duration: float = 60.0
+    think_time: Tuple[float, float] = (1.0, 3.0)
+    iterations: Optional[int] = None
+    seed: Optional[int] = None
+
+
+class VirtualUser:
+    """משתמש וירטואלי: מדידת צעדים, זמני חשיבה, ומקום לאובייקטים של ה-flow (context, דפים)"""
+
+    def __init__(self, index: int, profile: LoadProfile, stats: Dict[str, StepStats]):
+        self.index = index
+        self.profile = profile
+        self.stats = stats
+        self.rng = random.Random(f"{profile.seed}:{index}" if profile.seed is not None else None)
+        self.state: Dict[str, Any] = {}
+        self.iterations = 0
+        self.failed_iterations = 0
+
+    @asynccontextmanager
+    async def step(self, name: str):
+        """מדידת צעד: הצלחה נכנסת להיסטוגרמה, חריגה נספרת כשגיאה (לפי סוג) וממשיכה הלאה"""
+        stats = self.stats.setdefault(name, StepStats())
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            stats.errors[type(e).__name__] += 1
+            raise
+        stats.latency.record((time.perf_counter() - start) * 1000)
+
+    async def think(self):
+        low, high = self.profile.think_time
+        if high > 0:
+            await asyncio.sleep(self.rng.uniform(low, high))
+
+
+class UserFlow:
+    """
+    מה שכל משתמש עושה. open/close - פעם אחת לכל תהליך (למשל הפעלת דפדפן),
+    start/stop - לכל משתמש (context), iteration - סבב אחד של התרחיש.
+    האובייקט עובר לתהליכים אחרים ב-pickle, לכן open הוא המקום ליצור משאבים
+    """
+
+    async def open(self):
+        pass
+
+    async def start(self, user: VirtualUser):
+        pass
+
+    async def iteration(self, user: VirtualUser):
+        raise NotImplementedError
+
+    async def stop(self, user: VirtualUser):
+        pass
+
+    async def close(self):
+        pass
+
+
+class ShoppingFlow(UserFlow):
+    """זרימת הקנייה של הטסטים, על pages_async: search -> add_to_cart (לכל פריט) -> cart_total"""
+
+    def __init__(self, config: Dict[str, Any], base_url: str = None, cart_url: str = None):
+        self.config = config
+        self.base_url = base_url or config["ebay"]["base_url"]
+        self.cart_url = cart_url or config["ebay"]["cart_url"]
+        self.scenarios: List[Dict[str, Any]] = []
+        self._playwright = None
+        self._browser = None
+
+    async def open(self):
+        from playwright.async_api import async_playwright
+        from utils.scenario_catalog import load_scenarios
+        from utils.timeout_budget import timeouts
+
+        # תהליך חדש (spawn) - ה-timeouts והניסיונות החוזרים מהקונפיגורציה, בלי תקציב לטסט
+        timeouts.configure(self.config.get("timeout", {}), self.config.get("test_settings", {}).get("max_retries"))
+        self.scenarios = load_scenarios()
+        self._playwright = await async_playwright().start()
+        browser_type = getattr(self._playwright, self.config["browser"]["type"], self._playwright.chromium)
+        self._browser = await browser_type.launch(headless=self.config["browser"].get("headless", True))
+
+    async def start(self, user: VirtualUser):
+        from utils.network_filter import NetworkFilter
+        from utils.timeout_budget import timeouts
+
+        # כל משתמש רץ במשימה משלו - begin_test כאן נותן לו סטטיסטיקה ואלמנטים "חסרים" משלו
+        timeouts.begin_test(budget_ms=0)
+        context = await self._browser.new_context(viewport={"width": 1920, "height": 1080}, locale="en-US")
+        await NetworkFilter(self.config.get("network_filter", {})).install_async(context)
+        user.state["context"] = context
+
+    async def iteration(self, user: VirtualUser):
+        from pages_async.cart_page import CartPage
+        from pages_async.product_page import ProductPage
+        from pages_async.search_results_page import SearchResultsPage
+
+        scenario = self.scenarios[(user.index + user.iterations) % len(self.scenarios)]
+        page = await user.state["context"].new_page()
+        page.set_default_timeout(self.config["timeout"]["default"])
+        try:
+            async with user.step("search"):
+                urls = await SearchResultsPage(page, base_url=self.base_url).search_by_url(
+                    scenario["search_query"], scenario["max_price"], scenario["items_limit"])
+                if not urls:
+                    raise LookupError(f"No items for '{scenario['search_query']}'")
+            await user.think()
+
+            product_page = ProductPage(page, rng=user.rng)
+            for url in urls:
+                async with user.step("add_to_cart"):
+                    await product_page.open_product(url)
+                    await product_page.select_random_variants()
+                    if not await product_page.add_to_cart():
+                        raise RuntimeError("Add to cart failed")
+                await user.think()
+
+            async with user.step("cart_total"):
+                cart_page = CartPage(page, cart_url=self.cart_url)
+                await cart_page.open_cart()
+                await cart_page.assert_total_not_exceeds(scenario["max_price"] * len(urls))
+        finally:
+            await page.close()
+
+    async def stop(self, user: VirtualUser):
+        from utils.timeout_budget import timeouts
+
+        user.state["waits"] = timeouts.end_test()
+        await user.state["context"].close()
+
+    async def close(self):
+        if self._browser is not None:
+            await self._browser.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
+
+
+async def _run_user(flow: UserFlow, user: VirtualUser, start_at: float, deadline: float):
+    await asyncio.sleep(max(0.0, start_at - time.time()))
+    if time.time() >= deadline:
+        return
+    try:
+        async with user.step("user_start"):
+            await flow.start(user)
+    except Exception as e:
+        Logger.error(f"User {user.index} could not start: {e}")
+        return
+    try:
+        while time.time() < deadline and (user.profile.iterations is None
+                                          or user.iterations < user.profile.iterations):
+            try:
+                async with user.step("iteration"):
+                    await flow.iteration(user)
+            except Exception as e:
+                user.failed_iterations += 1
+                Logger.debug(f"User {user.index} iteration failed: {e}")
+            user.iterations += 1
+            await user.think()
+    finally:
+        try:
+            await flow.stop(user)
+        except Exception as e:
+            Logger.error(f"User {user.index} could not stop: {e}")
+
+
+async def _run_users(flow: UserFlow, profile: LoadProfile, user_indexes: List[int], run_start: float) -> Dict:
+    stats: Dict[str, StepStats] = {}
+    users = [VirtualUser(index, profile, stats) for index in user_indexes]
+    deadline = run_start + profile.duration
+    await flow.open()
+    try:
+        await asyncio.gather(*(_run_user(flow, user, run_start + profile.ramp_up * user.index / profile.users,
+                                         deadline)
+                               for user in users))
+    finally:
+        await flow.close()
+    return {"steps": {name: step.to_dict() for name, step in stats.items()},
+            "iterations": sum(user.iterations for user in users),
+            "failed_iterations": sum(user.failed_iterations for user in users)}
+
+
+def run_process(flow: UserFlow, profile: LoadProfile, user_indexes: List[int], run_start: float) -> Dict:
+    """נקודת הכניסה של תהליך - חייבת להיות ברמת המודול (pickle)"""
+    return asyncio.run(_run_users(flow, profile, user_indexes, run_start))
+
+
+@dataclass
+class LoadReport:
+    profile: LoadProfile
+    steps: Dict[str, StepStats] = field(default_factory=dict)
+    wall_time: float = 0.0
+    iterations: int = 0
+    failed_iterations: int = 0
+
+    def add(self, result: Dict):
+        for name, data in result["steps"].items():
+            self.steps.setdefault(name, StepStats()).merge(StepStats.from_dict(data))
+        self.iterations += result["iterations"]
+        self.failed_iterations += result["failed_iterations"]
+
+    def step_summary(self, name: str) -> Dict[str, Any]:
+        stats = self.steps[name]
+        attempts = stats.latency.count + stats.error_count
+        return {
+            "ok": stats.latency.count,
+            "errors": stats.error_count,
+            "error_rate": round(stats.error_count / attempts, 4) if attempts else 0.0,
+            "throughput_per_s": round(attempts / self.wall_time, 3) if self.wall_time else 0.0,
+            "p50_ms": stats.latency.percentile(50),
+            "p95_ms": stats.latency.percentile(95),
+            "p99_ms": stats.latency.percentile(99),
+            "max_ms": round(stats.latency.max, 1) if stats.latency.max is not None else None,
+            "error_types": dict(stats.errors),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"profile": asdict(self.profile), "wall_time_s": round(self.wall_time, 2),
+                "iterations": self.iterations, "failed_iterations": self.failed_iterations,
+                "steps": {name: self.step_summary(name) for name in self.steps}}
+
+    def format_table(self) -> str:
+        lines = [f"{'step':<14} {'ok':>7} {'err':>6} {'err%':>6} {'req/s':>8} "
+                 f"{'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}"]
+        for name in self.steps:
+            row = self.step_summary(name)
+            lines.append(f"{name:<14} {row['ok']:>7} {row['errors']:>6} {row['error_rate'] * 100:>5.1f}% "
+                         f"{row['throughput_per_s']:>8.2f} "
+                         + " ".join(f"{row[key] if row[key] is not None else '-':>9}"
+                                    for key in ("p50_ms", "p95_ms", "p99_ms", "max_ms")))
+        lines.append(f"{self.profile.users} users x {self.profile.processes} processes, "
+                     f"{self.iterations} iterations ({self.failed_iterations} failed) in {self.wall_time:.1f}s")
+        return "\n".join(lines)
+
+
+def run_load(flow: UserFlow, profile: LoadProfile) -> LoadReport:
+    """
+    הרצת הפרופיל: משתמש i רץ בתהליך i % processes. processes=1 רץ בתהליך הנוכחי.
+    כל התהליכים מקבלים אותו זמן התחלה, כך שה-ramp-up גלובלי ולא לכל תהליך
+    """
+    processes = max(1, min(profile.processes, profile.users))
+    groups = [list(range(process, profile.users, processes)) for process in range(processes)]
+    report = LoadReport(profile)
+    start = time.perf_counter()
+
+    if processes == 1:
+        report.add(run_process(flow, profile, groups[0], time.time()))
+    else:
+        # spawn - playwright ו-asyncio לא שורדים fork בצורה בטוחה
+        run_start = time.time() + 1.0
+        with ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context("spawn")) as executor:
+            futures = [executor.submit(run_process, flow, profile, group, run_start) for group in groups]
+            for future in futures:
+                report.add(future.result())
+
+    report.wall_time = time.perf_counter() - start
+    return report
+
+
+def main():
+    settings = load_config()
+    defaults = settings.get("load", {})
+    parser = argparse.ArgumentParser(description="Run the shopping flow as concurrent virtual users")
+    parser.add_argument("--users", type=int, default=defaults.get("users", 10))
+    parser.add_argument("--processes", type=int, default=defaults.get("processes", 1))
+    parser.add_argument("--ramp-up", type=float, default=defaults.get("ramp_up", 0))
+    parser.add_argument("--duration", type=float, default=defaults.get("duration", 60))
+    parser.add_argument("--think-time", type=float, nargs=2, default=defaults.get("think_time", [1, 3]))
+    parser.add_argument("--iterations", type=int, default=defaults.get("iterations"))
+    parser.add_argument("--seed", type=int, default=defaults.get("seed"))
+    parser.add_argument("--base-url", default=defaults.get("base_url"))
+    parser.add_argument("--cart-url", default=defaults.get("cart_url"))
+    parser.add_argument("--archive", help="serve a recorded archive with ReplayServer and run against it")
+    parser.add_argument("--output", help="JSON report path")
+    args = parser.parse_args()
+
+    profile = LoadProfile(users=args.users, processes=args.processes, ramp_up=args.ramp_up,
+                          duration=args.duration, think_time=tuple(args.think_time),
+                          iterations=args.iterations, seed=args.seed)
+    server = None
+    base_url, cart_url = args.base_url, args.cart_url
+    if args.archive:
+        from utils.replay import ReplayArchive, ReplayServer
+        server = ReplayServer(ReplayArchive.load(args.archive), port=0).start()
+        base_url, cart_url = server.base_url, f"{server.base_url}/sh/sc"
+        Logger.info(f"Serving {args.archive} on {server.base_url}")
+
+    try:
+        report = run_load(ShoppingFlow(settings, base_url, cart_url), profile)
+    finally:
+        if server:
+            server.stop()
+
+    print(report.format_table())
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report.to_dict(), file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
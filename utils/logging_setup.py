@@ -0,0 +1,139 @@
+"""
+Logging Setup - לוגים מסוננים לפי רמה, דרך תור עם thread כותב ברקע
+קונסול בפורמט הישן ([INFO] ...) + JSON lines לכל worker עם שם הטסט בכל רשומה.
+ה-thread מופעל רק ב-configure_logging (ב-pytest_configure); עד אז - כתיבה ישירה לקונסול
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+
+LOGGER_NAME = "e2e"
+logger = logging.getLogger(LOGGER_NAME)
+# pytest אוסף את הלוג בעצמו אם הרשומות מגיעות ל-root - כאן יש לנו handlers משלנו
+logger.propagate = False
+
+_current_test: ContextVar[Optional[str]] = ContextVar("current_test", default=None)
+_listener: Optional[QueueListener] = None
+_records: Optional[queue.Queue] = None
+_settings: Optional[Dict[str, Any]] = None
+
+CONSOLE_FORMAT = "[%(levelname)s] %(message)s"
+
+
+def worker_id() -> str:
+    return os.environ.get("PYTEST_XDIST_WORKER", "main")
+
+
+def set_current_test(test_id: Optional[str]):
+    """הטסט שרץ עכשיו - נכנס לכל רשומה (בצד השולח, לפני התור)"""
+    _current_test.set(test_id)
+
+
+class _ContextFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.test = _current_test.get()
+        record.worker = worker_id()
+        return True
+
+
+def _console_handler() -> logging.Handler:
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+    return console
+
+
+def _use_direct_console():
+    """בלי הגדרה (import, כלי CLI, אחרי stop_logging): INFO לקונסול, בלי תור ובלי thread"""
+    logger.handlers = [_console_handler()]
+    logger.setLevel(logging.INFO)
+
+
+class JsonFormatter(logging.Formatter):
+    """רשומה אחת בשורה: זמן, רמה, worker, טסט, הודעה"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "worker": getattr(record, "worker", None),
+            "test": getattr(record, "test", None),
+            "message": record.getMessage(),
+        }
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def configure_logging(settings: Dict[str, Any] = None):
+    """
+    (הגדרה מחדש של) ה-pipeline:
+    level - רמה מינימלית (DEBUG / INFO / ERROR), console - פלט לקונסול,
+    json_path - קובץ JSON lines, {worker} מוחלף במזהה ה-worker של xdist
+    """
+    global _listener, _records, _settings
+    settings = dict(settings or {})
+    stop_logging()
+
+    handlers = []
+    if settings.get("console", True):
+        handlers.append(_console_handler())
+    json_path = settings.get("json_path")
+    if json_path:
+        path = json_path.format(worker=worker_id())
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        json_handler = logging.FileHandler(path, encoding="utf-8")
+        json_handler.setFormatter(JsonFormatter())
+        handlers.append(json_handler)
+
+    # queue.Queue ולא SimpleQueue - ה-listener מסמן task_done, כך ש-flush_logs יכול לחכות ב-join
+    _records = queue.Queue()
+    queue_handler = QueueHandler(_records)
+    queue_handler.addFilter(_ContextFilter())
+    logger.handlers = [queue_handler]
+    logger.setLevel(str(settings.get("level", "INFO")).upper())
+
+    _listener = QueueListener(_records, *handlers, respect_handler_level=True)
+    _listener.start()
+    _settings = settings
+
+
+def logging_settings() -> Optional[Dict[str, Any]]:
+    """ההגדרות של ה-pipeline הפעיל (None = לא הוגדר) - כדי להחזיר אותו אחרי שינוי זמני"""
+    return dict(_settings) if _settings is not None else None
+
+
+def restore_logging(settings: Optional[Dict[str, Any]]):
+    """חזרה להגדרות שנשמרו ב-logging_settings"""
+    if settings is None:
+        stop_logging()
+    else:
+        configure_logging(settings)
+
+
+def flush_logs():
+    """המתנה עד שכל מה שכבר בתור נכתב - ה-thread הכותב ממשיך לרוץ"""
+    if _records is not None:
+        _records.join()
+
+
+def stop_logging():
+    """עצירת ה-thread הכותב (אחרי שהתור התרוקן) וחזרה לכתיבה ישירה לקונסול"""
+    global _listener, _records, _settings
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+    _listener = None
+    _records = None
+    _settings = None
+    _use_direct_console()
+
+
+_use_direct_console()
+atexit.register(stop_logging)
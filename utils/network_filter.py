@@ -0,0 +1,167 @@
+"""
+Network Filter - חסימת משאבים מיותרים (תמונות, פונטים, מודעות, tracking)
+מוגדר מ-config/test_config.yaml תחת network_filter
+"""
+from collections import Counter
+from fnmatch import fnmatch
+from typing import Any, Dict, List
+from utils.helpers import Logger
+
+
+# גודל משוער לבקשה שנחסמה, כשלא ראינו אף תגובה מאותו סוג
+DEFAULT_ESTIMATED_SIZES = {
+    "image": 30_000,
+    "media": 250_000,
+    "font": 40_000,
+    "stylesheet": 20_000,
+    "script": 40_000,
+    "xhr": 3_000,
+    "fetch": 3_000,
+    "document": 60_000,
+}
+
+BLOCK = "block"
+STUB = "stub"
+ALLOW = "allow"
+
+
+class NetworkFilterStats:
+    """מונים של בקשות שנחסמו/הוחלפו ובייטים שנחסכו"""
+    
+    def __init__(self):
+        self.blocked = Counter()
+        self.stubbed = Counter()
+        self.allowed = Counter()
+        self.allowed_bytes = Counter()
+        # תגובות שדיווחו גודל (content-length) - רק הן נכנסות לממוצע
+        self.sized_responses = Counter()
+    
+    def record_response(self, resource_type: str, size: int):
+        if size > 0:
+            self.allowed_bytes[resource_type] += size
+            self.sized_responses[resource_type] += 1
+    
+    def estimated_bytes_saved(self) -> int:
+        """ממוצע גודל תגובה לפי סוג (מה שנטען בפועל) כפול מספר הבקשות שנחסמו"""
+        saved = 0
+        for resource_type, count in (self.blocked + self.stubbed).items():
+            if self.sized_responses[resource_type]:
+                average = self.allowed_bytes[resource_type] / self.sized_responses[resource_type]
+            else:
+                average = DEFAULT_ESTIMATED_SIZES.get(resource_type, 5_000)
+            saved += int(average * count)
+        return saved
+    
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "blocked_requests": sum(self.blocked.values()),
+            "stubbed_requests": sum(self.stubbed.values()),
+            "allowed_requests": sum(self.allowed.values()),
+            "blocked_by_type": dict(self.blocked),
+            "stubbed_by_type": dict(self.stubbed),
+            "allowed_bytes": sum(self.allowed_bytes.values()),
+            "estimated_bytes_saved": self.estimated_bytes_saved(),
+        }
+    
+    def summary(self) -> str:
+        stats = self.as_dict()
+        return (f"Network filter: blocked {stats['blocked_requests']}, stubbed {stats['stubbed_requests']}, "
+                f"allowed {stats['allowed_requests']} requests; "
+                f"~{stats['estimated_bytes_saved'] / 1024 / 1024:.1f} MB saved")
+
+
+class NetworkFilter:
+    """
+    route על כל ה-context: מחליט לכל בקשה אם לחסום, להחזיר תשובה ריקה (stub) או להמשיך.
+    סוג הדף (search/product/cart) נקבע לפי ה-URL של הדף שממנו יצאה הבקשה.
+    """
+    
+    def __init__(self, filter_config: Dict[str, Any]):
+        self.enabled = filter_config.get("enabled", False)
+        self.page_kinds: Dict[str, Dict[str, Any]] = filter_config.get("page_kinds", {})
+        self.default_block: List[str] = filter_config.get("default_block", [])
+        self.block_url_patterns: List[str] = filter_config.get("block_url_patterns", [])
+        self.stub_url_patterns: List[str] = filter_config.get("stub_url_patterns", [])
+        self.stats = NetworkFilterStats()
+        self.logger = Logger()
+    
+    def page_kind(self, page_url: str) -> str:
+        for kind, settings in self.page_kinds.items():
+            if any(fnmatch(page_url, pattern) for pattern in settings.get("urls", [])):
+                return kind
+        return "default"
+    
+    def decide(self, url: str, resource_type: str, page_url: str, is_main_navigation: bool = False) -> str:
+        """block / stub / allow לבקשה בודדת"""
+        # ניווט של הדף הראשי לעולם לא נחסם
+        if is_main_navigation:
+            return ALLOW
+        if any(fnmatch(url, pattern) for pattern in self.stub_url_patterns):
+            return STUB
+        if any(fnmatch(url, pattern) for pattern in self.block_url_patterns):
+            return BLOCK
+        
+        kind = self.page_kind(page_url)
+        blocked_types = self.page_kinds.get(kind, {}).get("block", self.default_block)
+        if resource_type in blocked_types:
+            return BLOCK
+        return ALLOW
+    
+    def _decide_for_request(self, request) -> str:
+        try:
+            frame = request.frame
+            page_url = frame.url
+            is_main_navigation = request.is_navigation_request() and frame.parent_frame is None
+        except Exception:
+            # בקשות של service worker - אין frame
+            page_url, is_main_navigation = "", False
+        
+        action = self.decide(request.url, request.resource_type, page_url, is_main_navigation)
+        if action == BLOCK:
+            self.stats.blocked[request.resource_type] += 1
+        elif action == STUB:
+            self.stats.stubbed[request.resource_type] += 1
+        else:
+            self.stats.allowed[request.resource_type] += 1
+        return action
+    
+    def _on_response(self, response):
+        try:
+            size = int(response.headers.get("content-length", 0))
+        except ValueError:
+            size = 0
+        self.stats.record_response(response.request.resource_type, size)
+    
+    def _handle_route(self, route):
+        action = self._decide_for_request(route.request)
+        if action == BLOCK:
+            route.abort("blockedbyclient")
+        elif action == STUB:
+            route.fulfill(status=204, body="")
+        else:
+            route.continue_()
+    
+    async def _handle_route_async(self, route):
+        action = self._decide_for_request(route.request)
+        if action == BLOCK:
+            await route.abort("blockedbyclient")
+        elif action == STUB:
+            await route.fulfill(status=204, body="")
+        else:
+            await route.continue_()
+    
+    def install(self, context):
+        """התקנה על BrowserContext סינכרוני"""
+        if not self.enabled:
+            return self
+        context.route("**/*", self._handle_route)
+        context.on("response", self._on_response)
+        return self
+    
+    async def install_async(self, context):
+        """התקנה על BrowserContext של async_api"""
+        if not self.enabled:
+            return self
+        await context.route("**/*", self._handle_route_async)
+        context.on("response", self._on_response)
+        return self
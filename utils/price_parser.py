@@ -0,0 +1,165 @@
+"""
+Price Parser - פענוח מחירים: טווחים ("$20.00 to $45.00"), מטבעות ופורמטים מקומיים ("EUR 1.234,56")
+"""
+import re
+from functools import lru_cache
+from typing import Iterable, List, NamedTuple, Optional
+
+try:
+    import numpy as np
+except ImportError:  # NumPy אופציונלי - בלעדיו parse_batch מחזיר רשימות
+    np = None
+
+
+class ParsedPrice(NamedTuple):
+    """תוצאת פענוח: low == high למחיר בודד, ok=False אם לא נמצא מספר"""
+    low: float
+    high: float
+    currency: Optional[str]
+    ok: bool
+
+
+class PriceBatch(NamedTuple):
+    """תוצאת parse_batch בעמודות - מערכי NumPy או רשימות"""
+    low: "np.ndarray | List[float]"
+    high: "np.ndarray | List[float]"
+    currency: "np.ndarray | List[Optional[str]]"
+    ok: "np.ndarray | List[bool]"
+
+
+# סמלים לפי סדר - "US $" / "C $" לפני "$" הכללי
+CURRENCY_SYMBOLS = [
+    ("US $", "USD"), ("US$", "USD"), ("C $", "CAD"), ("C$", "CAD"), ("AU $", "AUD"), ("AU$", "AUD"),
+    ("NZ $", "NZD"), ("HK $", "HKD"), ("$", "USD"), ("£", "GBP"), ("€", "EUR"), ("₪", "ILS"),
+    ("¥", "JPY"), ("₹", "INR"), ("CHF", "CHF"),
+]
+CURRENCY_CODES = {"USD", "EUR", "GBP", "ILS", "CAD", "AUD", "NZD", "HKD", "JPY", "INR", "CHF", "NIS"}
+CURRENCY_ALIASES = {"NIS": "ILS"}
+
+# מטבעות שבהם בדרך כלל "1.234" הוא אלף ולא 1.234
+COMMA_DECIMAL_CURRENCIES = {"EUR", "CHF"}
+
+CODE_PATTERN = re.compile(r"\b(" + "|".join(sorted(CURRENCY_CODES)) + r")\b")
+SYMBOL_PATTERN = re.compile("|".join(re.escape(symbol) for symbol, _ in CURRENCY_SYMBOLS))
+SYMBOL_CURRENCIES = dict(CURRENCY_SYMBOLS)
+# מספר עם מפרידי אלפים (1,234.56 / 1.234,56 / 1 234,56) או מספר פשוט (1234.56 / 12,50)
+AMOUNT_PATTERN = re.compile(r"\d{1,3}(?:[., ' ]\d{3})+(?:[.,]\d+)?|\d+(?:[.,]\d+)?")
+RANGE_PATTERN = re.compile(r"\d\s*(?:to|bis|à|-|–|—)\s*\D{0,6}\d", re.IGNORECASE)
+THOUSANDS_SEPARATORS = re.compile(r"[., ' ]")
+
+FAILED = ParsedPrice(0.0, 0.0, None, False)
+
+
+def _detect_currency(text: str) -> Optional[str]:
+    match = CODE_PATTERN.search(text)
+    if match:
+        code = match.group(1)
+        return CURRENCY_ALIASES.get(code, code)
+    match = SYMBOL_PATTERN.search(text)
+    if match:
+        return SYMBOL_CURRENCIES[match.group(0)]
+    return None
+
+
+def _to_float(token: str, currency: Optional[str]) -> float:
+    """המרת מספר עם מפרידים לפי הכללים: המפריד האחרון הוא העשרוני, אלא אם אחריו בדיוק 3 ספרות"""
+    last_dot = token.rfind(".")
+    last_comma = token.rfind(",")
+
+    if last_dot >= 0 and last_comma >= 0:
+        decimal = "." if last_dot > last_comma else ","
+    elif last_comma >= 0:
+        # "12,50" עשרוני, "1,234" אלפים
+        decimal = "," if token.count(",") == 1 and len(token) - last_comma - 1 != 3 else None
+    elif last_dot >= 0:
+        # "1.234.567" אלפים, "EUR 1.234" אלפים, "$1.234" עשרוני
+        single = token.count(".") == 1
+        thousands = len(token) - last_dot - 1 == 3 and currency in COMMA_DECIMAL_CURRENCIES
+        decimal = "." if single and not thousands else None
+    else:
+        decimal = None
+
+    if decimal is None:
+        return float(THOUSANDS_SEPARATORS.sub("", token))
+    integer, fraction = token.rsplit(decimal, 1)
+    return float(f"{THOUSANDS_SEPARATORS.sub('', integer) or '0'}.{fraction}")
+
+
+@lru_cache(maxsize=8192)
+def parse_price(text: str) -> ParsedPrice:
+    """פענוח מחרוזת מחיר אחת (עם cache - מחרוזות המחיר של eBay חוזרות על עצמן הרבה)"""
+    if not text:
+        return FAILED
+
+    currency = _detect_currency(text)
+    amounts = AMOUNT_PATTERN.findall(text)
+    if not amounts:
+        return ParsedPrice(0.0, 0.0, currency, False)
+
+    try:
+        values = [_to_float(amount, currency) for amount in amounts]
+    except ValueError:
+        return ParsedPrice(0.0, 0.0, currency, False)
+
+    # "$20.00 to $45.00" - טווח. בלי מילת טווח לוקחים את המספר הראשון
+    if len(values) > 1 and RANGE_PATTERN.search(text):
+        return ParsedPrice(min(values[:2]), max(values[:2]), currency, True)
+    return ParsedPrice(values[0], values[0], currency, True)
+
+
+class PriceParser:
+
+    @staticmethod
+    def parse(price_text: str) -> ParsedPrice:
+        """פענוח מלא: low/high, מטבע ודגל הצלחה"""
+        return parse_price(price_text)
+
+    @staticmethod
+    def extract_price(price_text: str) -> float:
+        """
+        מחלץ מחיר מטקסט (הקצה התחתון בטווח, 0.0 אם נכשל)
+        דוגמאות: "$123.45" -> 123.45, "US $1,234.56" -> 1234.56, "EUR 1.234,56" -> 1234.56
+        """
+        return parse_price(price_text).low
+
+    @staticmethod
+    def extract_max_price(price_text: str) -> float:
+        """הקצה העליון בטווח - לבדיקת תקציב, כי הווריאנט שייבחר יכול להיות היקר"""
+        return parse_price(price_text).high
+
+    @staticmethod
+    def is_price_valid(price: float, max_price: float) -> bool:
+        """בדיקה אם מחיר תקין"""
+        return 0 < price <= max_price
+
+    @staticmethod
+    def parse_batch(price_texts: Iterable[str], use_numpy: Optional[bool] = None) -> PriceBatch:
+        """
+        פענוח של הרבה מחרוזות בקריאה אחת.
+        עם NumPy: כל מחרוזת ייחודית מפוענחת פעם אחת והתוצאה מפוזרת בחזרה עם אינדקס הפוך
+        """
+        texts = price_texts if isinstance(price_texts, list) else list(price_texts)
+        if use_numpy is None:
+            use_numpy = np is not None
+        if use_numpy and np is None:
+            raise ImportError("parse_batch(use_numpy=True) requires numpy")
+
+        if not use_numpy:
+            parsed = [parse_price(text) for text in texts]
+            return PriceBatch([price.low for price in parsed], [price.high for price in parsed],
+                              [price.currency for price in parsed], [price.ok for price in parsed])
+
+        unique, inverse = np.unique(np.asarray(texts, dtype=str), return_inverse=True)
+        parsed = [parse_price(str(text)) for text in unique]
+        low = np.fromiter((price.low for price in parsed), dtype=np.float64, count=len(parsed))
+        high = np.fromiter((price.high for price in parsed), dtype=np.float64, count=len(parsed))
+        ok = np.fromiter((price.ok for price in parsed), dtype=bool, count=len(parsed))
+        currency = np.array([price.currency for price in parsed], dtype=object)
+        return PriceBatch(low[inverse], high[inverse], currency[inverse], ok[inverse])
+
+    @staticmethod
+    def within_budget(batch: PriceBatch, max_price: float):
+        """מסכה של פריטים שהקצה העליון שלהם בתקציב (מערך bool עם NumPy, אחרת רשימה)"""
+        if np is not None and isinstance(batch.high, np.ndarray):
+            return batch.ok & (batch.high > 0) & (batch.high <= max_price)
+        return [ok and 0 < high <= max_price for ok, high in zip(batch.ok, batch.high)]
@@ -0,0 +1,317 @@
+"""
+Record / Replay - הקלטת תגובות של eBay לארכיון מקומי והשמעה חוזרת שלהן
+מאפשר ריצות offline ודטרמיניסטיות (למשל לבנצ'מרקים)
+
+ארכיון = קובץ JSON lines דחוס ב-gzip, שורה לכל תגובה:
+    {"method", "url", "status", "headers", "body"(base64)}
+
+הרצת שרת מקומי:
+    python -m utils.replay serve --archive recordings/ebay.jsonl.gz --port 8765
+הוספת HTML שמור לארכיון:
+    python -m utils.replay import-html --archive recordings/ebay.jsonl.gz \\
+        --url "https://www.ebay.com/sch/i.html?_nkw=shoes" --file benchmarks/fixtures/search_results.html
+"""
+import argparse
+import base64
+import gzip
+import json
+import os
+import threading
+from fnmatch import fnmatch
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+from utils.helpers import Logger
+
+
+# פרמטרים של tracking שלא משפיעים על התוכן - לא נכנסים למפתח
+IGNORED_QUERY_PARAMS = {"_trksid", "_trkparms", "hash", "amdata", "_from", "_sacat_trk", "mkevt", "mkcid"}
+# headers ששומרים בארכיון (השאר לא רלוונטיים להשמעה)
+KEPT_HEADERS = {"content-type", "cache-control", "location"}
+DEFAULT_HOSTS = ["https://www.ebay.com", "https://cart.ebay.com", "https://ebay.com"]
+
+
+def request_key(method: str, url: str, include_host: bool = True) -> str:
+    """מפתח קנוני לבקשה: method + host + path + query ממוין בלי פרמטרי tracking"""
+    parts = urlsplit(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                   if k not in IGNORED_QUERY_PARAMS)
+    host = parts.netloc if include_host else ""
+    return f"{method.upper()} {host}{parts.path or '/'}?{urlencode(query)}"
+
+
+class ReplayArchive:
+    """אוסף תגובות מוקלטות, עם חיפוש לפי מפתח קנוני"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: List[Dict] = []
+        self._by_key: Dict[str, Dict] = {}
+        self._by_path: Dict[str, Dict] = {}
+    
+    @classmethod
+    def load(cls, path: str) -> "ReplayArchive":
+        archive = cls(path)
+        if os.path.exists(path):
+            with gzip.open(path, "rt", encoding="utf-8") as file:
+                for line in file:
+                    if line.strip():
+                        archive.add(json.loads(line))
+        return archive
+    
+    def add(self, entry: Dict):
+        self.entries.append(entry)
+        # הקלטה מאוחרת יותר של אותה בקשה דורסת את הקודמת
+        self._by_key[request_key(entry["method"], entry["url"])] = entry
+        self._by_path[request_key(entry["method"], entry["url"], include_host=False)] = entry
+    
+    def add_response(self, method: str, url: str, status: int, headers: Dict[str, str], body: bytes):
+        self.add({
+            "method": method,
+            "url": url,
+            "status": status,
+            "headers": {k.lower(): v for k, v in headers.items() if k.lower() in KEPT_HEADERS},
+            "body": base64.b64encode(body).decode("ascii"),
+        })
+    
+    def lookup(self, method: str, url: str, any_host: bool = False) -> Optional[Dict]:
+        entry = self._by_key.get(request_key(method, url))
+        if entry is None and any_host:
+            entry = self._by_path.get(request_key(method, url, include_host=False))
+        return entry
+    
+    @staticmethod
+    def body(entry: Dict) -> bytes:
+        return base64.b64decode(entry["body"])
+    
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        # רק הגרסה האחרונה של כל בקשה נשמרת
+        with gzip.open(self.path, "wt", encoding="utf-8") as file:
+            for entry in self._by_key.values():
+                file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+    
+    def __len__(self):
+        return len(self._by_key)
+
+
+class ResponseRecorder:
+    """הקלטת תגובות של context לארכיון (document/xhr/fetch של eBay כברירת מחדל)"""
+    
+    def __init__(self, archive: ReplayArchive, url_patterns: List[str] = None, resource_types: List[str] = None):
+        self.archive = archive
+        self.url_patterns = url_patterns or ["*ebay.com*"]
+        self.resource_types = resource_types or ["document", "xhr", "fetch"]
+        self.logger = Logger()
+    
+    def _should_record(self, response) -> bool:
+        request = response.request
+        return (request.resource_type in self.resource_types
+                and any(fnmatch(response.url, pattern) for pattern in self.url_patterns)
+                and not 300 <= response.status < 400)
+    
+    def _on_response(self, response):
+        if not self._should_record(response):
+            return
+        try:
+            self.archive.add_response(response.request.method, response.url, response.status,
+                                      response.headers, response.body())
+        except Exception as e:
+            self.logger.debug(f"Could not record {response.url}: {e}")
+    
+    async def _on_response_async(self, response):
+        if not self._should_record(response):
+            return
+        try:
+            self.archive.add_response(response.request.method, response.url, response.status,
+                                      response.headers, await response.body())
+        except Exception as e:
+            self.logger.debug(f"Could not record {response.url}: {e}")
+    
+    def install(self, context):
+        context.on("response", self._on_response)
+        return self
+    
+    async def install_async(self, context):
+        context.on("response", self._on_response_async)
+        return self
+    
+    def save(self):
+        self.archive.save()
+        self.logger.info(f"Recorded {len(self.archive)} responses to {self.archive.path}")
+
+
+class ReplayRouter:
+    """
+    השמעה דרך route של Playwright: בקשה שנמצאת בארכיון מקבלת את התגובה המוקלטת.
+    strict=True - בקשה שלא נמצאת נחסמת (ריצה offline מלאה)
+    strict=False - ממשיכה ל-route הבא / לרשת
+    """
+    
+    def __init__(self, archive: ReplayArchive, strict: bool = True):
+        self.archive = archive
+        self.strict = strict
+        self.hits = 0
+        self.misses = 0
+    
+    def _lookup(self, request):
+        entry = self.archive.lookup(request.method, request.url)
+        if entry:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return entry
+    
+    def _handle_route(self, route):
+        entry = self._lookup(route.request)
+        if entry:
+            route.fulfill(status=entry["status"], headers=entry["headers"], body=ReplayArchive.body(entry))
+        elif self.strict:
+            route.abort("internetdisconnected")
+        else:
+            route.fallback()
+    
+    async def _handle_route_async(self, route):
+        entry = self._lookup(route.request)
+        if entry:
+            await route.fulfill(status=entry["status"], headers=entry["headers"], body=ReplayArchive.body(entry))
+        elif self.strict:
+            await route.abort("internetdisconnected")
+        else:
+            await route.fallback()
+    
+    def install(self, context):
+        context.route("**/*", self._handle_route)
+        return self
+    
+    async def install_async(self, context):
+        await context.route("**/*", self._handle_route_async)
+        return self
+    
+    def summary(self) -> str:
+        return f"Replay: {self.hits} hits, {self.misses} misses"
+
+
+class ReplayServer:
+    """
+    שרת HTTP מקומי שמגיש את הארכיון (stand-in ל-eBay).
+    כתובות eBay מוחלפות בגוף התגובה בכתובת השרת כך שהניווט נשאר מקומי.
+    """
+    
+    def __init__(self, archive: ReplayArchive, host: str = "127.0.0.1", port: int = 8765,
+                 rewrite_hosts: List[str] = None):
+        self.archive = archive
+        self.rewrite_hosts = rewrite_hosts or DEFAULT_HOSTS
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._thread = None
+    
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def _rewrite(self, body: bytes, content_type: str) -> bytes:
+        if not any(kind in content_type for kind in ("text", "json", "javascript")):
+            return body
+        text = body.decode("utf-8", errors="replace")
+        for host in self.rewrite_hosts:
+            text = text.replace(host, self.base_url)
+        return text.encode("utf-8")
+    
+    def _make_handler(self):
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def _serve(self):
+                entry = server.archive.lookup(self.command, f"http://local{self.path}", any_host=True)
+                if entry is None:
+                    self.send_error(404, "Not recorded")
+                    return
+                content_type = entry["headers"].get("content-type", "")
+                body = server._rewrite(ReplayArchive.body(entry), content_type)
+                self.send_response(entry["status"])
+                for name, value in entry["headers"].items():
+                    self.send_header(name, value)
+                self.send_header("content-length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            do_GET = _serve
+            do_POST = _serve
+            
+            def log_message(self, format, *args):
+                pass
+        
+        return Handler
+    
+    def serve_forever(self):
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            self.stop()
+    
+    def start(self) -> "ReplayServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def replay_mode(replay_config: Dict):
+    """ResponseRecorder / ReplayRouter לפי ebay.replay בקונפיגורציה (None במצב live), עדיין לא מותקן"""
+    mode = replay_config.get("mode", "live")
+    if mode == "live":
+        return None
+    archive = ReplayArchive.load(replay_config["archive"])
+    if mode == "record":
+        return ResponseRecorder(archive)
+    if mode == "replay":
+        return ReplayRouter(archive, strict=replay_config.get("strict", True))
+    raise ValueError(f"Unknown replay mode: {mode}")
+
+
+def install_replay_mode(context, replay_config: Dict):
+    """התקנת record/replay על context סינכרוני לפי ebay.replay בקונפיגורציה"""
+    replay = replay_mode(replay_config)
+    return replay.install(context) if replay else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="eBay record/replay archive tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    serve = commands.add_parser("serve", help="Serve an archive as a local eBay stand-in")
+    serve.add_argument("--archive", required=True)
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    
+    import_html = commands.add_parser("import-html", help="Add a saved HTML page to an archive")
+    import_html.add_argument("--archive", required=True)
+    import_html.add_argument("--url", required=True)
+    import_html.add_argument("--file", required=True)
+    
+    args = parser.parse_args()
+    archive = ReplayArchive.load(args.archive)
+    
+    if args.command == "serve":
+        server = ReplayServer(archive, args.host, args.port)
+        Logger.info(f"Serving {len(archive)} recorded responses on {server.base_url}")
+        server.serve_forever()
+    else:
+        with open(args.file, "rb") as file:
+            archive.add_response("GET", args.url, 200, {"content-type": "text/html; charset=utf-8"}, file.read())
+        archive.save()
+        Logger.info(f"Archive {args.archive} now has {len(archive)} responses")
+
+
+if __name__ == "__main__":
+    main()
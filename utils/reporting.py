@@ -0,0 +1,67 @@
+"""
+Reporting - גישה ל-Allure בטעינה עצלה
+ה-Page Objects מייבאים את המודול הזה במקום allure, כך ש-import של pages (ו-collection של pytest)
+לא טוען את allure. הייבוא האמיתי קורה רק כשצעד או צירוף באמת רצים
+"""
+import contextlib
+import functools
+from typing import Callable
+from utils.helpers import Logger
+
+
+_allure = None
+
+
+def _module():
+    global _allure
+    if _allure is None:
+        import allure
+        _allure = allure
+    return _allure
+
+
+class step:
+    """כמו allure.step - גם דקורטור וגם context manager. title יכול להכיל {param} כמו ב-allure"""
+
+    def __init__(self, title: str):
+        self.title = title
+        self._context = None
+
+    def __call__(self, func: Callable) -> Callable:
+        title = self.title
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return _module().step(title)(func)(*args, **kwargs)
+        return wrapper
+
+    def __enter__(self):
+        self._context = _module().step(self.title)
+        return self._context.__enter__()
+
+    def __exit__(self, *exc):
+        return self._context.__exit__(*exc)
+
+
+@contextlib.contextmanager
+def task_step(title: str):
+    """
+    צעד של pages_async. Allure מחזיק את מחסנית הצעדים לכל thread, ו-tasks מקבילים (asyncio.gather)
+    באותו thread היו מקננים צעדים זה בתוך זה - לכן הצעד רק נרשם ללוג. הפירוט לכל task נשמר
+    ב-spans של tracer (ContextVar לכל task)
+    """
+    Logger.debug(f"Step: {title}")
+    yield
+
+
+def _attachment_type(kind: str):
+    """"png" / "jpg" / "text" / "json" -> allure.attachment_type"""
+    return getattr(_module().attachment_type, kind.upper())
+
+
+def attach(body, name: str, kind: str = "text"):
+    _module().attach(body, name=name, attachment_type=_attachment_type(kind))
+
+
+def attach_file(path: str, name: str, kind: str = "png"):
+    _module().attach.file(path, name=name, attachment_type=_attachment_type(kind))
@@ -0,0 +1,55 @@
+"""
+Scenario Catalog - קריאת קטלוג תרחישי ה-data driven (JSON או JSON lines)
+ה-cache היחיד הוא ה-DB של ScenarioStore (utils/scenario_store.py), שנבנה מחדש רק כשהקובץ משתנה
+"""
+import json
+import os
+from typing import Any, Dict, Iterator, List
+
+from utils.helpers import ConfigReader
+
+
+CACHE_DIR = ".cache/scenarios"
+DEFAULT_CATALOG = "test_data/search_data.json"
+
+
+def catalog_path() -> str:
+    """הקטלוג הפעיל - ניתן להחלפה עם SEARCH_DATA_PATH (למשל קטלוג מחולל גדול)"""
+    return os.environ.get("SEARCH_DATA_PATH", DEFAULT_CATALOG)
+
+
+def iter_catalog(path: str, key: str = "test_scenarios") -> Iterator[Dict[str, Any]]:
+    """
+    תרחישים מהקטלוג אחד אחד: JSON lines (.jsonl) נקרא בסטרימינג - תרחיש בשורה,
+    JSON רגיל ({key: [...]}) נטען כולו
+    """
+    if path.endswith(".jsonl"):
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        yield from ConfigReader.read_json(path)[key]
+
+
+def catalog_signature(path: str) -> tuple:
+    """(mtime, גודל) - משתנה בכל שמירה של הקובץ"""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load_scenarios(path: str = None, key: str = "test_scenarios", cache_dir: str = CACHE_DIR) -> List[Dict[str, Any]]:
+    """כל התרחישים מהקטלוג, לפי הסדר - דרך ה-DB של ScenarioStore"""
+    # ScenarioStore מייבא מהמודול הזה
+    from utils.scenario_store import ScenarioStore
+    
+    store = ScenarioStore.open(path, key, cache_dir)
+    try:
+        return list(store.select())
+    finally:
+        store.close()
+
+
+def scenario_id(scenario: Dict[str, Any]) -> str:
+    """מזהה קריא לטסט (במקום test_data0, test_data1, ...) - מאפשר בחירה עם -k"""
+    return scenario.get("test_name") or f"{scenario['search_query']}-{scenario['max_price']}"
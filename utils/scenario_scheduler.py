@@ -0,0 +1,174 @@
+"""
+Scenario Scheduler - חלוקת טסטים ל-workers של pytest-xdist לפי משך היסטורי (הארוך ראשון)
+ו-pool של contexts חמים שממוחזרים בין טסטים במקום להיסגר.
+"""
+import json
+import os
+import tempfile
+from typing import Callable, Dict, List
+from utils.helpers import Logger
+
+
+class DurationStore:
+    """משך ריצה היסטורי לכל טסט (nodeid), ממוצע נע כדי לא להגיב יותר מדי לריצה חריגה"""
+    
+    def __init__(self, path: str, smoothing: float = 0.5):
+        self.path = path
+        self.smoothing = smoothing
+        self.durations: Dict[str, float] = {}
+        self._current: Dict[str, float] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as file:
+                    self.durations = json.load(file)
+            except (OSError, ValueError):
+                self.durations = {}
+    
+    def add(self, nodeid: str, duration: float):
+        """setup + call + teardown של אותו טסט מצטברים"""
+        self._current[nodeid] = self._current.get(nodeid, 0.0) + duration
+    
+    def estimate(self, nodeid: str) -> float:
+        """משך משוער - לטסט חדש: ממוצע של המוכרים (או 0 אם אין היסטוריה)"""
+        if nodeid in self.durations:
+            return self.durations[nodeid]
+        if self.durations:
+            return sum(self.durations.values()) / len(self.durations)
+        return 0.0
+    
+    def save(self):
+        for nodeid, duration in self._current.items():
+            previous = self.durations.get(nodeid)
+            self.durations[nodeid] = duration if previous is None else (
+                self.smoothing * duration + (1 - self.smoothing) * previous)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path) or ".", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(self.durations, file, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def make_longest_first_scheduling(config, log, store: DurationStore):
+    """
+    LoadScheduling של xdist שמסדר את התור מהארוך לקצר (LPT greedy) - כל שאר ההתנהגות של xdist,
+    כולל --maxschedchunk. עם --maxschedchunk 1 כל worker שמתפנה מקבל את הארוך ביותר שנשאר.
+    """
+    from xdist.scheduler import LoadScheduling
+    
+    class LongestFirstScheduling(LoadScheduling):
+        
+        def _send_tests(self, node, num):
+            # השליחה הראשונה קורית אחרי ש-schedule בנה את התור - ממיינים אותו פעם אחת
+            if not getattr(self, "_ordered", False):
+                self.pending.sort(key=lambda index: store.estimate(self.collection[index]), reverse=True)
+                self._ordered = True
+            super()._send_tests(node, num)
+    
+    return LongestFirstScheduling(config, log)
+
+
+class ScenarioSchedulerPlugin:
+    """plugin של pytest: מודד משכים בצד ה-controller ומספק את ה-scheduler ל-xdist (רק בריצה עם -n)"""
+    
+    def __init__(self, durations_path: str):
+        self.store = DurationStore(durations_path)
+    
+    def pytest_runtest_logreport(self, report):
+        self.store.add(report.nodeid, report.duration)
+    
+    def pytest_xdist_make_scheduler(self, config, log):
+        # רק במצב --dist load; שאר המצבים נשארים של xdist
+        if config.getoption("dist") != "load":
+            return None
+        return make_longest_first_scheduling(config, log, self.store)
+    
+    def pytest_sessionfinish(self, session):
+        # נרשם רק ב-controller (ראו conftest) - ה-workers לא כותבים לקובץ
+        self.store.save()
+
+
+# מחיקת localStorage של ה-origin והחזרת הערכים מה-state ההתחלתי
+RESET_STORAGE_SCRIPT = """
+(items) => {
+    localStorage.clear();
+    sessionStorage.clear();
+    for (const {name, value} of items) localStorage.setItem(name, value);
+}
+"""
+
+
+class ContextPool:
+    """
+    BrowserContext חם אחד לכל worker - worker מריץ טסט אחד בכל פעם, כך שאין צורך ביותר.
+    release מנקה את ה-context: סוגר דפים (sessionStorage נעלם איתם), מחזיר cookies
+    ו-localStorage למצב ההתחלתי ושומר אותו לטסט הבא.
+    """
+    
+    def __init__(self, factory: Callable):
+        self.factory = factory
+        self._idle = None
+        self._initial_state: Dict[int, Dict] = {}
+        self.created = 0
+        self.reused = 0
+        self.logger = Logger()
+    
+    def acquire(self):
+        if self._idle is not None:
+            self.reused += 1
+            context, self._idle = self._idle, None
+            return context
+        context = self.factory()
+        self.created += 1
+        self._initial_state[id(context)] = context.storage_state()
+        return context
+    
+    def release(self, context):
+        initial = self._initial_state.get(id(context), {})
+        try:
+            for page in context.pages:
+                page.close()
+            context.clear_cookies()
+            if initial.get("cookies"):
+                context.add_cookies(initial["cookies"])
+            self._reset_local_storage(context, initial.get("origins", []))
+        except Exception as e:
+            self.logger.error(f"Could not recycle context, closing it: {e}")
+            self._discard(context)
+            return
+        
+        if self._idle is None:
+            self._idle = context
+        else:
+            self._discard(context)
+    
+    @staticmethod
+    def _reset_local_storage(context, initial_origins: List[Dict]):
+        """כל origin שה-localStorage שלו השתנה נטען בדף ריק (route מקומי, בלי רשת) ומאופס"""
+        initial = {origin["origin"]: origin.get("localStorage", []) for origin in initial_origins}
+        current = {origin["origin"]: origin.get("localStorage", [])
+                   for origin in context.storage_state().get("origins", [])}
+        changed = [origin for origin in {**initial, **current} if current.get(origin, []) != initial.get(origin, [])]
+        if not changed:
+            return
+        
+        page = context.new_page()
+        try:
+            page.route("**/*", lambda route: route.fulfill(status=200, content_type="text/html", body=""))
+            for origin in changed:
+                page.goto(origin)
+                page.evaluate(RESET_STORAGE_SCRIPT, initial.get(origin, []))
+        finally:
+            page.close()
+    
+    def _discard(self, context):
+        self._initial_state.pop(id(context), None)
+        try:
+            context.close()
+        except Exception:
+            pass
+    
+    def close_all(self):
+        if self._idle is not None:
+            self._discard(self._idle)
+            self._idle = None
+        self.logger.info(f"Context pool: {self.created} created, {self.reused} reused")
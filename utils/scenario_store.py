@@ -0,0 +1,229 @@
+"""
+Scenario Store - קטלוג תרחישים ב-SQLite עם אינדקסים על tags, שאילתה ורצועת מחיר
+הקטלוג (JSON או JSON lines) נטען בסטרימינג ל-DB תחת .cache/scenarios, ונבנה מחדש רק כשהקובץ משתנה.
+כך pytest בוחר תת-קבוצה ("electronics עד $100") בלי לפענח את כל הקטלוג.
+
+הרצה (מתיקיית הפרויקט):
+    python -m utils.scenario_store generate --queries shoes laptop --prices 50 100 220 --limits 1 5 \
+        --tag laptop=electronics --output test_data/generated.jsonl
+    python -m utils.scenario_store query --catalog test_data/generated.jsonl --tag electronics --max-price 100
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import sqlite3
+import tempfile
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from utils.scenario_catalog import CACHE_DIR, catalog_path, catalog_signature, iter_catalog
+
+
+# גבולות רצועות המחיר - max_price נכנס לרצועה הראשונה שהגבול שלה >= המחיר
+PRICE_BANDS = [50, 100, 250, 500, 1000]
+INSERT_BATCH = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS scenarios (
+    id INTEGER PRIMARY KEY,
+    test_name TEXT,
+    search_query TEXT,
+    max_price REAL,
+    price_band TEXT,
+    items_limit INTEGER,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS scenario_tags (tag TEXT NOT NULL, scenario_id INTEGER NOT NULL);
+"""
+# האינדקסים נבנים אחרי הטעינה - מהיר יותר מעדכון שלהם בכל insert
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_scenarios_query ON scenarios (search_query);
+CREATE INDEX IF NOT EXISTS idx_scenarios_price ON scenarios (max_price);
+CREATE INDEX IF NOT EXISTS idx_scenarios_band ON scenarios (price_band);
+CREATE INDEX IF NOT EXISTS idx_tags_tag ON scenario_tags (tag, scenario_id);
+"""
+
+
+def price_band(max_price: float) -> str:
+    """"0-50", "50-100", ..., "1000+" """
+    lower = 0
+    for upper in PRICE_BANDS:
+        if max_price <= upper:
+            return f"{lower}-{upper}"
+        lower = upper
+    return f"{lower}+"
+
+
+class ScenarioStore:
+    """
+    שימוש:
+        store = ScenarioStore.open("test_data/search_data.json")
+        for scenario in store.select(tags=["electronics"], max_price=100):
+            ...
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path)
+
+    @classmethod
+    def open(cls, path: str = None, key: str = "test_scenarios", cache_dir: str = CACHE_DIR) -> "ScenarioStore":
+        """ה-DB של הקטלוג - נבנה מחדש אם הקטלוג השתנה מאז הבנייה האחרונה"""
+        path = path or catalog_path()
+        signature = json.dumps(list(catalog_signature(path)))
+        name = hashlib.sha1(f"{os.path.abspath(path)}::{key}".encode("utf-8")).hexdigest()[:16]
+        db_path = os.path.join(cache_dir, f"{name}.sqlite")
+
+        if os.path.exists(db_path):
+            store = cls(db_path)
+            if store._meta("signature") == signature:
+                return store
+            store.close()
+
+        # בנייה לקובץ זמני והחלפה אטומית - כמה workers של xdist יכולים לבנות במקביל
+        os.makedirs(cache_dir, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=cache_dir, suffix=".sqlite.tmp")
+        os.close(handle)
+        builder = cls(temp_path)
+        builder.load(iter_catalog(path, key))
+        builder.connection.execute("INSERT OR REPLACE INTO meta VALUES ('signature', ?)", (signature,))
+        builder.connection.commit()
+        builder.close()
+        os.replace(temp_path, db_path)
+        return cls(db_path)
+
+    def _meta(self, key: str) -> Optional[str]:
+        try:
+            row = self.connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        except sqlite3.DatabaseError:
+            return None
+        return row[0] if row else None
+
+    def load(self, scenarios: Iterable[Dict[str, Any]]):
+        """טעינה בסטרימינג, ב-batches של INSERT_BATCH"""
+        self.connection.executescript(SCHEMA)
+        rows = ((scenario.get("test_name"), scenario.get("search_query"), scenario.get("max_price"),
+                 price_band(scenario.get("max_price") or 0), scenario.get("items_limit"),
+                 json.dumps(scenario, ensure_ascii=False), scenario.get("tags", []))
+                for scenario in scenarios)
+        next_id = 1
+        while True:
+            batch = list(itertools.islice(rows, INSERT_BATCH))
+            if not batch:
+                break
+            self.connection.executemany(
+                "INSERT INTO scenarios (id, test_name, search_query, max_price, price_band, items_limit, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((next_id + offset,) + row[:6] for offset, row in enumerate(batch)))
+            self.connection.executemany(
+                "INSERT INTO scenario_tags (tag, scenario_id) VALUES (?, ?)",
+                ((tag, next_id + offset) for offset, row in enumerate(batch) for tag in row[6]))
+            next_id += len(batch)
+        self.connection.executescript(INDEXES)
+        self.connection.commit()
+
+    def select(self, tags: Sequence[str] = (), query: str = None, max_price: float = None,
+               min_price: float = None, band: str = None, limit: int = None) -> Iterator[Dict[str, Any]]:
+        """תרחישים שעומדים בכל התנאים (כל ה-tags חייבים להופיע), לפי סדר הקטלוג"""
+        sql = ["SELECT data FROM scenarios WHERE 1 = 1"]
+        params: List[Any] = []
+        for tag in tags:
+            sql.append("AND id IN (SELECT scenario_id FROM scenario_tags WHERE tag = ?)")
+            params.append(tag)
+        if query is not None:
+            sql.append("AND search_query = ?")
+            params.append(query)
+        if max_price is not None:
+            sql.append("AND max_price <= ?")
+            params.append(max_price)
+        if min_price is not None:
+            sql.append("AND max_price >= ?")
+            params.append(min_price)
+        if band is not None:
+            sql.append("AND price_band = ?")
+            params.append(band)
+        sql.append("ORDER BY id")
+        if limit is not None:
+            sql.append("LIMIT ?")
+            params.append(limit)
+
+        for (data,) in self.connection.execute(" ".join(sql), params):
+            yield json.loads(data)
+
+    def count(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM scenarios").fetchone()[0]
+
+    def tags(self) -> Dict[str, int]:
+        """tag -> מספר תרחישים"""
+        return dict(self.connection.execute(
+            "SELECT tag, COUNT(*) FROM scenario_tags GROUP BY tag ORDER BY tag"))
+
+    def close(self):
+        self.connection.close()
+
+
+def generate_scenarios(queries: Sequence[str], prices: Sequence[float], limits: Sequence[int],
+                       tags_by_query: Dict[str, List[str]] = None) -> Iterator[Dict[str, Any]]:
+    """כל הצירופים של שאילתה x מחיר x כמות, כ-generator (לא מחזיק את כולם בזיכרון)"""
+    tags_by_query = tags_by_query or {}
+    for query, max_price, limit in itertools.product(queries, prices, limits):
+        yield {
+            "test_name": f"search_{query.replace(' ', '_')}_under_{max_price:g}_x{limit}",
+            "search_query": query,
+            "max_price": max_price,
+            "items_limit": limit,
+            "tags": tags_by_query.get(query, []),
+            "description": f"Search for {query} under ${max_price:g}, {limit} items",
+        }
+
+
+def write_jsonl(scenarios: Iterable[Dict[str, Any]], path: str) -> int:
+    count = 0
+    with open(path, "w", encoding="utf-8") as file:
+        for scenario in scenarios:
+            file.write(json.dumps(scenario, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scenario catalog tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate", help="write a combinatorial catalog as JSON lines")
+    generate.add_argument("--queries", nargs="+", required=True)
+    generate.add_argument("--prices", nargs="+", type=float, required=True)
+    generate.add_argument("--limits", nargs="+", type=int, default=[5])
+    generate.add_argument("--tag", action="append", default=[], help="query=tag1,tag2")
+    generate.add_argument("--output", required=True)
+
+    query = commands.add_parser("query", help="list scenarios matching filters")
+    query.add_argument("--catalog", default=None)
+    query.add_argument("--tag", action="append", default=[])
+    query.add_argument("--query", dest="search_query")
+    query.add_argument("--max-price", type=float)
+    query.add_argument("--band")
+    query.add_argument("--limit", type=int)
+
+    args = parser.parse_args()
+    if args.command == "generate":
+        tags_by_query = {}
+        for entry in args.tag:
+            name, _, tags = entry.partition("=")
+            tags_by_query[name] = [tag for tag in tags.split(",") if tag]
+        count = write_jsonl(generate_scenarios(args.queries, args.prices, args.limits, tags_by_query), args.output)
+        print(f"Wrote {count} scenarios to {args.output}")
+    else:
+        store = ScenarioStore.open(args.catalog)
+        matches = 0
+        for scenario in store.select(args.tag, args.search_query, args.max_price, band=args.band, limit=args.limit):
+            print(json.dumps(scenario, ensure_ascii=False))
+            matches += 1
+        print(f"{matches} of {store.count()} scenarios matched")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Search Items - רשומה קומפקטית לפריט שנמצא בחיפוש ואוסף עם הסרת כפילויות לפי מזהה eBay
+"""
+import json
+import re
+from typing import Any, Dict, Iterator, List, Optional, Union
+from urllib.parse import urlsplit
+
+
+# /itm/123456789012 או /itm/some-title-slug/123456789012
+ITEM_ID_PATTERN = re.compile(r"/itm/(?:[^/?#]+/)?(\d{9,15})(?:[/?#]|$)")
+
+
+def canonical_item_id(url: str) -> str:
+    """
+    מזהה קנוני של פריט: מספר הפריט של eBay אם קיים ב-URL,
+    אחרת ה-URL בלי query/fragment (פרמטרי מעקב כמו hash=, _trkparms=)
+    """
+    match = ITEM_ID_PATTERN.search(url)
+    if match:
+        return match.group(1)
+    parts = urlsplit(url)
+    return f"{parts.netloc}{parts.path}".rstrip("/")
+
+
+class SearchItem:
+    """פריט שעבר את בדיקת המחיר - __slots__ כדי שריצות גדולות לא יחזיקו dict לכל פריט"""
+
+    __slots__ = ("url", "item_id", "title", "price", "page_number", "position", "query")
+
+    def __init__(self, url: str, title: str, price: float, page_number: int, position: int = 0,
+                 query: Optional[str] = None, item_id: Optional[str] = None):
+        self.url = url
+        self.item_id = item_id or canonical_item_id(url)
+        self.title = title
+        self.price = price
+        self.page_number = page_number
+        self.position = position
+        self.query = query
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SearchItem":
+        return cls(**{name: data.get(name) for name in cls.__slots__ if name in data})
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, SearchItem) and self.to_dict() == other.to_dict()
+
+    def __hash__(self) -> int:
+        # פריטים שווים תמיד עם אותו item_id - אפשר לשים ב-set / כמפתח ב-dict
+        return hash(self.item_id)
+
+    def __repr__(self) -> str:
+        return f"SearchItem({self.item_id}, ${self.price}, page {self.page_number}#{self.position})"
+
+
+class SearchItemCollection:
+    """
+    אוסף פריטים לפי סדר ההוספה, עם בדיקת כפילות ב-O(1) לפי item_id.
+    שמירה/טעינה כ-JSON lines - רשומה בשורה, לניתוח אחרי הריצה
+    """
+
+    def __init__(self, items: Optional[List[SearchItem]] = None):
+        self._items: List[SearchItem] = []
+        self._ids = set()
+        for item in items or []:
+            self.add(item)
+
+    def add(self, item: SearchItem) -> bool:
+        """מוסיף את הפריט אם עוד לא קיים. מחזיר False על כפילות"""
+        if item.item_id in self._ids:
+            return False
+        self._ids.add(item.item_id)
+        self._items.append(item)
+        return True
+
+    def __contains__(self, item: Union[SearchItem, str]) -> bool:
+        """בדיקה לפי פריט או לפי URL גולמי"""
+        item_id = item.item_id if isinstance(item, SearchItem) else canonical_item_id(item)
+        return item_id in self._ids
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[SearchItem]:
+        return iter(self._items)
+
+    def urls(self) -> List[str]:
+        return [item.url for item in self._items]
+
+    def to_jsonl(self, path: str, append: bool = False):
+        with open(path, "a" if append else "w", encoding="utf-8") as file:
+            for item in self._items:
+                file.write(json.dumps(item.to_dict(), ensure_ascii=False) + "\n")
+
+    @classmethod
+    def from_jsonl(cls, path: str) -> "SearchItemCollection":
+        collection = cls()
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    collection.add(SearchItem.from_dict(json.loads(line)))
+        return collection
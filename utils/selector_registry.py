@@ -0,0 +1,107 @@
+"""
+Selector Registry - בחירת סלקטור מתוך כמה חלופות, עם זיכרון של מה שעבד
+החלופה שהתאימה בפעם הקודמת נבדקת ראשונה; השאר רק במקרה של החטאה.
+ה-cache נשמר לדיסק כך שגם הריצה הבאה מתחילה מהחלופה המנצחת.
+"""
+import json
+import os
+import tempfile
+from collections import defaultdict
+from typing import Dict, List, Optional
+from utils.helpers import Logger
+
+
+def compile_selector(selector: str) -> str:
+    """המרה חד-פעמית לסינטקס של Playwright (XPath מקבל prefix)"""
+    if selector.startswith("//") or selector.startswith("(//"):
+        return f"xpath={selector}"
+    return selector
+
+
+class SelectorRegistry:
+    
+    def __init__(self, cache_path: str = None):
+        self.cache_path = cache_path
+        self._alternatives: Dict[str, List[str]] = {}
+        self._compiled: Dict[str, List[str]] = {}
+        self._preferred: Dict[str, str] = {}
+        # רק שינוי של חלופה מועדפת מצדיק כתיבה של ה-cache
+        self._changed = False
+        self.stats = defaultdict(lambda: {"hits": 0, "misses": 0, "not_found": 0})
+        self.logger = Logger()
+        if cache_path:
+            self.load()
+    
+    def configure(self, cache_path: str):
+        """הגדרת קובץ ה-cache וטעינה שלו (ל-registry המשותף)"""
+        self.cache_path = cache_path
+        self.load()
+    
+    def register(self, name: str, alternatives: List[str]):
+        """רישום חלופות לאלמנט לוגי (פעם אחת - קריאות חוזרות לא משנות)"""
+        if name not in self._alternatives:
+            self._alternatives[name] = list(alternatives)
+            self._compiled[name] = [compile_selector(selector) for selector in alternatives]
+    
+    def ordered(self, name: str) -> List[str]:
+        """החלופות לפי סדר ניסיון - המנצחת האחרונה קודם"""
+        alternatives = self._alternatives[name]
+        preferred = self._preferred.get(name)
+        if preferred in alternatives:
+            return [preferred] + [selector for selector in alternatives if selector != preferred]
+        return list(alternatives)
+    
+    def record(self, name: str, selector: Optional[str]):
+        """עדכון ה-cache לפי החלופה שהתאימה בפועל (None = אף אחת)"""
+        if selector is None:
+            self.stats[name]["not_found"] += 1
+            return
+        if self.ordered(name)[0] == selector:
+            self.stats[name]["hits"] += 1
+        else:
+            self.stats[name]["misses"] += 1
+            self._preferred[name] = selector
+            self._changed = True
+    
+    def resolve(self, page, name: str) -> Optional[str]:
+        """החלופה הראשונה שיש לה התאמה בדף (selector בסינטקס של Playwright), או None"""
+        compiled = dict(zip(self._alternatives[name], self._compiled[name]))
+        for selector in self.ordered(name):
+            try:
+                if page.locator(compiled[selector]).count() > 0:
+                    self.record(name, selector)
+                    return compiled[selector]
+            except Exception:
+                continue
+        self.record(name, None)
+        return None
+    
+    def load(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as file:
+                self._preferred.update(json.load(file).get("preferred", {}))
+        except (OSError, ValueError) as e:
+            self.logger.error(f"Ignoring broken selector cache {self.cache_path}: {e}")
+    
+    def save(self):
+        """כתיבה אטומית (temp + replace) - בטוח גם כשכמה workers כותבים. בלי שינויים - לא נכתב"""
+        if not self.cache_path or not self._changed:
+            return
+        directory = os.path.dirname(self.cache_path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump({"preferred": self._preferred}, file, indent=2)
+        os.replace(tmp_path, self.cache_path)
+        self._changed = False
+    
+    def summary(self) -> str:
+        lines = [f"{name}: {counts['hits']} hits, {counts['misses']} misses, {counts['not_found']} not found"
+                 for name, counts in sorted(self.stats.items())]
+        return "Selector cache - " + ("; ".join(lines) if lines else "no lookups")
+
+
+# registry משותף לכל ה-Page Objects בסשן (conftest מגדיר cache_path ושומר בסוף)
+selector_registry = SelectorRegistry()
@@ -0,0 +1,137 @@
+"""
+Storage State Cache - שמירת cookies ו-localStorage לדיסק ושימוש חוזר בין סשנים ו-workers
+bootstrap חד-פעמי (cookie consent וכו'), ואחריו כל context חדש נטען מהקובץ.
+"""
+import json
+import os
+import time
+from typing import Callable, Dict, Any
+from utils.helpers import Logger
+
+
+class FileLock:
+    """
+    נעילה בין תהליכים באמצעות קובץ (O_EXCL) - עובד גם ב-Windows וגם ב-Linux.
+    נעילה ישנה מ-stale_after שניות נחשבת נטושה (worker שקרס) ונמחקת.
+    """
+    
+    def __init__(self, path: str, timeout: float = 120, stale_after: float = 300):
+        self.path = path
+        self.timeout = timeout
+        self.stale_after = stale_after
+        self._fd = None
+    
+    def acquire(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                self._fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(self._fd, str(os.getpid()).encode())
+                return
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(self.path) > self.stale_after:
+                        os.remove(self.path)
+                        continue
+                except FileNotFoundError:
+                    continue
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Could not acquire lock {self.path} within {self.timeout}s")
+                time.sleep(0.2)
+    
+    def release(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+    
+    def __enter__(self):
+        self.acquire()
+        return self
+    
+    def __exit__(self, *exc):
+        self.release()
+
+
+class StorageStateCache:
+    """קובץ storage state לכל שילוב של locale + account, עם בדיקת תפוגה"""
+    
+    def __init__(self, directory: str = ".cache/storage_state", locale: str = "en-US",
+                 account: str = "guest", max_age_hours: float = 12):
+        self.directory = directory
+        self.locale = locale
+        self.account = account
+        self.max_age = max_age_hours * 3600
+        self.logger = Logger()
+    
+    @property
+    def path(self) -> str:
+        safe_account = "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in self.account)
+        return os.path.join(self.directory, f"{self.locale}__{safe_account}.json")
+    
+    def is_fresh(self) -> bool:
+        """הקובץ קיים, לא ישן מ-max_age ויש בו לפחות cookie אחד שעדיין בתוקף"""
+        if not os.path.exists(self.path):
+            return False
+        if time.time() - os.path.getmtime(self.path) > self.max_age:
+            return False
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                state = json.load(file)
+        except (OSError, ValueError):
+            return False
+        now = time.time()
+        # expires == -1 הוא cookie של session - נחשב בתוקף
+        return any(cookie.get("expires", -1) == -1 or cookie["expires"] > now
+                   for cookie in state.get("cookies", []))
+    
+    def get_or_create(self, browser, context_args: Dict[str, Any], bootstrap: Callable) -> str:
+        """
+        מחזיר נתיב לקובץ state תקף. אם אין - רק worker אחד מריץ bootstrap
+        (תחת נעילה), והשאר מחכים ומשתמשים בתוצאה.
+        """
+        if self.is_fresh():
+            return self.path
+        
+        os.makedirs(self.directory, exist_ok=True)
+        with FileLock(self.path + ".lock"):
+            # אולי worker אחר יצר את הקובץ בזמן שחיכינו לנעילה
+            if self.is_fresh():
+                return self.path
+            
+            self.logger.info(f"Bootstrapping storage state: {self.path}")
+            context = browser.new_context(**context_args)
+            try:
+                bootstrap(context)
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                context.storage_state(path=tmp_path)
+                os.replace(tmp_path, self.path)
+            finally:
+                context.close()
+        
+        return self.path
+    
+    async def get_or_create_async(self, browser, context_args: Dict[str, Any], bootstrap: Callable) -> str:
+        """כמו get_or_create, עם Browser ו-bootstrap של async_api"""
+        if self.is_fresh():
+            return self.path
+        
+        os.makedirs(self.directory, exist_ok=True)
+        with FileLock(self.path + ".lock"):
+            if self.is_fresh():
+                return self.path
+            
+            self.logger.info(f"Bootstrapping storage state: {self.path}")
+            context = await browser.new_context(**context_args)
+            try:
+                await bootstrap(context)
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                await context.storage_state(path=tmp_path)
+                os.replace(tmp_path, self.path)
+            finally:
+                await context.close()
+        
+        return self.path
@@ -0,0 +1,229 @@
+"""
+Timeout Budget - תקציב זמן לכל טסט ולכל צעד, ו-timeout לכל קריאה שנגזר ממה שנשאר
+ערכי הבסיס מגיעים מ-timeout.* בקונפיגורציה. קריאה לא מקבלת יותר זמן ממה שנשאר לצעד/לטסט,
+אלמנט שכבר לא נמצא פעם מקבל המתנה קצרה (absent), וניווטים נכשלים מנוסים שוב עם backoff
+(test_settings.max_retries). לכל טסט נאסף כמה זמן הלך על המתנות
+"""
+import asyncio
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from utils.helpers import Logger
+
+
+class TimeoutBudgetExceeded(TimeoutError):
+    """התקציב של הצעד או של הטסט נגמר - אין טעם לחכות לקריאה הבאה"""
+
+
+@dataclass
+class WaitStats:
+    """זמני ההמתנה של טסט אחד"""
+    calls: int = 0
+    waited: float = 0.0
+    timeouts: int = 0
+    fast_fails: int = 0
+    retries: int = 0
+    by_kind: Dict[str, float] = field(default_factory=dict)
+
+    def summary(self) -> str:
+        kinds = ", ".join(f"{kind} {seconds:.1f}s" for kind, seconds in
+                          sorted(self.by_kind.items(), key=lambda entry: -entry[1]))
+        return (f"Waits: {self.calls} calls, {self.waited:.1f}s waiting, {self.timeouts} timed out, "
+                f"{self.fast_fails} fast-failed, {self.retries} retries" + (f" ({kinds})" if kinds else ""))
+
+
+class RetryPolicy:
+    """ניסיון חוזר עם backoff אקספוננציאלי (עם jitter), כל עוד נשאר תקציב להמתנה"""
+
+    def __init__(self, max_retries: int = 2, backoff_ms: float = 500, multiplier: float = 2.0,
+                 max_backoff_ms: float = 5000, budget: "TimeoutBudget" = None):
+        self.max_retries = max(0, max_retries)
+        self.backoff_ms = backoff_ms
+        self.multiplier = multiplier
+        self.max_backoff_ms = max_backoff_ms
+        self.budget = budget
+
+    def delay_ms(self, attempt: int) -> float:
+        """ההמתנה לפני ניסיון מספר attempt + 1 (attempt מתחיל ב-0)"""
+        delay = min(self.backoff_ms * self.multiplier ** attempt, self.max_backoff_ms)
+        return delay * random.uniform(0.9, 1.1)
+
+    def _next_delay(self, attempt: int, error: Exception, description: str) -> Optional[float]:
+        """שניות עד הניסיון הבא, או None אם לא מנסים שוב"""
+        if attempt >= self.max_retries or isinstance(error, (TimeoutBudgetExceeded, AssertionError)):
+            return None
+        delay = self.delay_ms(attempt)
+        remaining = self.budget.remaining_ms() if self.budget else None
+        if remaining is not None and remaining <= delay:
+            return None
+        if self.budget:
+            self.budget.stats.retries += 1
+        Logger.info(f"Retrying {description} in {delay:.0f}ms ({attempt + 1}/{self.max_retries}): {error}")
+        return delay / 1000
+
+    def run(self, action: Callable, description: str = "action", sleep: Callable = time.sleep):
+        attempt = 0
+        while True:
+            try:
+                return action()
+            except Exception as e:
+                delay = self._next_delay(attempt, e, description)
+                if delay is None:
+                    raise
+            sleep(delay)
+            attempt += 1
+
+    async def run_async(self, action: Callable, description: str = "action"):
+        attempt = 0
+        while True:
+            try:
+                return await action()
+            except Exception as e:
+                delay = self._next_delay(attempt, e, description)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+@dataclass
+class _TestState:
+    """מה שנאסף בטסט אחד (או אצל משתמש וירטואלי אחד): זמני המתנה ואלמנטים שלא נמצאו"""
+    stats: WaitStats = field(default_factory=WaitStats)
+    absent: Dict[str, int] = field(default_factory=dict)
+
+
+# deadlines פעילים (monotonic, בשניות) ומצב הטסט - ContextVar כדי שמשימות asyncio מקבילות לא יתערבבו
+_deadlines: ContextVar[Tuple[Tuple[str, float], ...]] = ContextVar("timeout_deadlines", default=())
+_test_state: ContextVar[Optional[_TestState]] = ContextVar("timeout_test_state", default=None)
+
+
+class TimeoutBudget:
+    """
+    הגדרות (timeout.* בקונפיגורציה, במילישניות):
+        default     - קריאה רגילה (click, wait_for, inner_text...)
+        navigation  - goto
+        probe       - בדיקה של אלמנט אופציונלי (is_visible, מחיר של פריט בתוצאות)
+        absent      - המתנה לאלמנט שכבר לא נמצא פעם באותו Page Object ובאותו URL (באותו טסט)
+        min_call    - timeout מינימלי לקריאה (0 ב-Playwright = בלי הגבלה)
+        test_budget - תקציב לטסט שלם (0 = ללא)
+        steps       - תקציב לצעד לפי שם (search / add_to_cart / cart)
+    """
+
+    DEFAULTS: Dict[str, Any] = {"default": 30000, "navigation": 30000, "probe": 2000, "absent": 1000,
+                                "min_call": 250, "test_budget": 0, "retry_backoff": 500,
+                                "retry_backoff_max": 5000, "steps": {}}
+
+    def __init__(self):
+        self.settings: Dict[str, Any] = dict(self.DEFAULTS)
+        self.retry = RetryPolicy(budget=self)
+        self._idle = _TestState()  # קריאות מחוץ לטסט
+
+    def configure(self, settings: Dict[str, Any] = None, max_retries: int = None):
+        self.settings = {**self.DEFAULTS, **(settings or {})}
+        self.retry = RetryPolicy(max_retries=self.retry.max_retries if max_retries is None else max_retries,
+                                 backoff_ms=self.settings["retry_backoff"],
+                                 max_backoff_ms=self.settings["retry_backoff_max"], budget=self)
+
+    def _state(self) -> _TestState:
+        return _test_state.get() or self._idle
+
+    @property
+    def stats(self) -> WaitStats:
+        """הסטטיסטיקה של הטסט ב-context הנוכחי"""
+        return self._state().stats
+
+    def begin_test(self, budget_ms: float = None):
+        """
+        תחילת טסט: סטטיסטיקה חדשה, בלי אלמנטים "חסרים" מטסטים קודמים, ו-deadline לפי test_budget.
+        המצב נשמר ב-context הנוכחי - משימת asyncio שקוראת ל-begin_test מקבלת מצב משלה
+        """
+        budget_ms = self.settings["test_budget"] if budget_ms is None else budget_ms
+        _test_state.set(_TestState())
+        _deadlines.set((("test", time.monotonic() + budget_ms / 1000),) if budget_ms else ())
+
+    def end_test(self) -> WaitStats:
+        stats = self.stats
+        _test_state.set(None)
+        _deadlines.set(())
+        return stats
+
+    @contextmanager
+    def step(self, name: str, budget_ms: float = None):
+        """
+        צעד עם תקציב משלו (ברירת מחדל: steps.<name> בקונפיגורציה). ה-deadline הוא המוקדם
+        מבין הצעד והטסט, כך שצעד לא יכול "ללוות" זמן מהטסט
+        """
+        budget_ms = self.settings["steps"].get(name) if budget_ms is None else budget_ms
+        if not budget_ms:
+            yield
+            return
+        token = _deadlines.set(_deadlines.get() + ((name, time.monotonic() + budget_ms / 1000),))
+        try:
+            yield
+        finally:
+            _deadlines.reset(token)
+
+    def remaining_ms(self) -> Optional[float]:
+        """הזמן שנשאר עד ה-deadline הקרוב (None = אין תקציב פעיל)"""
+        deadlines = _deadlines.get()
+        if not deadlines:
+            return None
+        return (min(deadline for _, deadline in deadlines) - time.monotonic()) * 1000
+
+    def timeout_for(self, kind: str = "default", cap: float = None) -> int:
+        """timeout לקריאה: ערך הבסיס של kind, מוגבל ב-cap ובזמן שנשאר. תקציב שנגמר - חריגה מיד"""
+        timeout = self.settings[kind]
+        if cap:
+            timeout = min(timeout, cap)
+        remaining = self.remaining_ms()
+        if remaining is not None:
+            if remaining <= 0:
+                exhausted = min(_deadlines.get(), key=lambda entry: entry[1])[0]
+                raise TimeoutBudgetExceeded(f"Time budget of '{exhausted}' exhausted")
+            timeout = min(timeout, remaining)
+        return int(max(timeout, self.settings["min_call"]))
+
+    def element_timeout(self, key: str, kind: str = "default") -> int:
+        """כמו timeout_for, אבל אלמנט שלא נמצא בפעם הקודמת מקבל רק absent"""
+        state = self._state()
+        if key in state.absent:
+            state.stats.fast_fails += 1
+            return self.timeout_for(kind, cap=self.settings["absent"])
+        return self.timeout_for(kind)
+
+    def mark_absent(self, key: str):
+        absent = self._state().absent
+        absent[key] = absent.get(key, 0) + 1
+
+    def mark_present(self, key: str):
+        self._state().absent.pop(key, None)
+
+    def is_known_absent(self, key: str) -> bool:
+        return key in self._state().absent
+
+    def record_wait(self, kind: str, elapsed: float, ok: bool):
+        stats = self.stats
+        stats.calls += 1
+        stats.waited += elapsed
+        stats.by_kind[kind] = stats.by_kind.get(kind, 0.0) + elapsed
+        if not ok:
+            stats.timeouts += 1
+
+    @contextmanager
+    def waiting(self, kind: str):
+        """מדידת המתנה: הזמן נכנס לסטטיסטיקה, חריגה נספרת כ-timeout וממשיכה הלאה"""
+        start = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.record_wait(kind, time.perf_counter() - start, ok)
+
+
+timeouts = TimeoutBudget()
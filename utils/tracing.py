@@ -0,0 +1,216 @@
+"""
+Step Tracing - זמני ריצה לכל פעולה של Page Object: זמן, מספר קריאות Playwright ו-timeouts
+ייצוא ל-Chrome trace (chrome://tracing / Perfetto) וטבלת סיכום לכל טסט
+"""
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.call_counter import PlaywrightCallCounter
+
+
+class Span:
+    """פעולה אחת שנמדדה"""
+    __slots__ = ("name", "category", "start", "duration", "calls", "timeouts", "error", "args", "thread_id", "depth")
+
+    def __init__(self, name: str, category: str, args: Dict[str, Any], depth: int):
+        self.name = name
+        self.category = category
+        self.args = args
+        self.depth = depth
+        self.start = time.perf_counter()
+        self.duration = 0.0
+        self.calls = 0
+        self.timeouts = 0
+        self.error: Optional[str] = None
+        self.thread_id = threading.get_ident()
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+# ה-spans וה-id של הטסט ב-context הנוכחי - משימות asyncio שמתחילות טסט משלהן לא מתערבבות
+_test_spans: ContextVar[Optional[List[Span]]] = ContextVar("test_spans", default=None)
+_test_id: ContextVar[Optional[str]] = ContextVar("test_id", default=None)
+
+
+def _is_timeout(error: BaseException) -> bool:
+    return "Timeout" in type(error).__name__
+
+
+class StepTracer:
+    """
+    אוסף spans של הטסט הנוכחי (לפי ה-context). מחוץ לטסט (או כשכבוי) - העטיפות קוראות לפונקציה ישירות.
+    ב-async כמה תרחישים רצים במקביל, ולכן מספר הקריאות ל-span כולל גם קריאות של משימות אחרות
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.output_dir = "reports/traces"
+        self.slow_step_ms = 2000
+
+    def configure(self, settings: Dict[str, Any]):
+        self.enabled = bool(settings.get("enabled", False))
+        self.output_dir = settings.get("output_dir", self.output_dir)
+        self.slow_step_ms = settings.get("slow_step_ms", self.slow_step_ms)
+
+    @property
+    def recording(self) -> bool:
+        return _test_spans.get() is not None
+
+    def begin_test(self, test_id: str):
+        if self.enabled:
+            _test_id.set(test_id)
+            _test_spans.set([])
+
+    def end_test(self) -> List[Span]:
+        spans = _test_spans.get() or []
+        _test_spans.set(None)
+        _test_id.set(None)
+        return spans
+
+    def current_spans(self) -> List[Span]:
+        return list(_test_spans.get() or [])
+
+    @contextmanager
+    def span(self, name: str, category: str = "page", **args):
+        spans = _test_spans.get()
+        if spans is None:
+            yield None
+            return
+
+        parent = _current_span.get()
+        span = Span(name, category, args, parent.depth + 1 if parent else 0)
+        token = _current_span.set(span)
+        counter = PlaywrightCallCounter().__enter__()
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {str(e)[:200]}"
+            if _is_timeout(e):
+                span.timeouts += 1
+            raise
+        finally:
+            counter.__exit__(None, None, None)
+            span.duration = time.perf_counter() - span.start
+            span.calls = counter.count
+            _current_span.reset(token)
+            spans.append(span)
+
+    def note_timeout(self):
+        """timeout שנבלע בתוך הפעולה (is_visible / wait_until_ready מחזירים False במקום לזרוק)"""
+        span = _current_span.get()
+        if span is not None:
+            span.timeouts += 1
+
+    def summarize(self, spans: List[Span]) -> List[Dict[str, Any]]:
+        """סיכום לפי שם פעולה, מהאיטית לזריזה (זמן כולל)"""
+        rows: Dict[str, Dict[str, Any]] = {}
+        for span in spans:
+            row = rows.setdefault(span.name, {"name": span.name, "count": 0, "total_ms": 0.0, "max_ms": 0.0,
+                                              "calls": 0, "timeouts": 0, "errors": 0})
+            duration_ms = span.duration * 1000
+            row["count"] += 1
+            row["total_ms"] += duration_ms
+            row["max_ms"] = max(row["max_ms"], duration_ms)
+            row["calls"] += span.calls
+            row["timeouts"] += span.timeouts
+            row["errors"] += 1 if span.error else 0
+        return sorted(rows.values(), key=lambda row: row["total_ms"], reverse=True)
+
+    def format_summary(self, spans: List[Span]) -> str:
+        lines = [f"{'step':<44} {'count':>5} {'total ms':>10} {'max ms':>9} {'calls':>6} {'timeouts':>8}"]
+        for row in self.summarize(spans):
+            lines.append(f"{row['name'][:44]:<44} {row['count']:>5} {row['total_ms']:>10.0f} "
+                         f"{row['max_ms']:>9.0f} {row['calls']:>6} {row['timeouts']:>8}")
+        return "\n".join(lines)
+
+    def slow_spans(self, spans: List[Span], threshold_ms: float = None) -> List[Span]:
+        threshold = (self.slow_step_ms if threshold_ms is None else threshold_ms) / 1000
+        return sorted((span for span in spans if span.duration >= threshold),
+                      key=lambda span: span.duration, reverse=True)
+
+    def format_spans(self, spans: List[Span]) -> str:
+        return "\n".join(f"{span.duration * 1000:8.0f}ms  {'  ' * span.depth}{span.name}"
+                         f"  calls={span.calls} timeouts={span.timeouts}"
+                         f"{'  ' + json.dumps(span.args, ensure_ascii=False) if span.args else ''}"
+                         f"{'  ERROR ' + span.error if span.error else ''}"
+                         for span in spans)
+
+    def chrome_trace(self, spans: List[Span], test_id: str = None) -> Dict[str, Any]:
+        """פורמט Trace Event (complete events) - נפתח ב-chrome://tracing או ui.perfetto.dev"""
+        pid = os.getpid()
+        origin = min((span.start for span in spans), default=0.0)
+        events = [{
+            "name": span.name,
+            "cat": span.category,
+            "ph": "X",
+            "ts": round((span.start - origin) * 1_000_000, 1),
+            "dur": round(span.duration * 1_000_000, 1),
+            "pid": pid,
+            "tid": span.thread_id,
+            "args": dict(span.args, playwright_calls=span.calls, timeouts=span.timeouts,
+                         **({"error": span.error} if span.error else {})),
+        } for span in spans]
+        metadata = {"test": test_id or _test_id.get(), "worker": os.environ.get("PYTEST_XDIST_WORKER", "main")}
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": metadata}
+
+    def export_chrome_trace(self, path: str, spans: List[Span], test_id: str = None) -> str:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.chrome_trace(spans, test_id), file)
+        return path
+
+
+tracer = StepTracer()
+
+
+def _describe_args(args: tuple) -> Dict[str, Any]:
+    """הארגומנט הראשון (סלקטור / URL / שאילתה) - כדי לזהות את הפעולה ב-trace"""
+    if args and isinstance(args[0], (str, int, float)):
+        return {"arg": str(args[0])[:120]}
+    return {}
+
+
+def traced(name: str = None, category: str = "page") -> Callable:
+    """דקורטור: מדידת הפונקציה כ-span (sync או async). כשלא מקליטים - קריאה ישירה"""
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                if not tracer.recording:
+                    return await func(self, *args, **kwargs)
+                with tracer.span(span_name, category, **_describe_args(args)):
+                    return await func(self, *args, **kwargs)
+            async_wrapper.__traced__ = True
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if not tracer.recording:
+                return func(self, *args, **kwargs)
+            with tracer.span(span_name, category, **_describe_args(args)):
+                return func(self, *args, **kwargs)
+        wrapper.__traced__ = True
+        return wrapper
+    return decorator
+
+
+def instrument_class(cls: type, category: str = "page") -> type:
+    """
+    עטיפת כל המתודות הציבוריות שמוגדרות במחלקה עצמה.
+    generators לא נעטפים (היו נמדדים רק ביצירה) - הפעולות שבתוכם נמדדות בנפרד
+    """
+    for attr, value in list(vars(cls).items()):
+        if attr.startswith("_") or not inspect.isfunction(value) or getattr(value, "__traced__", False):
+            continue
+        if inspect.isgeneratorfunction(value) or inspect.isasyncgenfunction(value):
+            continue
+        setattr(cls, attr, traced(f"{cls.__name__}.{attr}", category)(value))
+    return cls
@@ -0,0 +1,80 @@
+"""
+Variants - בחירת וריאנטים (מידה, צבע, רוחב...) בלי דפדפן
+ProductPage קורא את כל המימדים בשאילתת DOM אחת, וכאן נבחר צירוף במלאי עם RNG שאפשר לקבע (seed)
+"""
+import random
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+
+# ה-option הראשון ב-select של eBay הוא "- Select -" עם value="-1" - לא אופציה אמיתית.
+# הכלל מיושם רק ב-READ_VARIANTS_SCRIPT (value ריק / -1, או option ראשון שהטקסט שלו "Select...")
+PLACEHOLDER_VALUES = ("", "-1")
+PLACEHOLDER_LABEL = r"^[\s-]*(select|choose)\b"
+
+
+@dataclass
+class VariantOption:
+    """אופציה אחת - value של option ב-select, או המפתח של הכפתור בקבוצת כפתורים"""
+    value: str
+    label: str
+    disabled: bool = False
+
+
+@dataclass
+class VariantDimension:
+    """מימד אחד: select או קבוצת כפתורים. key הוא ערך data-e2e-variant של האלמנט בדף"""
+    kind: str  # "select" / "buttons"
+    key: str
+    name: str
+    options: List[VariantOption] = field(default_factory=list)
+    selected: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "VariantDimension":
+        """מימד מהתוצאה של READ_VARIANTS_SCRIPT - ה-placeholder כבר סונן שם"""
+        options = [VariantOption(option["value"], option.get("label", ""), bool(option.get("disabled")))
+                   for option in data.get("options", [])]
+        return cls(kind=data["kind"], key=data["key"], name=data.get("name") or data["key"], options=options,
+                   selected=data.get("selected"))
+
+    @property
+    def available(self) -> List[VariantOption]:
+        return [option for option in self.options if not option.disabled]
+
+VariantChoice = Tuple[VariantDimension, VariantOption]
+
+
+def make_rng(seed: Union[int, str, None] = None, salt: str = "") -> random.Random:
+    """RNG לבחירה - עם seed הבחירה חוזרת על עצמה (salt = למשל ה-URL, כדי שכל מוצר יקבל בחירה משלו)"""
+    return random.Random(f"{seed}:{salt}" if seed is not None else None)
+
+
+def parse_dimensions(raw: Sequence[Dict[str, Any]]) -> List[VariantDimension]:
+    """התוצאה של READ_VARIANTS_SCRIPT -> VariantDimension"""
+    return [VariantDimension.from_dict(data) for data in raw or []]
+
+
+def choose_variants(dimensions: Sequence[VariantDimension], rng: random.Random = None,
+                    keep_valid: bool = False, previous: Dict[str, str] = None) -> List[VariantChoice]:
+    """
+    אופציה אקראית במלאי לכל מימד. מוחזרים רק השינויים - מימד שהאופציה שנבחרה כבר מסומנת בו
+    לא דורש אינטראקציה, ומימד בלי אף אופציה במלאי מדולג.
+    keep_valid=True - מימד שכבר יש בו בחירה תקינה נשאר כמו שהוא (לתיקון אחרי שהדף עדכן מלאי)
+    previous - הבחירות מסבבים קודמים (key -> value), למימדים שהדף לא מסמן בהם בחירה
+    (קבוצת כפתורים בלי aria-pressed / class של selected)
+    """
+    rng = rng or random.Random()
+    previous = previous or {}
+    changes = []
+    for dimension in dimensions:
+        selected = dimension.selected if dimension.selected is not None else previous.get(dimension.key)
+        available = dimension.available
+        if keep_valid and any(option.value == selected for option in available):
+            continue
+        if not available:
+            continue
+        option = rng.choice(available)
+        if option.value != selected:
+            changes.append((dimension, option))
+    return changes